@@ -1,83 +1,99 @@
-import mysql.connector
+import csv
+import io
 import logging
 import os
-import base64
 import time
-import joblib
-import pandas as pd
+import numpy as np
 
 from flask_cors import CORS
-from config import db_config
+from bracket import ROUNDS, SEED_LIMIT, Bracket, default_field, get_executor, neutral_probabilities, simulate
+from columnar import ROW_FORMAT, ColumnSet, columnar_response, format_error, requested_format
+from compression import install_compression
+from conferences import AGGREGATES, get_conference_summary
+from config import bracket_config, logging_config, logo_config, profiling_config, search_config, similarity_config
+from db import POOL
+from logging_pipeline import setup_logging
+from logos import get_logo_store
+from metrics import REGISTRY, install_metrics
+from plotly_view import (
+    DEFAULT_HOW, PLOTLY_STATS, get_plotly_views, nan_mean, resolve_plotly_stat_key, select_plotly_teams
+)
+from players import PLAYER_COLUMNS, TEXT_COLUMNS, PlayerFilters, get_player_snapshot, parse_sort
+from prob_matrix import get_probability_matrix
+from profiling import aggregate_profiles, install_profiling, list_profiles, profile_path
+from ranks import get_stat_ranks
+from response_cache import RESPONSE_CACHE, cached_response
+from search import get_team_search
+from serialization import install_json_provider
+from similarity import get_similar_teams
+from snapshot import get_snapshot
+from tiers import get_tiers
 from flask import Flask, jsonify, render_template, request, send_from_directory, Response
 
 log_path = os.path.join(os.path.dirname(__file__), 'backend/backend_log.txt')
-model_path = os.path.join(os.path.dirname(__file__), 'model_1_0.pkl')
-MODEL = joblib.load(model_path)
-STAT_RANKS_CACHE = {"data": None, "timestamp": 0.0}
-STAT_RANKS_TTL_SECONDS = 300
-PLOTLY_STATS = [
-    "3_point_attempt_rate",
-    "3_point_field_goals",
-    "3_point_field_goals_attempted",
-    "3_point_percentage",
-    "ap_rank",
-    "assist_percentage",
+TEAM_STATS_COLUMNS = [
+    "team_name",
+    "conference_id",
+    "games",
+    "wins",
+    "losses",
+    "win_percentage",
+    "wins_conf",
+    "losses_conf",
+    "team_points",
+    "opponent_points",
+    "pts_per_game",
+    "opp_points_per_game",
+    "margin_of_victory",
+    "team_rebounds",
+    "offensive_rebounds",
     "assists",
-    "block_percentage",
+    "steals",
     "blocks",
-    "defensive_rating_adjusted",
-    "defensive_srs",
-    "effective_field_goal_percentage",
-    "field_goal_percentage",
+    "turnovers",
+    "personal_fouls",
+    "minutes_played",
     "field_goals",
     "field_goals_attempted",
-    "free_throw_attempt_rate",
-    "free_throw_percentage",
+    "field_goal_percentage",
+    "3_point_field_goals",
+    "3_point_field_goals_attempted",
+    "3_point_percentage",
     "free_throws",
     "free_throws_attempted",
-    "free_throws_per_field_goal",
+    "free_throw_percentage"
+]
+TEAM_RATINGS_COLUMNS = [
+    "team_name",
+    "conference_id",
+    "ap_rank",
     "games",
-    "home_losses",
-    "home_wins",
+    "wins",
     "losses",
+    "win_percentage",
+    "wins_conf",
     "losses_conf",
-    "losses_visitor",
-    "madness_rating",
-    "margin_of_victory",
-    "minutes_played",
-    "net_rating_adjusted",
-    "offensive_rating",
-    "offensive_rating_adjusted",
-    "offensive_rebound_percentage",
-    "offensive_rebounds",
+    "strength_of_schedule",
     "offensive_srs",
-    "opp_points_per_game",
-    "opponent_points",
-    "pace",
-    "personal_fouls",
-    "pts_per_game",
+    "defensive_srs",
     "simple_rating_system",
-    "steal_percentage",
-    "steals",
-    "strength_of_schedule",
-    "team_points",
+    "offensive_rating_adjusted",
+    "defensive_rating_adjusted",
+    "net_rating_adjusted",
+    "pace",
+    "free_throw_attempt_rate",
+    "free_throws_per_field_goal",
+    "3_point_attempt_rate",
     "team_rebound_percentage",
-    "team_rebounds",
+    "offensive_rebound_percentage",
+    "assist_percentage",
+    "steal_percentage",
+    "block_percentage",
     "turnover_percentage",
-    "turnovers",
-    "true_shooting_percentage",
-    "win_percentage",
-    "wins",
-    "wins_conf",
-    "wins_visitor"
+    "effective_field_goal_percentage",
+    "true_shooting_percentage"
 ]
-PLOTLY_STAT_KEY_MAP = {}
-
-logging.basicConfig(
-    filename=log_path,
-    level=logging.DEBUG,
-    format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
-)
+BATCH_MAX_PAIRS = int(os.environ.get('BATCH_MAX_PAIRS', 10000))
 
 
 app = Flask(
@@ -86,55 +102,11 @@ app = Flask(
     template_folder='templates'
 )
 CORS(app)
-
-
-def build_matchup_features(team_home, team_away):
-    """Build the model input feature dict for a home vs away matchup."""
-    return {
-        'sos_diff': team_home['strength_of_schedule'] - team_away['strength_of_schedule'],
-        'net_diff': team_home['net_rating_adjusted'] - team_away['net_rating_adjusted'],
-        'srs_diff': team_home['simple_rating_system'] - team_away['simple_rating_system'],
-        'mov_diff': team_home['margin_of_victory'] - team_away['margin_of_victory'],
-        'pts_per_game': team_home['pts_per_game'],
-        'opp_points_per_game_Team1': team_away['opp_points_per_game'],
-        'pts_per_game_Team1': team_away['pts_per_game'],
-        'opp_points_per_game': team_home['opp_points_per_game'],
-        'assist_percentage': team_home['assist_percentage'],
-        'team_rebound_percentage': team_home['team_rebound_percentage'],
-        'rebs_diff': (team_home['team_rebounds'] / team_home['games']) - (team_away['team_rebounds'] / team_away['games']),
-        'turnover_percentage': team_home['turnover_percentage'],
-        'steal_percentage_Team1': team_away['steal_percentage'],
-        'block_percentage_Team1': team_away['block_percentage'],
-        'field_goal_percentage': team_home['field_goal_percentage'],
-        '3_point_percentage': team_home['3_point_percentage'],
-        'free_throw_percentage': team_home['free_throw_percentage'],
-        'pace_diff': team_home['pace'] - team_away['pace'],
-        'offensive_rating': team_home['offensive_rating'],
-        'offensive_srs': team_home['offensive_srs'],
-        'defensive_srs_Team1': team_away['defensive_srs'],
-        'offensive_rating_adjusted': team_home['offensive_rating_adjusted'],
-        'defensive_rating_adjusted_Team1': team_away['defensive_rating_adjusted'],
-        'true_shooting_percentage': team_home['true_shooting_percentage'],
-        'offensive_rebound_percentage': team_home['offensive_rebound_percentage'],
-        'madness_diff': team_home['madness_rating'] - team_away['madness_rating'],
-        'off_srs_diff': team_home['offensive_srs'] - team_away['offensive_srs'],
-        'def_srs_diff': team_home['defensive_srs'] - team_away['defensive_srs'],
-        'ts_diff': team_home['true_shooting_percentage'] - team_away['true_shooting_percentage'],
-        'off_rating_diff': team_home['offensive_rating_adjusted'] - team_away['offensive_rating_adjusted'],
-        'def_rating_diff': team_home['defensive_rating_adjusted'] - team_away['defensive_rating_adjusted'],
-        'ft_rate_diff': team_home['free_throw_attempt_rate'] - team_away['free_throw_attempt_rate'],
-        '3pa_rate_diff': team_home['3_point_attempt_rate'] - team_away['3_point_attempt_rate']
-    }
-
-
-def resolve_plotly_stat_key(stat_key, sample_row):
-    """Resolve a plotly stat key to a valid database column."""
-    if stat_key in sample_row:
-        return stat_key
-    mapped = PLOTLY_STAT_KEY_MAP.get(stat_key)
-    if mapped and mapped in sample_row:
-        return mapped
-    return None
+setup_logging(app, logging_config['path'] or log_path)
+install_profiling(app)
+install_json_provider(app)
+install_metrics(app, POOL, RESPONSE_CACHE)
+install_compression(app)
 
 
 @app.route('/')
@@ -173,445 +145,332 @@ def matchup_maker():
     return render_template('matchup_maker.html', current_page='matchup_maker')
 
 
+def top_25_rows(snapshot):
+    """Return (rank, team, W-L, conference) for every AP-ranked team."""
+    ap_rank = snapshot.numeric["ap_rank"]
+    ranked = np.flatnonzero(~np.isnan(ap_rank) & (ap_rank != 0))
+    indices = snapshot.order("ap_rank", descending=False, indices=ranked)
+
+    top_25_data = snapshot.rows(indices, ["ap_rank", "team_name", "wins", "losses", "conference_abbreviation"])
+    return [(ap_rank, team_name, f"{wins}-{losses}", conf) for ap_rank, team_name, wins, losses, conf in top_25_data]
+
+
+def madness_rating_rows(snapshot):
+    """Return (rank, team, W-L, madness rating, net rating, conference) for all teams, best first."""
+    indices = snapshot.order("madness_rating")
+    ratings = snapshot.rows(indices, [
+        "team_name", "wins", "losses", "madness_rating", "net_rating_adjusted", "conference_abbreviation"
+    ])
+
+    return [
+        (rank + 1, team_name, f"{wins}-{losses}", rating, net, conference)
+        for rank, (team_name, wins, losses, rating, net, conference) in enumerate(ratings)
+    ]
+
+
 @app.route('/api/top_25_data')
+@cached_response
 def get_top_25_data():
     """Return AP Top 25 rows with basic record and conference data."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        sql = """ 
-            SELECT ap_rank, team_name, wins, losses, c.conference_abbreviation
-            FROM team t
-            JOIN conference c ON c.conference_id = t.conference_id
-            WHERE ap_rank != 0
-            ORDER BY ap_rank ASC
-        """
-        
-        cursor.execute(sql)
-        top_25_data = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        top_25_data = [(ap_rank, team_name, f"{wins}-{losses}", conf) for ap_rank, team_name, wins, losses, conf in top_25_data]
+        top_25_data = top_25_rows(get_snapshot())
 
         return jsonify(top_25_data)
     except Exception as e:
-        logging.debug(f"An error occured in get_top_25_data(): {e}")
+        logging.error(f"An error occured in get_top_25_data(): {e}")
+        return jsonify({}), 500
 
 
 @app.route('/api/generateMadnessRtg')
+@cached_response
 def generate_madness_ratings():
     """Return Madness Ratings for all teams with ranks, records, and conferences."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-
-        sql = """
-            SELECT t.team_name,
-                t.wins,
-                t.losses,
-                t.madness_rating,
-                t.net_rating_adjusted,
-                c.conference_abbreviation
-            FROM team t
-            JOIN conference c ON c.conference_id = t.conference_id
-            ORDER BY t.madness_rating DESC
-        """
-
-        cursor.execute(sql)
-        ratings = cursor.fetchall()
-        ratings.sort(key=lambda x: x[3], reverse=True)
-
-        ratings = [
-            (rank + 1, team_name, f"{wins}-{losses}", rating, net, conference)
-            for rank, (team_name, wins, losses, rating, net, conference) in enumerate(ratings)
-        ]
+        ratings = madness_rating_rows(get_snapshot())
 
         return jsonify(ratings)
     except Exception as e:
-        logging.debug(f"An error occurred in generate madness ratings: {e}") 
+        logging.error(f"An error occurred in generate madness ratings: {e}")
+        return jsonify({}), 500
     
     
+DASHBOARD_SECTIONS = [
+    ("top_25", top_25_rows),
+    ("madness_ratings", madness_rating_rows),
+    ("contenders", lambda snapshot: get_tiers(snapshot).rows("contenders")),
+    ("next_up", lambda snapshot: get_tiers(snapshot).rows("next_up")),
+    ("mid_majors", lambda snapshot: get_tiers(snapshot).rows("mid_majors"))
+]
+
+
+@app.route('/api/dashboard')
+@cached_response
+def get_dashboard():
+    """Return every home-page dataset from one snapshot, with how long each section took to build."""
+    try:
+        snapshot = get_snapshot()
+        dashboard = {}
+        timings = {}
+        for name, build_section in DASHBOARD_SECTIONS:
+            start = time.perf_counter()
+            dashboard[name] = build_section(snapshot)
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+        dashboard["timings_ms"] = timings
+        return jsonify(dashboard)
+    except Exception as e:
+        logging.error("Error in /api/dashboard: %s", str(e))
+        return jsonify({}), 500
+
+
+PLAYER_PAGE_ARGS = {'team', 'conference', 'position', 'class', 'min_games', 'min_minutes', 'sort', 'limit', 'cursor'}
+PLAYER_PAGE_LIMIT = int(os.environ.get('PLAYER_PAGE_LIMIT', 100))
+PLAYER_PAGE_MAX = int(os.environ.get('PLAYER_PAGE_MAX', 1000))
+PLAYER_EXPORT_CHUNK = 1000
+
+
+def player_query():
+    """Read player filters and sort order from the query string; raises ValueError for bad values."""
+    filters = PlayerFilters(
+        team=request.args.getlist('team'),
+        conference=request.args.getlist('conference'),
+        position=request.args.getlist('position'),
+        player_class=request.args.getlist('class'),
+        min_games=request.args.get('min_games', type=float),
+        min_minutes=request.args.get('min_minutes', type=float)
+    )
+    return filters, parse_sort(request.args.get('sort'))
+
+
 @app.route('/api/get_player_stats')
+@cached_response
 def get_player_stats():
-    """Return player rows joined with team and conference context."""
+    """Return player rows joined with team and conference context.
+
+    Without paging arguments every player comes back in one response, as it
+    always has. With any filter, ``sort``, ``limit`` or ``cursor`` the rows
+    come back one keyset page at a time. ``format`` (or Accept) selects a
+    columnar JSON, MessagePack or Arrow body instead of row arrays.
+    """
+    response_format = requested_format()
+    error = format_error(response_format)
+    if error:
+        return jsonify({"error": error}), 406
+
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        
-        sql = """SELECT p.player_name,
-                        t.team_name, 
-                        c.conference_abbreviation,
-                        p.position,
-                        p.class,
-                        p.games_played,
-                        p.games_started,
-                        p.minutes_per_game,
-                        p.fg_percentage_per_game,
-                        p.3p_percentage_per_game,
-                        p.ft_percentage_per_game,
-                        p.orb_per_game,
-                        p.drb_per_game,
-                        p.trb_per_game,
-                        p.ast_per_game,
-                        p.stl_per_game,
-                        p.blk_per_game,
-                        p.tov_per_game,
-                        p.pf_per_game,
-                        p.pts_per_game
-                FROM player p
-                JOIN team t ON p.team_id = t.team_id
-                JOIN conference c ON t.conference_id = c.conference_id
-                ORDER BY t.team_name, p.player_name"""
-                
-        cursor.execute(sql)
-        player_data = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
-        return jsonify({
-            'player_data': player_data
-        })
+        players = get_player_snapshot(get_snapshot())
+        if not PLAYER_PAGE_ARGS.intersection(request.args):
+            indices = players.select()
+            page = {}
+        else:
+            try:
+                filters, sort = player_query()
+                limit = max(1, min(request.args.get('limit', default=PLAYER_PAGE_LIMIT, type=int), PLAYER_PAGE_MAX))
+                indices, total, next_cursor = players.page(filters, sort, request.args.get('cursor'), limit)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            page = {'total': total, 'next_cursor': next_cursor}
+
+        if response_format != ROW_FORMAT:
+            columns = ColumnSet(PLAYER_COLUMNS, players.values, players.numeric, indices, TEXT_COLUMNS)
+            return columnar_response(response_format, columns, page)
+
+        if page:
+            response = jsonify({'columns': PLAYER_COLUMNS, 'player_data': players.rows(indices), **page})
+        else:
+            response = jsonify({'player_data': players.rows(indices)})
+        response.vary.add('Accept')
+        return response
+    except Exception as e:
+        logging.error(f"An error occurred in get_player_stats: {e}")
+        return jsonify({}), 500
+
+
+@app.route('/api/player_stats/export')
+def export_player_stats():
+    """Stream every matching player row as CSV or newline-delimited JSON."""
+    export_format = request.args.get('format', default='csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({"error": "format must be csv or ndjson."}), 400
+
+    try:
+        filters, sort = player_query()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        players = get_player_snapshot(get_snapshot())
+        indices = players.select(filters, sort)
     except Exception as e:
-        logging.debug(f"An error occurred in get_player_stats: {e}") 
+        logging.error("Error in /api/player_stats/export: %s", str(e))
+        return jsonify({}), 500
+
+    json_dumps = app.json.dumps
+
+    def generate():
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(PLAYER_COLUMNS)
+            for start in range(0, len(indices), PLAYER_EXPORT_CHUNK):
+                writer.writerows(players.rows(indices[start:start + PLAYER_EXPORT_CHUNK]))
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for start in range(0, len(indices), PLAYER_EXPORT_CHUNK):
+                rows = players.rows(indices[start:start + PLAYER_EXPORT_CHUNK])
+                yield "".join(json_dumps(dict(zip(PLAYER_COLUMNS, row))) + "\n" for row in rows)
+
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    response = Response(generate(), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="player_stats.{export_format}"'
+    return response
 
 
 @app.route('/api/get_team_stats')
+@cached_response
 def get_stats():
-    """Return raw team stats plus a conference id map."""
+    """Return raw team stats plus a conference id map, as rows or in a columnar format."""
+    response_format = requested_format()
+    error = format_error(response_format)
+    if error:
+        return jsonify({"error": error}), 406
+
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        sql = f"""
-                    SELECT  t.team_name, 
-                            t.conference_id,
-                            t.games,
-                            t.wins,
-                            t.losses,
-                            t.win_percentage,
-                            t.wins_conf,
-                            t.losses_conf,
-                            t.team_points,
-                            t.opponent_points,
-                            t.pts_per_game,
-                            t.opp_points_per_game,
-                            t.margin_of_victory,
-                            t.team_rebounds,
-                            t.offensive_rebounds,
-                            t.assists,
-                            t.steals,
-                            t.blocks,
-                            t.turnovers,
-                            t.personal_fouls,
-                            t.minutes_played,
-                            t.field_goals,
-                            t.field_goals_attempted,
-                            t.field_goal_percentage,
-                            t.3_point_field_goals,
-                            t.3_point_field_goals_attempted,
-                            t.3_point_percentage,
-                            t.free_throws,
-                            t.free_throws_attempted,
-                            t.free_throw_percentage
-                    FROM team t
-                """
-        
-        cursor.execute(sql)
-        team_stats = cursor.fetchall()
+        snapshot = get_snapshot()
+        if response_format != ROW_FORMAT:
+            columns = ColumnSet(TEAM_STATS_COLUMNS, snapshot.values, snapshot.numeric, np.arange(snapshot.size))
+            return columnar_response(response_format, columns, {"conferences": snapshot.conferences})
 
-        cursor.execute('SELECT conference_id, conference_abbreviation FROM conference')
-        conferences = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
-        return jsonify({
+        team_stats = snapshot.rows(range(snapshot.size), TEAM_STATS_COLUMNS)
+        response = jsonify({
             "teams": team_stats,
-            "conferences": {row[0]: row[1] for row in conferences}
+            "conferences": snapshot.conferences
         })
+        response.vary.add('Accept')
+        return response
     except Exception as e:
-        logging.debug(f"An error occurred in get_stats: {e}")   
+        logging.error(f"An error occurred in get_stats: {e}")
+        return jsonify({}), 500
   
   
 @app.route('/api/get_contenders')
+@cached_response
 def get_contenders():
     """Return the Championship Contenders list derived from multiple filters."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        
-        sql = """
-            SELECT DISTINCT(t.team_name),
-                c.conference_abbreviation,
-                t.wins,
-                t.losses,
-                t.ap_rank,
-                t.madness_rating,
-                t.net_rating_adjusted,
-                t.offensive_rating_adjusted, 
-                t.defensive_rating_adjusted, 
-                t.strength_of_schedule,
-                t.simple_rating_system
-            FROM team t
-            JOIN (
-            SELECT team_name
-            FROM team 
-            ORDER BY offensive_rating_adjusted DESC
-            LIMIT 20
-            ) top20 ON t.team_name = top20.team_name
-            JOIN (
-            SELECT team_name
-            FROM team 
-            ORDER BY defensive_rating_adjusted ASC
-            LIMIT 20
-            ) bottom20 ON t.team_name = bottom20.team_name
-            JOIN (
-            SELECT team_name
-            FROM team
-            ORDER BY strength_of_schedule DESC
-            LIMIT 50
-            ) sos ON t.team_name = sos.team_name
-            JOIN conference c on c.conference_id = t.conference_id
-            ORDER BY net_rating_adjusted DESC
-        """
-        cursor.execute(sql)
-        contenders = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        contenders = get_tiers(get_snapshot()).rows("contenders")
         
         return jsonify(contenders)
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
 
 
 @app.route('/api/get_next_up')
+@cached_response
 def get_next_up():
     """Return the Next Up tier with broader thresholds than contenders."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        
-        sql = """
-            SELECT DISTINCT(t.team_name),
-                c.conference_abbreviation,
-                t.wins,
-                t.losses,
-                t.ap_rank,
-                t.madness_rating,
-                t.net_rating_adjusted,
-                t.offensive_rating_adjusted, 
-                t.defensive_rating_adjusted,  
-                t.strength_of_schedule,
-                t.simple_rating_system
-            FROM team t
-            JOIN (
-                SELECT team_name
-                FROM team 
-                ORDER BY offensive_rating_adjusted DESC
-                LIMIT 35
-            ) top20 ON t.team_name = top20.team_name
-            JOIN (
-                SELECT team_name
-                FROM team 
-                ORDER BY defensive_rating_adjusted ASC
-                LIMIT 35
-            ) bottom20 ON t.team_name = bottom20.team_name
-            JOIN (
-                SELECT team_name
-                FROM team
-                ORDER BY strength_of_schedule DESC
-                LIMIT 100
-            ) sos ON t.team_name = sos.team_name
-            JOIN conference c on c.conference_id = t.conference_id
-            
-            WHERE t.team_name NOT IN (
-                SELECT DISTINCT(t.team_name)
-                FROM team t
-                JOIN (
-                    SELECT team_name
-                    FROM team 
-                    ORDER BY offensive_rating_adjusted DESC
-                    LIMIT 20
-                ) top20 ON t.team_name = top20.team_name
-                JOIN (
-                    SELECT team_name
-                    FROM team 
-                    ORDER BY defensive_rating_adjusted ASC
-                    LIMIT 20
-                ) bottom20 ON t.team_name = bottom20.team_name
-                JOIN (
-                    SELECT team_name
-                    FROM team
-                    ORDER BY strength_of_schedule DESC
-                    LIMIT 50
-                ) sos ON t.team_name = sos.team_name
-            )
-            
-            ORDER BY t.net_rating_adjusted DESC
-        """
-        cursor.execute(sql)
-        next_up = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        next_up = get_tiers(get_snapshot()).rows("next_up")
         
         return jsonify(next_up)
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
 
 
 @app.route('/api/get_best_mid_majors')      
+@cached_response
 def get_best_mid_majors():
     """Return top mid-major teams excluding power conferences."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        
-        sql = """
-            SELECT DISTINCT(t.team_name),
-                c.conference_abbreviation,
-                t.wins,
-                t.losses,
-                t.ap_rank,
-                t.madness_rating,
-                t.net_rating_adjusted,
-                t.offensive_rating_adjusted, 
-                t.defensive_rating_adjusted,  
-                t.strength_of_schedule,
-                t.simple_rating_system
-            FROM team t
-            JOIN (
-            SELECT t.team_name
-            FROM team t 
-            JOIN conference c on c.conference_id = t.conference_id
-            WHERE c.conference_abbreviation NOT IN ('Big Ten', 'ACC', 'Big 12', 'Big East', 'SEC')
-            ORDER BY offensive_rating_adjusted DESC
-            LIMIT 25
-            ) top20 ON t.team_name = top20.team_name
-            JOIN (
-            SELECT t.team_name
-            FROM team t
-            JOIN conference c on c.conference_id = t.conference_id
-            WHERE c.conference_abbreviation NOT IN ('Big Ten', 'ACC', 'Big 12', 'Big East', 'SEC')
-            ORDER BY defensive_rating_adjusted ASC
-            LIMIT 25
-            ) bottom20 ON t.team_name = bottom20.team_name
-            JOIN (
-            SELECT t.team_name
-            FROM team t
-            JOIN conference c on c.conference_id = t.conference_id
-            WHERE c.conference_abbreviation NOT IN ('Big Ten', 'ACC', 'Big 12', 'Big East', 'SEC')
-            ORDER BY strength_of_schedule DESC
-            LIMIT 50
-            ) sos ON t.team_name = sos.team_name
-            JOIN conference c on c.conference_id = t.conference_id
-            ORDER BY net_rating_adjusted DESC
-        """
-        cursor.execute(sql)
-        mid_majors = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        mid_majors = get_tiers(get_snapshot()).rows("mid_majors")
         
         return jsonify(mid_majors)
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
+
+
+@app.route('/api/tiers')
+@cached_response
+def get_all_tiers():
+    """Return every tier (contenders, next up, mid-majors) and the cutoffs behind them."""
+    try:
+        tiers = get_tiers(get_snapshot())
+        return jsonify({
+            "tiers": {spec.name: tiers.rows(spec.name) for spec in tiers.specs},
+            "criteria": tiers.criteria()
+        })
+    except Exception as e:
+        logging.error("Error in /api/tiers: %s", str(e))
+        return jsonify({}), 500
         
         
 @app.route('/api/get_team_ratings')
+@cached_response
 def get_ratings():
-    """Return advanced team ratings and efficiency metrics."""
+    """Return advanced team ratings and efficiency metrics, as rows or in a columnar format."""
+    response_format = requested_format()
+    error = format_error(response_format)
+    if error:
+        return jsonify({"error": error}), 406
+
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        sql = f"""
-            SELECT t.team_name,
-                    t.conference_id,
-                    t.ap_rank,
-                    t.games,
-                    t.wins,
-                    t.losses,
-                    t.win_percentage,
-                    t.wins_conf,
-                    t.losses_conf,
-                    t.strength_of_schedule,
-                    t.offensive_srs,
-                    t.defensive_srs,
-                    t.simple_rating_system,
-                    t.offensive_rating_adjusted,
-                    t.defensive_rating_adjusted,
-                    t.net_rating_adjusted,
-                    t.pace,
-                    t.free_throw_attempt_rate,
-                    t.free_throws_per_field_goal,
-                    t.3_point_attempt_rate,
-                    t.team_rebound_percentage,
-                    t.offensive_rebound_percentage,
-                    t.assist_percentage,
-                    t.steal_percentage,
-                    t.block_percentage,
-                    t.turnover_percentage,
-                    t.effective_field_goal_percentage,
-                    t.true_shooting_percentage
-            FROM team t
-        """
-        cursor.execute(sql)
-        team_ratings = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return jsonify(team_ratings)
+        snapshot = get_snapshot()
+        if response_format != ROW_FORMAT:
+            columns = ColumnSet(TEAM_RATINGS_COLUMNS, snapshot.values, snapshot.numeric, np.arange(snapshot.size))
+            return columnar_response(response_format, columns)
+
+        team_ratings = snapshot.rows(range(snapshot.size), TEAM_RATINGS_COLUMNS)
+        response = jsonify(team_ratings)
+        response.vary.add('Accept')
+        return response
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
         
         
 @app.route('/api/get_team_names')
+@cached_response
 def get_team_names():
     """Return alphabetized team names for selectors."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        sql = """
-            SELECT team_name
-            FROM team
-            ORDER BY team_name
-        """
-        cursor.execute(sql)
-        team_names = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        snapshot = get_snapshot()
+        team_names = [(name,) for name in sorted(snapshot.team_names, key=lambda name: (name.lower(), name))]
         return jsonify(team_names)
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
         
 
+def lookup_team_indices(snapshot, team1_name, team2_name):
+    """Return snapshot row indices for both matchup sides, or None for unknown teams."""
+    return snapshot.index_by_name.get(team1_name), snapshot.index_by_name.get(team2_name)
+
+
 @app.route('/api/generateProbs')
+@cached_response
 def generate_probs():
     """Return a single home-team win probability for a matchup."""
     team1_name = request.args.get('team1')
     team2_name = request.args.get('team2')
 
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute("""
-            SELECT *
-            FROM team
-            WHERE team_name IN (%s, %s)
-        """, (team1_name, team2_name))
-        teams = {row["team_name"]: row for row in cursor.fetchall()}
-        t0 = teams.get(team1_name)
-        t1 = teams.get(team2_name)
-
-        cursor.close()
-        conn.close()
-
-        if not t0 or not t1:
-            return jsonify({}), 404
-
-        input_data = build_matchup_features(t0, t1)
+        snapshot = get_snapshot()
+        i0, i1 = lookup_team_indices(snapshot, team1_name, team2_name)
 
-        input_df = pd.DataFrame([input_data])
+        if i0 is None or i1 is None:
+            return jsonify({}), 404
 
-        prob = MODEL.predict_proba(input_df)[0][1]
-        prob = round(100 * (1 - prob), 1)
+        prob = get_probability_matrix(snapshot).lookup(i0, i1)
+        if np.isnan(prob):
+            raise ValueError("missing stats for matchup")
+        prob = round(100 * float(prob), 1)
 
         return jsonify(prob)
     except Exception as e:
@@ -620,39 +479,25 @@ def generate_probs():
 
 
 @app.route('/api/generateMatchupProbs')
+@cached_response
 def generate_matchup_probs():
     """Return both home-team win probabilities for a matchup."""
     team1_name = request.args.get('team1')
     team2_name = request.args.get('team2')
 
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute("""
-            SELECT *
-            FROM team
-            WHERE team_name IN (%s, %s)
-        """, (team1_name, team2_name))
-        teams = {row["team_name"]: row for row in cursor.fetchall()}
-        t0 = teams.get(team1_name)
-        t1 = teams.get(team2_name)
-
-        cursor.close()
-        conn.close()
-
-        if not t0 or not t1:
+        snapshot = get_snapshot()
+        i0, i1 = lookup_team_indices(snapshot, team1_name, team2_name)
+
+        if i0 is None or i1 is None:
             return jsonify({}), 404
 
-        inputs = [
-            build_matchup_features(t0, t1),
-            build_matchup_features(t1, t0)
-        ]
-        input_df = pd.DataFrame(inputs)
-        probs = MODEL.predict_proba(input_df)[:, 1]
+        probs = get_probability_matrix(snapshot).lookup([i0, i1], [i1, i0])
+        if np.isnan(probs).any():
+            raise ValueError("missing stats for matchup")
 
-        team1_prob = round(100 * (1 - probs[0]), 1)
-        team2_prob = round(100 * (1 - probs[1]), 1)
+        team1_prob = round(100 * float(probs[0]), 1)
+        team2_prob = round(100 * float(probs[1]), 1)
 
         return jsonify({
             "team1_prob": team1_prob,
@@ -663,105 +508,289 @@ def generate_matchup_probs():
         return jsonify({}), 500
 
 
+@app.route('/api/probability_matrix')
+@cached_response
+def get_probability_submatrix():
+    """Return home win probabilities between every pair of the selected teams."""
+    team_names = request.args.getlist('team')
+    conference = request.args.get('conference')
+    top = request.args.get('top', type=int)
+
+    try:
+        snapshot = get_snapshot()
+        if team_names:
+            unknown = [name for name in team_names if name not in snapshot.index_by_name]
+            if unknown:
+                return jsonify({"error": "Unknown team.", "unknown": unknown}), 404
+            indices = np.array([snapshot.index_by_name[name] for name in team_names], dtype=np.int64)
+        elif conference:
+            indices = snapshot.order("net_rating_adjusted", indices=snapshot.where_conference(conference))
+        elif top:
+            indices = snapshot.order("madness_rating")[:top]
+        else:
+            indices = np.arange(snapshot.size)
+
+        block = np.round(100 * get_probability_matrix(snapshot).submatrix(indices), 1)
+        probs = [[None if np.isnan(value) else value for value in row] for row in block.tolist()]
+
+        return jsonify({
+            "teams": [snapshot.team_names[i] for i in indices],
+            "home_win_probs": probs
+        })
+    except Exception as e:
+        logging.error("Error in /api/probability_matrix: %s", str(e))
+        return jsonify({}), 500
+
+
+def parse_matchup_pairs(payload):
+    """Normalize a batch payload into (team1, team2) tuples, or raise ValueError."""
+    pairs = payload.get("pairs") if isinstance(payload, dict) else payload
+    if not isinstance(pairs, list):
+        raise ValueError("Expected a JSON list of pairs or {\"pairs\": [...]}.")
+    if len(pairs) > BATCH_MAX_PAIRS:
+        raise ValueError(f"At most {BATCH_MAX_PAIRS} pairs per request.")
+
+    parsed = []
+    for pair in pairs:
+        if isinstance(pair, dict):
+            pair = (pair.get("team1"), pair.get("team2"))
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            raise ValueError("Each pair must be [team1, team2] or {\"team1\": ..., \"team2\": ...}.")
+        if not all(isinstance(name, str) for name in pair):
+            raise ValueError("Team names must be strings.")
+        parsed.append((pair[0], pair[1]))
+    return parsed
+
+
+@app.route('/api/batch_matchup_probs', methods=['POST'])
+def batch_matchup_probs():
+    """Return both home-team win probabilities for many matchups in one vectorized lookup."""
+    try:
+        pairs = parse_matchup_pairs(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        snapshot = get_snapshot()
+        lookup = snapshot.index_by_name
+        resolved = [(lookup.get(team1), lookup.get(team2)) for team1, team2 in pairs]
+        valid = [n for n, (i0, i1) in enumerate(resolved) if i0 is not None and i1 is not None]
+
+        team1_idx = np.array([resolved[n][0] for n in valid], dtype=np.int64)
+        team2_idx = np.array([resolved[n][1] for n in valid], dtype=np.int64)
+        probs = get_probability_matrix(snapshot).lookup(
+            np.concatenate([team1_idx, team2_idx]),
+            np.concatenate([team2_idx, team1_idx])
+        )
+        probs = {n: (probs[k], probs[k + len(valid)]) for k, n in enumerate(valid)}
+
+        results = []
+        for n, (team1, team2) in enumerate(pairs):
+            result = {"team1": team1, "team2": team2}
+            if n not in probs:
+                unknown = [name for name, i in ((team1, resolved[n][0]), (team2, resolved[n][1])) if i is None]
+                result["error"] = f"Unknown team: {', '.join(str(name) for name in unknown)}"
+            elif np.isnan(probs[n]).any():
+                result["error"] = "Missing stats for matchup."
+            else:
+                result["team1_prob"] = round(100 * float(probs[n][0]), 1)
+                result["team2_prob"] = round(100 * float(probs[n][1]), 1)
+            results.append(result)
+
+        return jsonify({"results": results})
+    except Exception as e:
+        logging.error("Error in /api/batch_matchup_probs: %s", str(e))
+        return jsonify({}), 500
+
+
+def parse_bracket_field(snapshot, payload):
+    """Turn a posted field into bracket entries keyed by snapshot row, or raise ValueError."""
+    field = payload.get("field") if isinstance(payload, dict) else payload
+    if not isinstance(field, list):
+        raise ValueError("Expected a JSON list of {\"team\", \"seed\", \"region\"} or {\"field\": [...]}.")
+
+    entries = []
+    for entry in field:
+        if not isinstance(entry, dict) or not {"team", "seed", "region"} <= entry.keys():
+            raise ValueError("Each field entry needs team, seed and region.")
+        index = snapshot.index_by_name.get(entry["team"])
+        if index is None:
+            raise ValueError(f"Unknown team: {entry['team']}")
+        try:
+            seed = int(entry["seed"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid seed for {entry['team']}.")
+        entries.append((index, seed, str(entry["region"])))
+    return entries
+
+
+@app.route('/api/simulate_bracket', methods=['GET', 'POST'])
+def simulate_bracket():
+    """Simulate the tournament and return each team's odds of reaching every round."""
+    simulations = request.args.get('simulations', default=bracket_config['default_simulations'], type=int)
+    seed = request.args.get('seed', type=int)
+    if not 1 <= simulations <= bracket_config['max_simulations']:
+        return jsonify({"error": f"simulations must be between 1 and {bracket_config['max_simulations']}."}), 400
+    if seed is not None and not 0 <= seed < SEED_LIMIT:
+        return jsonify({"error": f"seed must be between 0 and {SEED_LIMIT - 1}."}), 400
+
+    try:
+        snapshot = get_snapshot()
+        if request.method == 'POST':
+            entries = parse_bracket_field(snapshot, request.get_json(silent=True))
+        else:
+            entries = default_field(snapshot)
+        field = Bracket(entries)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        start = time.perf_counter()
+        win_probs = get_probability_matrix(snapshot).submatrix(field.teams)
+        odds, seed = simulate(
+            field,
+            neutral_probabilities(win_probs),
+            simulations,
+            seed=seed,
+            chunk_size=bracket_config['chunk_size'],
+            executor=get_executor(bracket_config['workers'])
+        )
+        elapsed_ms = round(1000 * (time.perf_counter() - start), 1)
+
+        teams = [
+            {
+                "team_name": snapshot.team_names[index],
+                "seed": team_seed,
+                "region": region,
+                "odds": dict(zip(ROUNDS, np.round(team_odds, 4).tolist()))
+            }
+            for index, team_seed, region, team_odds in zip(field.teams, field.seeds, field.regions, odds)
+        ]
+        teams.sort(key=lambda team: [-team["odds"][name] for name in reversed(ROUNDS)])
+
+        return jsonify({
+            "simulations": simulations,
+            "seed": seed,
+            "rounds": ROUNDS,
+            "elapsed_ms": elapsed_ms,
+            "teams": teams
+        })
+    except Exception as e:
+        logging.error("Error in /api/simulate_bracket: %s", str(e))
+        return jsonify({}), 500
+
+
+def logo_field(store, team_id):
+    """Return a team's logo as base64, or as a cacheable URL for ``logos=url`` / ``logos=transparent``.
+
+    ``logos=transparent`` points at the background-free image, downscaled when
+    ``logo_size`` is one of the configured sizes. ``logos=atlas`` returns just
+    the team_id, the key into ``/api/logo_atlas`` sprites.
+    """
+    mode = request.args.get('logos')
+    if mode == 'atlas':
+        return {"team_id": int(team_id)}
+    if mode == 'url':
+        return {"logo_url": store.url(team_id)}
+    if mode == 'transparent':
+        size = request.args.get('logo_size', type=int)
+        return {"logo_url": store.url(team_id, transparent=True, size=size if size in logo_config['sizes'] else None)}
+    return {"logo_base64": store.base64(team_id)}
+
+
+@app.route('/api/logo/<int:team_id>')
+def get_logo(team_id):
+    """Serve a team logo with a strong ETag; versioned URLs are cached as immutable.
+
+    ``style=transparent`` serves the logo with its white background removed,
+    and ``size`` picks one of the downscaled copies.
+    """
+    style = request.args.get('style')
+    size = request.args.get('size', type=int)
+    if style not in (None, 'transparent') or (size is not None and size not in logo_config['sizes']):
+        return jsonify({"error": "Unsupported logo style or size."}), 400
+
+    try:
+        store = get_logo_store(get_snapshot())
+        logo = store.transparent(team_id, size) if style == 'transparent' else store.get(team_id)
+        if logo is None:
+            return jsonify({}), 404
+
+        response = Response(logo.data, mimetype=logo.mimetype)
+        response.set_etag(logo.etag)
+        if request.args.get('v') == store.get(team_id).etag:
+            response.headers['Cache-Control'] = "public, max-age=31536000, immutable"
+        else:
+            response.headers['Cache-Control'] = f"public, max-age={logo_config['max_age']}, must-revalidate"
+        return response.make_conditional(request)
+    except Exception as e:
+        logging.error("Error in /api/logo: %s", str(e))
+        return jsonify({}), 500
+
+
+@app.route('/api/logo_atlas/<int:size>')
+def get_logo_atlas(size):
+    """Return the sprite offsets and content-hash image URL of the logo atlas at one size."""
+    if size not in logo_config['sizes']:
+        return jsonify({"error": "Unsupported logo size."}), 400
+
+    try:
+        atlas = get_logo_store(get_snapshot()).atlas(size)
+        response = jsonify({
+            "size": atlas.size,
+            "url": f"/api/logo_atlas/{size}/{atlas.etag}.png",
+            "width": atlas.width,
+            "height": atlas.height,
+            "sprites": atlas.sprites
+        })
+        response.set_etag(atlas.etag)
+        response.headers['Cache-Control'] = f"public, max-age={logo_config['max_age']}, must-revalidate"
+        return response.make_conditional(request)
+    except Exception as e:
+        logging.error("Error in /api/logo_atlas: %s", str(e))
+        return jsonify({}), 500
+
+
+@app.route('/api/logo_atlas/<int:size>/<etag>.png')
+def get_logo_atlas_image(size, etag):
+    """Serve a logo atlas image; the URL names its content hash, so it never changes."""
+    if size not in logo_config['sizes']:
+        return jsonify({"error": "Unsupported logo size."}), 400
+
+    try:
+        atlas = get_logo_store(get_snapshot()).atlas(size)
+        if etag != atlas.etag:
+            return jsonify({}), 404
+
+        response = Response(atlas.data, mimetype="image/png")
+        response.set_etag(atlas.etag)
+        response.headers['Cache-Control'] = "public, max-age=31536000, immutable"
+        return response.make_conditional(request)
+    except Exception as e:
+        logging.error("Error in /api/logo_atlas: %s", str(e))
+        return jsonify({}), 500
+
+
 @app.route('/api/matchup')
+@cached_response
 def get_matchup_data():
     """Return matchup data, logos, and stat ranks for two teams."""
     team1 = request.args.get('team1')
     team2 = request.args.get('team2')
 
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-
-        def get_stat_ranks():
-            """Build per-team stat ranking dictionaries with a short-lived cache."""
-            now = time.time()
-            cached = STAT_RANKS_CACHE["data"]
-            if cached and (now - STAT_RANKS_CACHE["timestamp"]) < STAT_RANKS_TTL_SECONDS:
-                return cached
-
-            cursor.execute("SELECT * FROM team")
-            teams = cursor.fetchall()
-
-            # Build a dictionary of ranks per team per stat
-            rankings = {}
-
-            stat_columns = [
-                'games', 'wins', 'win_percentage', 'madness_rating', 
-                'strength_of_schedule', 'offensive_srs', 'defensive_srs', 
-                'simple_rating_system','offensive_rating_adjusted', 'defensive_rating_adjusted',
-                'net_rating_adjusted', 'pace', 'free_throw_attempt_rate',
-                'free_throws_per_field_goal', '3_point_attempt_rate',
-                'team_rebound_percentage', 'offensive_rebound_percentage',
-                'assist_percentage', 'steal_percentage', 'block_percentage',
-                'turnover_percentage', 'effective_field_goal_percentage',
-                'true_shooting_percentage'
-            ]
-            
-            lower_is_better = {
-                'defensive_rating_adjusted',
-                'turnover_percentage'
-            }
-
-            for stat in stat_columns:
-                reverse = stat not in lower_is_better
-
-                sorted_teams = sorted(
-                    teams,
-                    key=lambda t: t[stat] if t[stat] is not None else float('-inf'),
-                    reverse=reverse
-                )
-
-                rank = 1
-                prev_value = None
-
-                for i, team in enumerate(sorted_teams):
-                    tid = team["team_id"]
-                    value = team[stat]
-
-                    if tid not in rankings:
-                        rankings[tid] = {}
-
-                    if value == prev_value:
-                        rankings[tid][stat] = rank
-                    else:
-                        rank = i + 1
-                        rankings[tid][stat] = rank
-                        prev_value = value
-
-            STAT_RANKS_CACHE["data"] = rankings
-            STAT_RANKS_CACHE["timestamp"] = now
-            return rankings
-
-        cursor.execute("""
-            SELECT t.*, l.logo_binary
-            FROM team t
-            LEFT JOIN logos l ON t.team_id = l.team_id
-            WHERE t.team_name IN (%s, %s)
-        """, (team1, team2))
-        team_rows = cursor.fetchall()
-        team_map = {}
-        for team in team_rows:
-            if team.get("logo_binary"):
-                team["logo_base64"] = base64.b64encode(team["logo_binary"]).decode("utf-8")
-            else:
-                team["logo_base64"] = None
-            team.pop("logo_binary", None)
-            team_map[team["team_name"]] = team
-
-        team1_data = team_map.get(team1)
-        team2_data = team_map.get(team2)
-        if not team1_data or not team2_data:
-            cursor.close()
-            conn.close()
+        snapshot = get_snapshot()
+        i0, i1 = lookup_team_indices(snapshot, team1, team2)
+        if i0 is None or i1 is None:
             return jsonify({}), 404
-        
-        rankings = get_stat_ranks()
-        team1_data["stat_ranks"] = rankings.get(team1_data["team_id"], {})
-        team2_data["stat_ranks"] = rankings.get(team2_data["team_id"], {})
+        team1_data, team2_data = snapshot.row(i0), snapshot.row(i1)
 
-        cursor.close()
-        conn.close()
+        logos = get_logo_store(snapshot)
+        rankings = get_stat_ranks(snapshot)
+        for team in (team1_data, team2_data):
+            team.update(logo_field(logos, team["team_id"]))
+        team1_data["stat_ranks"] = rankings.ranks_for(i0)
+        team2_data["stat_ranks"] = rankings.ranks_for(i1)
 
         return jsonify({"team1": team1_data, "team2": team2_data})
     except Exception as e:
@@ -769,108 +798,168 @@ def get_matchup_data():
         return jsonify({}), 500
     
 
+@app.route('/api/stat_ranks')
+@cached_response
+def get_stat_rank_table():
+    """Return competition ranks and percentiles for all teams or the requested ones."""
+    team_names = request.args.getlist('team')
+
+    try:
+        snapshot = get_snapshot()
+        rankings = get_stat_ranks(snapshot)
+
+        if team_names:
+            unknown = [name for name in team_names if name not in snapshot.index_by_name]
+            if unknown:
+                return jsonify({"error": "Unknown team.", "unknown": unknown}), 404
+            indices = [snapshot.index_by_name[name] for name in team_names]
+        else:
+            indices = range(snapshot.size)
+
+        teams = [
+            {
+                "team_id": int(snapshot.team_ids[i]),
+                "team_name": snapshot.team_names[i],
+                "ranks": rankings.ranks[i].tolist(),
+                "percentiles": rankings.percentiles[i].tolist()
+            }
+            for i in indices
+        ]
+
+        return jsonify({
+            "columns": rankings.columns,
+            "team_count": rankings.size,
+            "teams": teams
+        })
+    except Exception as e:
+        logging.error("Error in /api/stat_ranks: %s", str(e))
+        return jsonify({}), 500
+
+
+@app.route('/api/conference_summary')
+@cached_response
+def get_conference_summary_route():
+    """Return per-conference stat aggregates and strength ratings, strongest conference first."""
+    conference = request.args.get('conference')
+    stats = request.args.getlist('stat')
+
+    try:
+        snapshot = get_snapshot()
+        summary = get_conference_summary(snapshot)
+
+        unknown = [stat for stat in stats if stat not in summary.columns]
+        if unknown:
+            return jsonify({"error": "Unknown stat.", "unknown": unknown}), 400
+        if conference and conference not in summary.names:
+            return jsonify({"error": "Unknown conference."}), 404
+
+        conferences = summary.summary(conference or None)
+        if stats:
+            for entry in conferences:
+                entry["stats"] = {stat: entry["stats"][stat] for stat in stats}
+
+        return jsonify({
+            "depth": summary.depth,
+            "aggregates": AGGREGATES,
+            "conferences": conferences
+        })
+    except Exception as e:
+        logging.error("Error in /api/conference_summary: %s", str(e))
+        return jsonify({}), 500
+
+
+@app.route('/api/similar_teams')
+@cached_response
+def get_similar_teams_route():
+    """Return the teams whose standardized ratings are closest to a team, with per-stat breakdowns."""
+    team_name = request.args.get('team')
+    k = request.args.get('k', default=10, type=int)
+    k = max(1, min(k, similarity_config['max_k']))
+    with_contributions = request.args.get('contributions', '1') != '0'
+
+    try:
+        snapshot = get_snapshot()
+        index = snapshot.index_by_name.get(team_name)
+        if index is None:
+            return jsonify({"error": "Unknown team."}), 404
+
+        similar = get_similar_teams(snapshot)
+        conferences = snapshot.values["conference_abbreviation"]
+        neighbours = []
+        for other, distance in similar.neighbours_of(index, k):
+            neighbour = {
+                "team_id": int(snapshot.team_ids[other]),
+                "team_name": snapshot.team_names[other],
+                "conference": conferences[other],
+                "distance": round(distance, 4)
+            }
+            if with_contributions:
+                neighbour["contributions"] = similar.contributions(index, other)
+            neighbours.append(neighbour)
+
+        return jsonify({
+            "team": {
+                "team_id": int(snapshot.team_ids[index]),
+                "team_name": snapshot.team_names[index],
+                "conference": conferences[index]
+            },
+            "columns": similar.columns,
+            "neighbours": neighbours
+        })
+    except Exception as e:
+        logging.error("Error in /api/similar_teams: %s", str(e))
+        return jsonify({}), 500
+
+
 @app.route('/api/get_averages_for_net')
+@cached_response
 def get_net_averages():
     """Return average offensive and defensive ratings."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-                SELECT
-                    AVG(offensive_rating_adjusted) AS aoff,
-                    AVG(defensive_rating_adjusted) AS adef
-                FROM team
-            """
-        cursor.execute(sql)
-        averages = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        snapshot = get_snapshot()
+        averages = [{
+            "aoff": nan_mean(snapshot.numeric["offensive_rating_adjusted"]),
+            "adef": nan_mean(snapshot.numeric["defensive_rating_adjusted"])
+        }]
 
         return jsonify(averages)
         
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
     
 
 @app.route('/api/fetch_top_68')
+@cached_response
 def create_top_68():
     """Return the top 68 teams for the Plotly chart filter."""
     how = request.args.get('how')
     # print(how)
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-        if how == "Top 68 Teams By Madness Rating":
-            sql = """
-                SELECT t.team_name,
-                    t.offensive_rating_adjusted,
-                    t.defensive_rating_adjusted,
-                    t.net_rating_adjusted,
-                    t.madness_rating,
-                    l.logo_binary
-                FROM team t
-                LEFT JOIN logos l ON t.team_id = l.team_id
-                ORDER BY madness_rating DESC
-                LIMIT 68
-            """
-        elif how == "Top 68 Teams By Net Rating":
-            sql = """
-                SELECT t.team_name,
-                    t.offensive_rating_adjusted,
-                    t.defensive_rating_adjusted,
-                    t.net_rating_adjusted,
-                    t.madness_rating,
-                    l.logo_binary
-                FROM team t
-                LEFT JOIN logos l ON t.team_id = l.team_id
-                ORDER BY net_rating_adjusted DESC
-                LIMIT 68
-            """
-        elif how == "All Teams":
-            sql = """
-                SELECT t.team_name,
-                    t.offensive_rating_adjusted,
-                    t.defensive_rating_adjusted,
-                    t.net_rating_adjusted,
-                    t.madness_rating,
-                    l.logo_binary
-                FROM team t
-                LEFT JOIN logos l ON t.team_id = l.team_id
-            """
-        else:
-            sql = f"""
-                SELECT t.team_name,
-                    t.offensive_rating_adjusted,
-                    t.defensive_rating_adjusted,
-                    t.net_rating_adjusted,
-                    t.madness_rating,
-                    l.logo_binary
-                FROM team t
-                JOIN conference c on c.conference_id = t.conference_id
-                LEFT JOIN logos l ON t.team_id = l.team_id
-                WHERE c.conference_abbreviation = '{how}'
-                ORDER BY net_rating_adjusted DESC
-                LIMIT 68
-            """
-        cursor.execute(sql)
-        teams = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        snapshot = get_snapshot()
+        indices = select_plotly_teams(snapshot, how)
+        columns = [
+            "team_id",
+            "team_name",
+            "offensive_rating_adjusted",
+            "defensive_rating_adjusted",
+            "net_rating_adjusted",
+            "madness_rating"
+        ]
+        teams = [dict(zip(columns, row)) for row in snapshot.rows(indices, columns)]
+        logos = get_logo_store(snapshot)
 
         for team in teams:
-            logo_binary = team.get("logo_binary")
-            if logo_binary:
-                team["logo_base64"] = base64.b64encode(logo_binary).decode("utf-8")
-            else:
-                team["logo_base64"] = None
-            team.pop("logo_binary", None)
+            team.update(logo_field(logos, team.pop("team_id")))
 
         return jsonify(teams)
     except Exception as e:
-        logging.debug(f"An error occured: {e}")
+        logging.error(f"An error occured: {e}")
+        return jsonify({}), 500
 
 
 @app.route('/api/get_plotly_averages')
+@cached_response
 def get_plotly_averages():
     """Return national averages for selected plotly stats."""
     x_stat = request.args.get('x') or 'offensive_rating_adjusted'
@@ -880,40 +969,26 @@ def get_plotly_averages():
         return jsonify({"error": "Invalid stat selection."}), 400
 
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute("SELECT * FROM team LIMIT 1")
-        sample_row = cursor.fetchone()
-        if not sample_row:
-            cursor.close()
-            conn.close()
+        snapshot = get_snapshot()
+        if not snapshot.size:
             return jsonify({"x_avg": None, "y_avg": None})
 
-        x_key = resolve_plotly_stat_key(x_stat, sample_row)
-        y_key = resolve_plotly_stat_key(y_stat, sample_row)
+        x_key = resolve_plotly_stat_key(x_stat, snapshot.numeric)
+        y_key = resolve_plotly_stat_key(y_stat, snapshot.numeric)
         if not x_key or not y_key:
-            cursor.close()
-            conn.close()
             return jsonify({"error": "Stat column not found."}), 400
 
-        sql = f"""
-            SELECT
-                AVG(t.`{x_key}`) AS x_avg,
-                AVG(t.`{y_key}`) AS y_avg
-            FROM team t
-        """
-        cursor.execute(sql)
-        averages = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        return jsonify(averages or {"x_avg": None, "y_avg": None})
+        return jsonify({
+            "x_avg": nan_mean(snapshot.numeric[x_key]),
+            "y_avg": nan_mean(snapshot.numeric[y_key])
+        })
     except Exception as e:
-        logging.debug(f"An error occured in get_plotly_averages: {e}")
+        logging.error(f"An error occured in get_plotly_averages: {e}")
+        return jsonify({}), 500
 
 
 @app.route('/api/fetch_plotly')
+@cached_response
 def fetch_plotly_data():
     """Return plotly-ready team data for selected x/y stats."""
     how = request.args.get('how')
@@ -924,106 +999,173 @@ def fetch_plotly_data():
         return jsonify({"error": "Invalid stat selection."}), 400
 
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-
-        order_by = None
-        limit = None
-        params = []
-
-        if how == "Top 68 Teams By Madness Rating":
-            order_by = "madness_rating"
-            limit = 68
-        elif how == "Top 68 Teams By Net Rating":
-            order_by = "net_rating_adjusted"
-            limit = 68
-        elif how == "All Teams":
-            order_by = None
-            limit = None
-        else:
-            order_by = "net_rating_adjusted"
-            limit = 68
-
-        sql = """
-            SELECT t.*, l.logo_binary
-            FROM team t
-            LEFT JOIN logos l ON t.team_id = l.team_id
-        """
-
-        if how and how not in ("Top 68 Teams By Madness Rating", "Top 68 Teams By Net Rating", "All Teams"):
-            sql += """
-                JOIN conference c on c.conference_id = t.conference_id
-                WHERE c.conference_abbreviation = %s
-            """
-            params.append(how)
-
-        if order_by:
-            sql += f" ORDER BY t.`{order_by}` DESC"
-        if limit:
-            sql += " LIMIT %s"
-            params.append(limit)
-
-        cursor.execute(sql, params)
-        teams = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        if not teams:
+        snapshot = get_snapshot()
+        indices = select_plotly_teams(snapshot, how)
+
+        if not len(indices):
             return jsonify([])
 
-        x_key = resolve_plotly_stat_key(x_stat, teams[0])
-        y_key = resolve_plotly_stat_key(y_stat, teams[0])
+        x_key = resolve_plotly_stat_key(x_stat, snapshot.values)
+        y_key = resolve_plotly_stat_key(y_stat, snapshot.values)
         if not x_key or not y_key:
             return jsonify({"error": "Stat column not found."}), 400
 
+        columns = ["team_id", "team_name", x_key, y_key, "net_rating_adjusted", "madness_rating"]
+        rows = snapshot.rows(indices, columns)
+        logos = get_logo_store(snapshot)
+
         response = []
-        for team in teams:
-            logo_binary = team.get("logo_binary")
-            if logo_binary:
-                logo_base64 = base64.b64encode(logo_binary).decode("utf-8")
-            else:
-                logo_base64 = None
+        for team_id, team_name, x_value, y_value, net_rating, madness_rating in rows:
             response.append({
-                "team_name": team.get("team_name"),
-                "x_value": team.get(x_key),
-                "y_value": team.get(y_key),
-                "net_rating_adjusted": team.get("net_rating_adjusted"),
-                "madness_rating": team.get("madness_rating"),
-                "logo_base64": logo_base64
+                "team_name": team_name,
+                "x_value": x_value,
+                "y_value": y_value,
+                "net_rating_adjusted": net_rating,
+                "madness_rating": madness_rating,
+                **logo_field(logos, team_id)
             })
 
         return jsonify(response)
     except Exception as e:
-        logging.debug(f"An error occured in fetch_plotly_data: {e}")
+        logging.error(f"An error occured in fetch_plotly_data: {e}")
+        return jsonify({}), 500
+
+
+@app.route('/api/plotly_view')
+@cached_response
+def get_plotly_view():
+    """Return plotted points, averages, correlation and regression line for one Plotly chart."""
+    how = request.args.get('how') or DEFAULT_HOW
+    x_stat = request.args.get('x') or 'offensive_rating_adjusted'
+    y_stat = request.args.get('y') or 'defensive_rating_adjusted'
+
+    if x_stat not in PLOTLY_STATS or y_stat not in PLOTLY_STATS:
+        return jsonify({"error": "Invalid stat selection."}), 400
+
+    try:
+        snapshot = get_snapshot()
+        x_key = resolve_plotly_stat_key(x_stat, snapshot.numeric)
+        y_key = resolve_plotly_stat_key(y_stat, snapshot.numeric)
+        if not x_key or not y_key:
+            return jsonify({"error": "Stat column not found."}), 400
+
+        return jsonify(get_plotly_views(snapshot).view(how, x_key, y_key))
+    except Exception as e:
+        logging.error(f"An error occured in get_plotly_view: {e}")
+        return jsonify({}), 500
 
 
 @app.route('/api/get_team_list')
+@cached_response
 def get_team_list():
-    """Return team names with optional base64 logos for UI lists."""
+    """Return team names with optional logos (base64, or URLs with ``logos=url``) for UI lists."""
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT t.team_name, l.logo_binary
-            FROM team t
-            LEFT JOIN logos l ON t.team_id = l.team_id
-            ORDER BY t.team_name
-        """)
-        teams = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        snapshot = get_snapshot()
+        logos = get_logo_store(snapshot)
+        indices = sorted(range(snapshot.size), key=lambda i: (snapshot.team_names[i].lower(), snapshot.team_names[i]))
 
-        for team in teams:
-            logo_binary = team.get("logo_binary")
-            if logo_binary:
-                team["logo_base64"] = base64.b64encode(logo_binary).decode("utf-8")
-            else:
-                team["logo_base64"] = None
-            team.pop("logo_binary", None)
+        teams = [
+            {"team_name": team_name, **logo_field(logos, team_id)}
+            for team_id, team_name in snapshot.rows(indices, ["team_id", "team_name"])
+        ]
 
         return jsonify(teams)
     except Exception as e:
-        logging.debug(f"An error occured in get_team_list: {e}")
+        logging.error(f"An error occured in get_team_list: {e}")
+        return jsonify({}), 500
+
+
+@app.route('/api/search_teams')
+@cached_response
+def search_teams():
+    """Return the best team matches for ``q`` (names, aliases, abbreviations, typos) with logo URLs."""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', type=int) or search_config['limit']
+    limit = max(1, min(limit, search_config['max_limit']))
+
+    try:
+        snapshot = get_snapshot()
+        index = get_team_search(snapshot)
+        logos = get_logo_store(snapshot)
+
+        teams = []
+        for i, match in index.search(query, limit):
+            team_id = index.team_ids[i]
+            logo = logo_field(logos, team_id) if request.args.get('logos') else {"logo_url": logos.url(team_id)}
+            teams.append({
+                "team_id": team_id,
+                "team_name": index.team_names[i],
+                "conference": index.conferences[i],
+                "match": match,
+                **logo
+            })
+
+        return jsonify({"query": query, "teams": teams})
+    except Exception as e:
+        logging.error("Error in /api/search_teams: %s", str(e))
+        return jsonify({}), 500
+
+
+@app.route('/api/pool_stats')
+def get_pool_stats():
+    """Return database connection pool usage counters for monitoring."""
+    return jsonify(POOL.stats())
+
+
+@app.route('/metrics')
+def get_metrics():
+    """Return request, database, model and cache metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route('/api/cache_stats')
+def get_cache_stats():
+    """Return response cache size and hit/miss counters for monitoring."""
+    return jsonify(RESPONSE_CACHE.stats())
+
+
+def profiles_allowed():
+    """Return True if profiling is on and the caller presents PROFILE_TOKEN, when one is set."""
+    if not profiling_config['enabled']:
+        return False
+    token = profiling_config['token']
+    return not token or token in (request.args.get('token'), request.headers.get(profiling_config['header']))
+
+
+@app.route('/api/profiles')
+def get_profiles():
+    """List recent request profiles and the hottest functions across them."""
+    if not profiles_allowed():
+        return jsonify({}), 404
+
+    endpoint = request.args.get('endpoint')
+    limit = max(1, min(request.args.get('limit', default=20, type=int), profiling_config['max_files']))
+    top = max(1, min(request.args.get('top', default=25, type=int), 500))
+    sort = request.args.get('sort', default='tottime')
+    if sort not in ('tottime', 'cumtime'):
+        return jsonify({"error": "sort must be tottime or cumtime."}), 400
+
+    try:
+        profiles = list_profiles(endpoint)[:limit]
+        return jsonify({
+            "profiles": profiles,
+            "hot_functions": aggregate_profiles([profile["name"] for profile in profiles], top=top, sort=sort)
+        })
+    except Exception as e:
+        logging.error("Error in /api/profiles: %s", str(e))
+        return jsonify({}), 500
+
+
+@app.route('/api/profiles/<name>')
+def get_profile_file(name):
+    """Download one raw cProfile dump, e.g. for snakeviz or pstats."""
+    if not profiles_allowed():
+        return jsonify({}), 404
+
+    path = profile_path(name)
+    if path is None:
+        return jsonify({}), 404
+    return send_from_directory(profiling_config['dir'], name, mimetype="application/octet-stream", as_attachment=True)
 
 if __name__ == '__main__':
     # app.run(debug=True)
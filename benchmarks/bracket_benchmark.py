@@ -0,0 +1,83 @@
+"""Measure bracket simulation throughput across simulation and worker counts.
+
+Runs against a synthetic 68-team field and probability matrix, so no database
+is needed:
+
+    python benchmarks/bracket_benchmark.py --simulations 10000 100000 1000000 --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bracket import DEFAULT_REGIONS, Bracket, get_executor, simulate  # noqa: E402
+
+
+def synthetic_field(seed=0):
+    """Return a 68-team bracket and a neutral-site probability matrix driven by team strength."""
+    rng = np.random.default_rng(seed)
+    strength = np.sort(rng.normal(0.0, 1.0, 68))[::-1]
+    probs = 1.0 / (1.0 + np.exp(-(strength[:, None] - strength[None, :]) * 1.5))
+
+    entries = []
+    for rank in range(60):
+        line, position = divmod(rank, 4)
+        region = DEFAULT_REGIONS[position] if line % 2 == 0 else DEFAULT_REGIONS[3 - position]
+        entries.append((rank, line + 1, region))
+    for game in range(4):
+        entries.append((60 + game, 16, DEFAULT_REGIONS[3 - game]))
+        entries.append((67 - game, 16, DEFAULT_REGIONS[3 - game]))
+    return Bracket(entries), probs
+
+
+def run(simulations, workers, chunk_size, repeat):
+    """Return the best-of-``repeat`` timing for one configuration."""
+    field, probs = synthetic_field()
+    executor = get_executor(workers)
+    if executor is not None:
+        simulate(field, probs, chunk_size * workers, seed=0, chunk_size=chunk_size, executor=executor)
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simulate(field, probs, simulations, seed=0, chunk_size=chunk_size, executor=executor)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "simulations": simulations,
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "seconds": round(best, 4),
+        "simulations_per_second": round(simulations / best)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulations", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = [
+        run(simulations, workers, args.chunk_size, args.repeat)
+        for simulations in args.simulations
+        for workers in args.workers
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'simulations':>12} {'workers':>8} {'seconds':>9} {'sims/sec':>12}")
+    for result in results:
+        print(f"{result['simulations']:>12} {result['workers']:>8} {result['seconds']:>9.3f} {result['simulations_per_second']:>12,}")
+
+
+if __name__ == '__main__':
+    main()
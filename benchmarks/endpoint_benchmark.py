@@ -0,0 +1,322 @@
+"""Measure latency, throughput and allocations for every API endpoint.
+
+Runs the Flask app against a synthetic SQLite stand-in (see synthetic_db.py),
+so no MySQL server is needed:
+
+    python benchmarks/endpoint_benchmark.py --scale 1 --threads 1 4 --output results.json
+    python benchmarks/endpoint_benchmark.py --scale 1 --compare results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import synthetic_db  # noqa: E402
+
+# name: (method, path, JSON body). {team1}, {team2} and {conference} are filled from the data.
+ENDPOINTS = {
+    "top_25_data": ("GET", "/api/top_25_data", None),
+    "generateMadnessRtg": ("GET", "/api/generateMadnessRtg", None),
+    "dashboard": ("GET", "/api/dashboard", None),
+    "get_player_stats": ("GET", "/api/get_player_stats", None),
+    "get_team_stats": ("GET", "/api/get_team_stats", None),
+    "get_contenders": ("GET", "/api/get_contenders", None),
+    "get_next_up": ("GET", "/api/get_next_up", None),
+    "get_best_mid_majors": ("GET", "/api/get_best_mid_majors", None),
+    "tiers": ("GET", "/api/tiers", None),
+    "get_team_ratings": ("GET", "/api/get_team_ratings", None),
+    "get_team_names": ("GET", "/api/get_team_names", None),
+    "generateProbs": ("GET", "/api/generateProbs?team1={team1}&team2={team2}", None),
+    "generateMatchupProbs": ("GET", "/api/generateMatchupProbs?team1={team1}&team2={team2}", None),
+    "probability_matrix": ("GET", "/api/probability_matrix?top=68", None),
+    "batch_matchup_probs": ("POST", "/api/batch_matchup_probs", "pairs"),
+    "simulate_bracket": ("GET", "/api/simulate_bracket?simulations=10000&seed=0", None),
+    "logo": ("GET", "/api/logo/1?style=transparent&size=64", None),
+    "logo_atlas": ("GET", "/api/logo_atlas/64", None),
+    "matchup": ("GET", "/api/matchup?team1={team1}&team2={team2}&logos=url", None),
+    "stat_ranks": ("GET", "/api/stat_ranks", None),
+    "get_averages_for_net": ("GET", "/api/get_averages_for_net", None),
+    "fetch_top_68": ("GET", "/api/fetch_top_68?how=Top 68 Teams By Net Rating&logos=url", None),
+    "get_plotly_averages": ("GET", "/api/get_plotly_averages?x=pace&y=wins", None),
+    "fetch_plotly": ("GET", "/api/fetch_plotly?how={conference}&x=pace&y=wins&logos=atlas", None),
+    "plotly_view": ("GET", "/api/plotly_view?how={conference}&x=pace&y=wins", None),
+    "conference_summary": ("GET", "/api/conference_summary", None),
+    "search_teams": ("GET", "/api/search_teams?q={team1}", None),
+    "similar_teams": ("GET", "/api/similar_teams?team={team1}&k=10", None),
+    "get_team_list": ("GET", "/api/get_team_list?logos=url", None),
+}
+
+BATCH_PAIRS = 1000
+
+
+def percentile_summary(latencies):
+    """Return p50/p95/p99/mean/max in milliseconds for a list of seconds."""
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None, "max_ms": None}
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "max_ms": round(float(ms.max()), 3)
+    }
+
+
+class Endpoint:
+    """One request to replay: method, URL and optional JSON body."""
+
+    def __init__(self, name, method, path, body):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+
+    def call(self, client, headers):
+        """Issue the request and return its status code, reading the whole body."""
+        response = client.open(self.path, method=self.method, json=self.body, headers=headers)
+        response.get_data()
+        status = response.status_code
+        response.close()
+        return status
+
+
+def build_endpoints(names, teams, conference):
+    """Resolve the endpoint table against the generated data."""
+    team1, team2 = teams[0], teams[min(1, len(teams) - 1)]
+    pairs = [[teams[k % len(teams)], teams[(k * 7 + 1) % len(teams)]] for k in range(BATCH_PAIRS)]
+    endpoints = []
+    for name in names:
+        method, path, body = ENDPOINTS[name]
+        path = path.format(team1=team1, team2=team2, conference=conference)
+        endpoints.append(Endpoint(name, method, path, {"pairs": pairs} if body == "pairs" else None))
+    return endpoints
+
+
+def run_sequential(endpoint, client, headers, requests, warmup):
+    """Time ``requests`` back-to-back calls on one thread."""
+    for _ in range(warmup):
+        endpoint.call(client, headers)
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        call_start = time.perf_counter()
+        status = endpoint.call(client, headers)
+        latencies.append(time.perf_counter() - call_start)
+        errors += status >= 400
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "sequential",
+        "threads": 1,
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        **percentile_summary(latencies)
+    }
+
+
+def run_threaded(endpoint, app, headers, threads, duration):
+    """Hammer one endpoint from ``threads`` clients for ``duration`` seconds."""
+    latencies = [[] for _ in range(threads)]
+    errors = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+    deadline = [0.0]
+
+    def worker(slot):
+        client = app.test_client()
+        barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            call_start = time.perf_counter()
+            status = endpoint.call(client, headers)
+            latencies[slot].append(time.perf_counter() - call_start)
+            errors[slot] += status >= 400
+
+    workers = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    start = time.perf_counter()
+    deadline[0] = start + duration
+    barrier.wait()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    merged = [latency for slot in latencies for latency in slot]
+    return {
+        "mode": "threaded",
+        "threads": threads,
+        "requests": len(merged),
+        "errors": sum(errors),
+        "throughput_rps": round(len(merged) / elapsed, 1),
+        **percentile_summary(merged)
+    }
+
+
+def measure_allocations(endpoint, client, headers, requests):
+    """Return the mean peak and net traced allocation per request, in KiB."""
+    endpoint.call(client, headers)
+    peaks, nets = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(requests):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            endpoint.call(client, headers)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            nets.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kib": round(float(np.mean(peaks)) / 1024, 1),
+        "alloc_net_kib": round(float(np.mean(nets)) / 1024, 1)
+    }
+
+
+def git_revision():
+    """Return the short commit hash of the tree being measured, or None."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print the relative change of p50, p95 and throughput against a saved run."""
+    with open(baseline_path) as f:
+        baseline = {(row["endpoint"], row["mode"], row["threads"]): row for row in json.load(f)["results"]}
+    print(f"\nvs {baseline_path}")
+    print(f"{'endpoint':<24} {'mode':<12} {'p50':>9} {'p95':>9} {'rps':>9}")
+
+    def change(new, old):
+        if new is None or not old:
+            return "n/a"
+        return f"{100 * (new - old) / old:+.1f}%"
+
+    for row in results:
+        old = baseline.get((row["endpoint"], row["mode"], row["threads"]))
+        if old is None:
+            continue
+        mode = f"{row['mode'][:8]}x{row['threads']}"
+        print(f"{row['endpoint']:<24} {mode:<12} {change(row['p50_ms'], old['p50_ms']):>9} "
+              f"{change(row['p95_ms'], old['p95_ms']):>9} {change(row['throughput_rps'], old['throughput_rps']):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="existing stand-in database (default: generate a temporary one)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of a real season (up to 10)")
+    parser.add_argument("--teams", type=int)
+    parser.add_argument("--players-per-team", type=int)
+    parser.add_argument("--logos", type=int, help="teams with a logo (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=50, help="sequential requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--threads", type=int, nargs="*", default=[4], help="thread counts for the load mode")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per load run")
+    parser.add_argument("--alloc-requests", type=int, default=5, help="traced requests per endpoint (0 to skip)")
+    parser.add_argument("--response-cache", action="store_true", help="keep the response cache on")
+    parser.add_argument("--accept-encoding", default="", help="Accept-Encoding header to send, e.g. gzip")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="matchup-bench-")
+    os.environ.setdefault("LOG_PATH", os.path.join(workdir, "benchmark_log.txt"))
+    os.environ.setdefault("LOG_LEVEL", "INFO")
+    if not args.response_cache:
+        os.environ["RESPONSE_CACHE"] = "0"
+
+    db_path = args.db
+    counts = None
+    if db_path is None:
+        db_path = os.path.join(workdir, "standin.db")
+        options = synthetic_db.scaled_counts(args.scale)
+        if args.teams is not None:
+            options["teams"] = args.teams
+        if args.players_per_team is not None:
+            options["players_per_team"] = args.players_per_team
+        counts = synthetic_db.generate(db_path, logos=args.logos, seed=args.seed, **options)
+    synthetic_db.install(db_path)
+
+    import app as matchup_app
+    from snapshot import get_snapshot
+
+    start = time.perf_counter()
+    snapshot = get_snapshot()
+    snapshot_seconds = time.perf_counter() - start
+    teams = [str(name) for name in snapshot.team_names[:2]]
+    conference = sorted(set(snapshot.values["conference_abbreviation"]))[0]
+    endpoints = build_endpoints(args.endpoints, teams, conference)
+
+    app = matchup_app.app
+    client = app.test_client()
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else {}
+    results = []
+    for endpoint in endpoints:
+        row = run_sequential(endpoint, client, headers, args.requests, args.warmup)
+        if args.alloc_requests:
+            row.update(measure_allocations(endpoint, client, headers, args.alloc_requests))
+        results.append({"endpoint": endpoint.name, **row})
+        for threads in args.threads:
+            results.append({"endpoint": endpoint.name, **run_threaded(endpoint, app, headers, threads, args.duration)})
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": counts or {"path": db_path},
+            "database_fingerprint": synthetic_db.fingerprint(db_path),
+            "snapshot_load_seconds": round(snapshot_seconds, 3),
+            "response_cache": args.response_cache,
+            "accept_encoding": args.accept_encoding,
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'endpoint':<24} {'mode':<12} {'req':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'req/s':>9} {'peak KiB':>9}")
+        for row in results:
+            mode = f"{row['mode'][:8]}x{row['threads']}"
+            peak = row.get("alloc_peak_kib")
+            print(f"{row['endpoint']:<24} {mode:<12} {row['requests']:>6} {row['errors']:>4} "
+                  f"{row['p50_ms'] or 0:>9.2f} {row['p95_ms'] or 0:>9.2f} {row['p99_ms'] or 0:>9.2f} "
+                  f"{row['throughput_rps']:>9.1f} {'' if peak is None else f'{peak:.1f}':>9}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,377 @@
+"""Synthetic stand-in for the MySQL database, backed by a local SQLite file.
+
+``generate`` writes ``team``, ``conference``, ``player`` and ``logos`` tables
+with plausible values at any scale, and ``install`` points the app's
+connection pool at that file, so every route runs without a MySQL server:
+
+    python benchmarks/synthetic_db.py /tmp/matchup.db --scale 10
+"""
+import argparse
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Roughly one Division I season.
+REAL_TEAMS = 364
+REAL_CONFERENCES = 32
+REAL_PLAYERS_PER_TEAM = 14
+
+CONFERENCES = [
+    "ACC", "SEC", "Big Ten", "Big 12", "Big East", "WCC", "MWC", "A-10", "AAC", "MVC",
+    "CUSA", "MAC", "Sun Belt", "CAA", "Horizon", "Ivy", "MAAC", "OVC", "Patriot", "SoCon",
+    "Southland", "SWAC", "Summit", "WAC", "ASUN", "America East", "Big Sky", "Big South",
+    "Big West", "MEAC", "NEC", "Pac-12"
+]
+
+# column: (mean, standard deviation, correlation with team strength)
+TEAM_STATS = {
+    "team_points": (2300, 250, 0.5),
+    "opponent_points": (2200, 200, -0.4),
+    "pts_per_game": (74, 5, 0.5),
+    "opp_points_per_game": (71, 5, -0.5),
+    "margin_of_victory": (3, 8, 0.9),
+    "team_rebounds": (1100, 100, 0.3),
+    "offensive_rebounds": (320, 50, 0.2),
+    "assists": (430, 60, 0.4),
+    "steals": (200, 40, 0.2),
+    "blocks": (110, 30, 0.3),
+    "turnovers": (350, 40, -0.3),
+    "personal_fouls": (520, 50, -0.2),
+    "minutes_played": (6250, 300, 0.1),
+    "field_goals": (820, 90, 0.4),
+    "field_goals_attempted": (1850, 150, 0.2),
+    "field_goal_percentage": (0.44, 0.025, 0.6),
+    "3_point_field_goals": (240, 40, 0.3),
+    "3_point_field_goals_attempted": (700, 90, 0.1),
+    "3_point_percentage": (0.34, 0.025, 0.5),
+    "free_throws": (420, 70, 0.3),
+    "free_throws_attempted": (590, 90, 0.3),
+    "free_throw_percentage": (0.71, 0.04, 0.3),
+    "madness_rating": (50, 15, 0.9),
+    "net_rating_adjusted": (0, 12, 0.95),
+    "offensive_rating": (107, 6, 0.7),
+    "offensive_rating_adjusted": (105, 7, 0.8),
+    "defensive_rating_adjusted": (105, 7, -0.8),
+    "strength_of_schedule": (0, 5, 0.5),
+    "simple_rating_system": (0, 10, 0.95),
+    "offensive_srs": (0, 5, 0.8),
+    "defensive_srs": (0, 5, 0.8),
+    "pace": (68, 3, 0.0),
+    "free_throw_attempt_rate": (0.32, 0.05, 0.1),
+    "free_throws_per_field_goal": (0.23, 0.04, 0.2),
+    "3_point_attempt_rate": (0.38, 0.05, 0.0),
+    "team_rebound_percentage": (50, 3, 0.5),
+    "offensive_rebound_percentage": (29, 4, 0.3),
+    "assist_percentage": (52, 6, 0.3),
+    "steal_percentage": (9, 1.5, 0.3),
+    "block_percentage": (9, 2.5, 0.4),
+    "turnover_percentage": (16, 2, -0.4),
+    "effective_field_goal_percentage": (0.51, 0.03, 0.6),
+    "true_shooting_percentage": (0.55, 0.03, 0.6),
+}
+
+PLAYER_STATS = {
+    "minutes_per_game": (18, 9),
+    "fg_percentage_per_game": (0.44, 0.08),
+    "3p_percentage_per_game": (0.32, 0.1),
+    "ft_percentage_per_game": (0.70, 0.12),
+    "orb_per_game": (0.9, 0.7),
+    "drb_per_game": (2.4, 1.4),
+    "trb_per_game": (3.3, 2.0),
+    "ast_per_game": (1.6, 1.3),
+    "stl_per_game": (0.6, 0.4),
+    "blk_per_game": (0.4, 0.4),
+    "tov_per_game": (1.1, 0.7),
+    "pf_per_game": (1.7, 0.7),
+    "pts_per_game": (7.5, 5.0),
+}
+
+# MySQL-isms the app's SQL uses that SQLite spells differently.
+PARAMETER = re.compile(r"%s")
+DIGIT_IDENTIFIER = re.compile(r'(?<![\w`"\'])(\d+[A-Za-z_]\w*)')
+CHECKSUM = re.compile(r"^\s*CHECKSUM\s+TABLE\s+(.+?)(?:\s+(QUICK|EXTENDED))?\s*;?\s*$", re.IGNORECASE)
+CREATE_LIKE = re.compile(r"^\s*CREATE\s+TABLE\s+`?(\w+)`?\s+LIKE\s+`?(\w+)`?\s*;?\s*$", re.IGNORECASE)
+RENAME = re.compile(r"^\s*RENAME\s+TABLE\s+(.+?)\s*;?\s*$", re.IGNORECASE)
+
+
+def translate(sql):
+    """Rewrite MySQL placeholders and identifiers for SQLite."""
+    sql = PARAMETER.sub("?", sql)
+    sql = DIGIT_IDENTIFIER.sub(r'"\1"', sql)
+    return sql.replace("`", '"')
+
+
+class StandInCursor:
+    """The subset of a mysql.connector cursor the app uses, over a SQLite cursor."""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+        self._rows = None
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, sql, params=None):
+        match = CHECKSUM.match(sql)
+        if match:
+            tables = [table.strip().strip("`") for table in match.group(1).split(",")]
+            # Like InnoDB, there is no live checksum, so QUICK answers NULL.
+            quick = (match.group(2) or "").upper() == "QUICK"
+            self._rows = [(table, None if quick else self._checksum(table)) for table in tables]
+            self.description = [("Table",) + (None,) * 6, ("Checksum",) + (None,) * 6]
+            self.rowcount = len(self._rows)
+            return
+        match = CREATE_LIKE.match(sql)
+        if match:
+            self._create_like(*match.groups())
+            return
+        match = RENAME.match(sql)
+        if match:
+            self._rename(match.group(1))
+            return
+        self._cursor.execute(translate(sql), tuple(params or ()))
+        self.description = self._cursor.description
+        self._rows = self._cursor.fetchall() if self.description else None
+        self.rowcount = len(self._rows) if self._rows is not None else self._cursor.rowcount
+
+    def executemany(self, sql, seq_params):
+        self._cursor.executemany(translate(sql), [tuple(params) for params in seq_params])
+        self.description = None
+        self._rows = None
+        self.rowcount = self._cursor.rowcount
+
+    def _done(self):
+        self.description = None
+        self._rows = None
+        self.rowcount = 0
+
+    def _create_like(self, table, source):
+        """Emulate ``CREATE TABLE a LIKE b`` by replaying b's schema under a's name."""
+        self._cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (source,))
+        (schema,) = self._cursor.fetchone()
+        self._cursor.execute(re.sub(r'^CREATE TABLE\s+"?\w+"?', f'CREATE TABLE "{table}"', schema))
+        self._done()
+
+    def _rename(self, clauses):
+        """Emulate a multi-table ``RENAME TABLE`` as one transaction."""
+        pairs = [re.split(r"\s+TO\s+", clause.strip(), flags=re.IGNORECASE) for clause in clauses.split(",")]
+        self._cursor.execute("BEGIN")
+        try:
+            for old, new in pairs:
+                self._cursor.execute(f'ALTER TABLE "{old.strip("`")}" RENAME TO "{new.strip("`")}"')
+        except Exception:
+            self._cursor.execute("ROLLBACK")
+            raise
+        self._cursor.execute("COMMIT")
+        self._done()
+
+    def _checksum(self, table):
+        """Emulate ``CHECKSUM TABLE`` with a CRC over every row."""
+        crc = 0
+        for row in self._cursor.execute(f'SELECT * FROM "{table}"'):
+            crc = zlib.crc32(repr(row).encode(), crc)
+        return crc
+
+    @property
+    def column_names(self):
+        return tuple(column[0] for column in self.description or ())
+
+    def _convert(self, row):
+        if self._dictionary:
+            return dict(zip(self.column_names, row))
+        return tuple(row)
+
+    def fetchall(self):
+        rows, self._rows = self._rows or [], []
+        return [self._convert(row) for row in rows]
+
+    def fetchone(self):
+        if not self._rows:
+            return None
+        return self._convert(self._rows.pop(0))
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandInConnection:
+    """The subset of a mysql.connector connection the pool uses, over a SQLite file."""
+
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.autocommit = True
+
+    def cursor(self, buffered=True, dictionary=False):
+        return StandInCursor(self._connection, dictionary=dictionary)
+
+    def ping(self, reconnect=False):
+        self._connection.execute("SELECT 1")
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._connection.close()
+
+
+def install(path):
+    """Point the app's connection pool at a SQLite stand-in database."""
+    from db import POOL
+
+    POOL.set_connect(lambda **config: StandInConnection(path))
+
+
+def synthetic_logo(team_id, size, rng):
+    """Return PNG bytes for a two-colour badge on a white background, like the scraped logos."""
+    image = Image.new("RGB", (size, size), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    primary, secondary = (tuple(int(c) for c in rng.integers(0, 200, 3)) for _ in range(2))
+    margin = size // 8
+    draw.ellipse([margin, margin, size - margin, size - margin], fill=primary)
+    draw.rectangle([size // 3, size // 3, 2 * size // 3, 2 * size // 3], fill=secondary)
+    draw.text((size // 2 - 6, size // 2 - 6), str(team_id % 100), fill=(255, 255, 255))
+    output = io.BytesIO()
+    image.save(output, "PNG")
+    return output.getvalue()
+
+
+def generate(path, teams=REAL_TEAMS, conferences=REAL_CONFERENCES, players_per_team=REAL_PLAYERS_PER_TEAM,
+             logos=None, logo_size=200, seed=0):
+    """Write a fresh stand-in database to ``path`` and return the row counts.
+
+    Team stats share a latent strength so ratings, records and the model's
+    inputs stay mutually plausible. ``logos`` defaults to one per team.
+    """
+    rng = np.random.default_rng(seed)
+    logos = teams if logos is None else min(logos, teams)
+    conferences = max(1, conferences)
+    conference_names = [
+        CONFERENCES[k] if k < len(CONFERENCES) else f"Conference {k + 1}" for k in range(conferences)
+    ]
+
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    stat_columns = list(TEAM_STATS)
+    connection.execute("CREATE TABLE conference (conference_id INTEGER PRIMARY KEY, conference_abbreviation TEXT)")
+    connection.execute(
+        "CREATE TABLE team (team_id INTEGER PRIMARY KEY, team_name TEXT, games INTEGER, wins INTEGER, "
+        "losses INTEGER, win_percentage REAL, wins_conf INTEGER, losses_conf INTEGER, ap_rank INTEGER, "
+        + ", ".join(f'"{column}" REAL' for column in stat_columns)
+        + ", conference_id INTEGER)"
+    )
+    connection.execute(
+        "CREATE TABLE player (player_name TEXT, team_id INTEGER, position TEXT, class TEXT, "
+        "games_played INTEGER, games_started INTEGER, "
+        + ", ".join(f'"{column}" REAL' for column in PLAYER_STATS)
+        + ")"
+    )
+    connection.execute("CREATE TABLE logos (team_id INTEGER PRIMARY KEY, logo_binary BLOB)")
+
+    connection.executemany(
+        "INSERT INTO conference VALUES (?, ?)",
+        [(k + 1, name) for k, name in enumerate(conference_names)]
+    )
+
+    strength = rng.normal(0.0, 1.0, teams)
+    games = rng.integers(28, 36, teams)
+    win_percentage = np.clip(0.5 + 0.18 * strength + rng.normal(0.0, 0.05, teams), 0.05, 0.97)
+    wins = np.rint(games * win_percentage).astype(int)
+    conf_games = rng.integers(16, 21, teams)
+    wins_conf = np.clip(np.rint(conf_games * win_percentage), 0, conf_games).astype(int)
+    ap_rank = np.zeros(teams, dtype=int)
+    ap_rank[np.argsort(-strength)[:min(25, teams)]] = np.arange(1, min(25, teams) + 1)
+    stats = np.column_stack([
+        mean + sd * (corr * strength + np.sqrt(1 - corr ** 2) * rng.normal(0.0, 1.0, teams))
+        for mean, sd, corr in TEAM_STATS.values()
+    ])
+
+    team_rows = []
+    for k in range(teams):
+        team_rows.append(
+            (k + 1, f"Team {k + 1}", int(games[k]), int(wins[k]), int(games[k] - wins[k]),
+             round(float(wins[k] / games[k]), 3), int(wins_conf[k]), int(conf_games[k] - wins_conf[k]),
+             int(ap_rank[k]) or None, *(round(float(value), 3) for value in stats[k]),
+             k % conferences + 1)
+        )
+    connection.executemany(f"INSERT INTO team VALUES ({', '.join('?' * len(team_rows[0]))})", team_rows)
+
+    player_rows = []
+    classes = ["FR", "SO", "JR", "SR"]
+    positions = ["G", "F", "C"]
+    for team_id in range(1, teams + 1):
+        for k in range(players_per_team):
+            games_played = int(rng.integers(1, 36))
+            player_rows.append(
+                (f"Player {team_id}-{k + 1}", team_id, positions[k % 3], classes[int(rng.integers(0, 4))],
+                 games_played, int(rng.integers(0, games_played + 1)),
+                 *(round(max(0.0, float(rng.normal(mean, sd))), 1) for mean, sd in PLAYER_STATS.values()))
+            )
+    if player_rows:
+        connection.executemany(
+            f"INSERT INTO player VALUES ({', '.join('?' * len(player_rows[0]))})", player_rows
+        )
+
+    connection.executemany(
+        "INSERT INTO logos VALUES (?, ?)",
+        ((team_id, synthetic_logo(team_id, logo_size, rng)) for team_id in range(1, logos + 1))
+    )
+    connection.commit()
+    connection.close()
+    return {"teams": teams, "conferences": conferences, "players": len(player_rows), "logos": logos}
+
+
+def scaled_counts(scale):
+    """Return generator keyword arguments for ``scale`` times a real season."""
+    return {
+        "teams": max(2, round(REAL_TEAMS * scale)),
+        "conferences": max(1, round(REAL_CONFERENCES * min(scale, 1.0))),
+        "players_per_team": REAL_PLAYERS_PER_TEAM,
+    }
+
+
+def fingerprint(path):
+    """Return a short hash of the database file, to tie benchmark results to their data."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of a real season (up to 10)")
+    parser.add_argument("--teams", type=int)
+    parser.add_argument("--conferences", type=int)
+    parser.add_argument("--players-per-team", type=int)
+    parser.add_argument("--logos", type=int, help="teams with a logo (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = scaled_counts(args.scale)
+    for name in ("teams", "conferences", "players_per_team"):
+        if getattr(args, name) is not None:
+            counts[name] = getattr(args, name)
+    start = time.perf_counter()
+    counts = generate(args.path, logos=args.logos, seed=args.seed, **counts)
+    print(f"wrote {counts} to {args.path} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
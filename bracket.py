@@ -0,0 +1,168 @@
+import multiprocessing
+import secrets
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Kept free of app/database imports: spawned pool workers import this module.
+
+REGION_SEED_ORDER = [1, 16, 8, 9, 5, 12, 4, 13, 6, 11, 3, 14, 7, 10, 2, 15]
+# Listed in Final Four pairing order: the first two regions meet, as do the last two.
+DEFAULT_REGIONS = ["East", "West", "South", "Midwest"]
+# Region (index into the region list) of overall seeds 1-4, so 1 meets 4 and 2 meets 3 in the Final Four.
+S_CURVE = [0, 2, 3, 1]
+# Seeds passed in must fit in a signed 64-bit integer.
+SEED_LIMIT = 2 ** 63
+ROUNDS = ["round_of_64", "round_of_32", "sweet_16", "elite_8", "final_four", "championship", "champion"]
+
+
+class Bracket:
+    """A 64- or 68-team field laid out in bracket order.
+
+    ``entries`` is a list of ``(team, seed, region)``. Each of four regions needs
+    seeds 1-16; a seed line holding two teams in the same region becomes a
+    First Four game whose winner takes that slot. Regions meet in the Final Four
+    in the order they first appear (first vs second, third vs fourth).
+    """
+
+    def __init__(self, entries):
+        self.teams = [team for team, _, _ in entries]
+        self.seeds = [int(seed) for _, seed, _ in entries]
+        self.regions = [region for _, _, region in entries]
+        if len(set(self.teams)) != len(self.teams):
+            raise ValueError("Each team may appear in the field only once.")
+
+        region_names = list(dict.fromkeys(self.regions))
+        if len(region_names) != 4:
+            raise ValueError("The field must have exactly four regions.")
+
+        by_slot = {}
+        for index, (seed, region) in enumerate(zip(self.seeds, self.regions)):
+            by_slot.setdefault((region, seed), []).append(index)
+
+        self.slots = np.full(64, -1, dtype=np.int16)
+        play_in = []
+        for r, region in enumerate(region_names):
+            for position, seed in enumerate(REGION_SEED_ORDER):
+                slot = r * 16 + position
+                teams = by_slot.pop((region, seed), [])
+                if len(teams) == 1:
+                    self.slots[slot] = teams[0]
+                elif len(teams) == 2:
+                    play_in.append((slot, teams[0], teams[1]))
+                else:
+                    raise ValueError(f"{region} needs one or two teams on the {seed} seed line, found {len(teams)}.")
+        if by_slot:
+            raise ValueError("Seeds must be between 1 and 16.")
+
+        self.region_names = region_names
+        self.play_in = np.array(play_in, dtype=np.int16).reshape(-1, 3)
+
+
+def default_field(snapshot, size=68, regions=DEFAULT_REGIONS):
+    """Seed the top ``size`` teams by madness rating on an S-curve.
+
+    The first 60 teams fill seed lines 1-15 and the last eight play four
+    First Four games for the 16 seeds (none when ``size`` is 64). The top
+    four overall seeds go to regions so the best two can only meet in the
+    final; entries are returned grouped by region in ``regions`` order.
+    """
+    indices = snapshot.order("madness_rating")[:size]
+    if len(indices) != size or size not in (64, 68):
+        raise ValueError(f"Need {size} teams (64 or 68) with a madness rating, found {len(indices)}.")
+
+    entries = []
+    direct = size - 2 * (size - 64)
+    for rank, index in enumerate(indices[:direct]):
+        line, position = divmod(rank, 4)
+        region = regions[S_CURVE[position] if line % 2 == 0 else S_CURVE[3 - position]]
+        entries.append((int(index), line + 1, region))
+
+    play_in = indices[direct:]
+    for game in range(len(play_in) // 2):
+        region = regions[S_CURVE[3 - game]]
+        entries.append((int(play_in[game]), 16, region))
+        entries.append((int(play_in[-1 - game]), 16, region))
+    # Bracket pairs regions in the order they first appear.
+    entries.sort(key=lambda entry: regions.index(entry[2]))
+    return entries
+
+
+def neutral_probabilities(win_probs):
+    """Turn home win probabilities into neutral-site odds by averaging both venues.
+
+    Pairs the model cannot score (NaN) fall back to a coin flip.
+    """
+    neutral = (win_probs + (1.0 - win_probs.T)) / 2.0
+    neutral = np.where(np.isnan(neutral), 0.5, neutral)
+    np.fill_diagonal(neutral, 0.5)
+    return neutral
+
+
+def simulate_chunk(slots, play_in, probs, simulations, seed_sequence):
+    """Play ``simulations`` tournaments at once and count how far each team gets."""
+    rng = np.random.default_rng(seed_sequence)
+    team_count = probs.shape[0]
+    counts = np.zeros((team_count, len(ROUNDS)), dtype=np.int64)
+
+    alive = np.broadcast_to(slots, (simulations, slots.size)).copy()
+    for slot, team_a, team_b in play_in:
+        wins = rng.random(simulations) < probs[team_a, team_b]
+        alive[:, slot] = np.where(wins, team_a, team_b)
+    counts[:, 0] = np.bincount(alive.ravel(), minlength=team_count)
+
+    for round_index in range(1, len(ROUNDS)):
+        team_a = alive[:, 0::2]
+        team_b = alive[:, 1::2]
+        wins = rng.random(team_a.shape) < probs[team_a, team_b]
+        alive = np.where(wins, team_a, team_b)
+        counts[:, round_index] = np.bincount(alive.ravel(), minlength=team_count)
+    return counts
+
+
+def simulate(bracket, probs, simulations, seed=None, chunk_size=20000, executor=None):
+    """Return (odds, seed): each team's probability of reaching each round.
+
+    Work is split into fixed-size chunks with independent child seeds, so a
+    given seed gives the same answer however many workers run the chunks.
+    Without a seed one is drawn below 2**53, so JavaScript clients can read it
+    exactly and pass it back.
+    """
+    if seed is None:
+        seed = secrets.randbits(53)
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = [chunk_size] * (simulations // chunk_size)
+    if simulations % chunk_size:
+        sizes.append(simulations % chunk_size)
+    children = seed_sequence.spawn(len(sizes))
+    probs = np.ascontiguousarray(probs, dtype=np.float64)
+
+    args = [(bracket.slots, bracket.play_in, probs, size, child) for size, child in zip(sizes, children)]
+    if executor is None:
+        results = [simulate_chunk(*chunk) for chunk in args]
+    else:
+        results = executor.map(simulate_chunk, *zip(*args))
+
+    counts = np.zeros((probs.shape[0], len(ROUNDS)), dtype=np.int64)
+    for chunk_counts in results:
+        counts += chunk_counts
+    return counts / max(simulations, 1), seed
+
+
+_EXECUTORS = {}
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor(workers):
+    """Return a shared process pool with ``workers`` processes, or None to run in-process."""
+    if workers <= 1:
+        return None
+    with _EXECUTOR_LOCK:
+        if workers not in _EXECUTORS:
+            _EXECUTORS[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _EXECUTORS[workers]
@@ -0,0 +1,135 @@
+import io
+import json
+
+import numpy as np
+
+from flask import current_app, jsonify, request
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+ROW_FORMAT = "rows"
+FORMATS = ("rows", "columns", "msgpack", "arrow")
+MSGPACK_MIMETYPE = "application/msgpack"
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+# Accept header types that select a binary format when no ``format`` argument is given.
+ACCEPT_FORMATS = {
+    ARROW_MIMETYPE: "arrow",
+    MSGPACK_MIMETYPE: "msgpack",
+    "application/x-msgpack": "msgpack"
+}
+
+
+def requested_format():
+    """Return the response format asked for by ``?format=`` or, failing that, the Accept header."""
+    name = request.args.get("format")
+    if name:
+        return name
+    # Exact matches only: a wildcard such as */* keeps the default row format.
+    for mimetype, quality in request.accept_mimetypes:
+        if quality > 0 and mimetype in ACCEPT_FORMATS:
+            return ACCEPT_FORMATS[mimetype]
+    return ROW_FORMAT
+
+
+def format_error(name):
+    """Return an error message if ``name`` cannot be served here, else None."""
+    if name not in FORMATS:
+        return f"format must be one of {', '.join(FORMATS)}."
+    if name == "msgpack" and msgpack is None:
+        return "MessagePack responses need the msgpack package."
+    if name == "arrow" and pyarrow is None:
+        return "Arrow responses need the pyarrow package."
+    return None
+
+
+def column_type(values):
+    """Classify a float64 column as ``int`` when every non-NULL value is whole, else ``float``."""
+    present = values[~np.isnan(values)]
+    return "int" if np.array_equal(present, np.floor(present)) else "float"
+
+
+class ColumnSet:
+    """Named, typed columns cut from a snapshot's arrays for the selected rows.
+
+    Numeric columns are gathered straight from float64 arrays with NaN for
+    NULL; text columns from the raw object arrays. No row tuples or dicts
+    are built on the way to any format.
+    """
+
+    def __init__(self, names, values, numeric, indices, text_columns=()):
+        self.names = list(names)
+        self.length = len(indices)
+        self.types = []
+        self.columns = []
+        for name in self.names:
+            if name in text_columns or name not in numeric:
+                self.types.append("string")
+                self.columns.append(values[name][indices])
+            else:
+                column = numeric[name][indices]
+                self.types.append(column_type(column))
+                self.columns.append(column)
+
+    def schema(self):
+        return [{"name": name, "type": kind} for name, kind in zip(self.names, self.types)]
+
+    def as_lists(self):
+        """Return each column as a plain list, with None for NULL and whole numbers as ints."""
+        lists = {}
+        for name, kind, column in zip(self.names, self.types, self.columns):
+            if kind == "string":
+                lists[name] = [None if value is None else str(value) for value in column]
+                continue
+            missing = np.isnan(column)
+            if kind == "int":
+                column = np.where(missing, 0, column).astype(np.int64)
+            values = column.tolist()
+            if missing.any():
+                for i in np.flatnonzero(missing):
+                    values[i] = None
+            lists[name] = values
+        return lists
+
+    def payload(self, extra=None):
+        """Return the column-oriented document shared by the JSON and MessagePack formats."""
+        return {"schema": self.schema(), "length": self.length, "columns": self.as_lists(), **(extra or {})}
+
+    def arrow(self, extra=None):
+        """Return an Arrow IPC stream; ``extra`` is stored as JSON in the schema metadata."""
+        arrays = []
+        for kind, column in zip(self.types, self.columns):
+            if kind == "string":
+                arrays.append(pyarrow.array([None if value is None else str(value) for value in column],
+                                            type=pyarrow.string()))
+            else:
+                missing = np.isnan(column)
+                data = np.where(missing, 0, column).astype(np.int64) if kind == "int" else column
+                arrays.append(pyarrow.array(data, mask=missing))
+        metadata = {"extra": json.dumps(extra or {}, default=str)}
+        table = pyarrow.Table.from_arrays(arrays, names=self.names, metadata=metadata)
+        sink = io.BytesIO()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+
+
+def columnar_response(name, columns, extra=None):
+    """Serialize a ColumnSet in one of the non-row formats."""
+    if name == "columns":
+        response = jsonify(columns.payload(extra))
+    elif name == "msgpack":
+        body = msgpack.packb(columns.payload(extra), default=str)
+        response = current_app.response_class(body, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = current_app.response_class(columns.arrow(extra), mimetype=ARROW_MIMETYPE)
+    response.vary.add("Accept")
+    return response
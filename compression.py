@@ -0,0 +1,62 @@
+import gzip
+import logging
+
+from flask import request
+
+from config import compression_config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SUPPORTED_ENCODINGS = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(size):
+    """Return the best content coding the client accepts for a ``size`` byte body, or None."""
+    if not compression_config["enabled"] or size < compression_config["min_size"]:
+        return None
+    return request.accept_encodings.best_match(SUPPORTED_ENCODINGS)
+
+
+def compress(body, encoding):
+    """Compress ``body`` with ``encoding`` ("br" or "gzip")."""
+    if encoding == "br":
+        return brotli.compress(body, quality=compression_config["brotli_quality"])
+    return gzip.compress(body, compresslevel=compression_config["gzip_level"], mtime=0)
+
+
+def compress_response(response):
+    """Compress JSON responses that were not already encoded (``after_request`` hook)."""
+    if (response.direct_passthrough
+            or not response.is_json
+            or "Content-Encoding" in response.headers
+            or response.status_code < 200 or response.status_code >= 300):
+        return response
+
+    body = response.get_data()
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(len(body))
+    if encoding is None:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # The view compared If-None-Match against the uncompressed tag; check again
+        # against the tag the client actually holds for this coding.
+        response.set_etag(f"{etag}-{encoding}", weak)
+        return response.make_conditional(request)
+    return response
+
+
+def install_compression(app):
+    """Compress ``app``'s JSON responses and log which codings are available."""
+    app.after_request(compress_response)
+    if not compression_config["enabled"]:
+        logging.info("Response compression: off")
+        return
+    if brotli is None:
+        logging.warning("brotli is not installed; responses are compressed with gzip only")
+    logging.info("Response compression: %s", ", ".join(SUPPORTED_ENCODINGS))
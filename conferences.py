@@ -0,0 +1,141 @@
+import numpy as np
+
+from config import conference_config
+from plotly_view import PLOTLY_STATS
+from snapshot import register_warmer
+
+AGGREGATES = ["mean", "median", "min", "max", "std", "count"]
+STRENGTH_COLUMN = "net_rating_adjusted"
+
+
+def nan_to_none(value):
+    """Return a float, or None for NaN (a conference with no values for the stat)."""
+    return None if np.isnan(value) else float(value)
+
+
+def group_sorted(matrix, groups):
+    """Sort every column by (group, value) at once, NaN last inside each group.
+
+    Returns the sorted matrix; row ``k`` of each column belongs to the same
+    group as row ``k`` of ``np.sort(groups)``.
+    """
+    keys = np.where(np.isnan(matrix), np.inf, matrix)
+    by_value = np.argsort(keys, axis=0, kind="stable")
+    by_group = np.argsort(groups[by_value], axis=0, kind="stable")
+    return np.take_along_axis(matrix, np.take_along_axis(by_value, by_group, axis=0), axis=0)
+
+
+class ConferenceSummary:
+    """Per-conference aggregates of every Plotly stat plus conference strength.
+
+    Teams are grouped once by conference code; means, standard deviations
+    and counts come from ``np.add.reduceat`` over the grouped rows and
+    medians, minimums and maximums from one column-wise (group, value)
+    sort, so the whole table is a handful of array operations.
+    """
+
+    def __init__(self, snapshot, columns=PLOTLY_STATS, depth=None):
+        self.columns = [column for column in columns if column in snapshot.numeric]
+        self.depth = conference_config["depth"] if depth is None else depth
+
+        abbreviations = snapshot.values["conference_abbreviation"]
+        member = np.array([value is not None for value in abbreviations], dtype=bool)
+        self.names = sorted({value for value in abbreviations[member]})
+        code = {name: k for k, name in enumerate(self.names)}
+        rows = np.flatnonzero(member)
+        groups = np.array([code[value] for value in abbreviations[rows]], dtype=np.int64)
+        self.teams = np.bincount(groups, minlength=len(self.names))
+        starts = np.concatenate(([0], np.cumsum(self.teams)[:-1])).astype(np.int64)
+
+        if self.columns:
+            matrix = np.column_stack([snapshot.numeric[column][rows] for column in self.columns])
+        else:
+            matrix = np.empty((len(rows), 0))
+        self.stats = self.aggregate(matrix, groups, starts)
+        self.strength = self.strength_ratings(snapshot, rows, groups, starts)
+
+    def aggregate(self, matrix, groups, starts):
+        """Return ``{aggregate: (conference x column) array}`` with NaN where a conference has no values."""
+        if not len(self.names):
+            empty = np.empty((0, len(self.columns)))
+            return {name: empty for name in AGGREGATES}
+
+        grouped = matrix[np.argsort(groups, kind="stable")]
+        present = ~np.isnan(grouped)
+        count = np.add.reduceat(present.astype(np.float64), starts, axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.add.reduceat(np.where(present, grouped, 0.0), starts, axis=0) / count
+            deviation = np.where(present, grouped - np.repeat(mean, self.teams, axis=0), 0.0)
+            std = np.sqrt(np.add.reduceat(deviation * deviation, starts, axis=0) / count)
+
+        ordered = group_sorted(matrix, groups)
+        n = count.astype(np.int64)
+        has = n > 0
+        first = starts[:, None]
+        last = first + np.maximum(n - 1, 0)
+        low = first + np.maximum(n - 1, 0) // 2
+        high = first + np.maximum(n, 1) // 2
+        column = np.arange(len(self.columns))[None, :]
+        median = (ordered[low, column] + ordered[high, column]) / 2
+        return {
+            "mean": mean,
+            "median": np.where(has, median, np.nan),
+            "min": np.where(has, ordered[first, column], np.nan),
+            "max": np.where(has, ordered[last, column], np.nan),
+            "std": std,
+            "count": count
+        }
+
+    def strength_ratings(self, snapshot, rows, groups, starts):
+        """Average net rating, mean net of the best ``depth`` teams, and rank by average net."""
+        if not len(self.names):
+            return {"average_net": np.empty(0), "depth_net": np.empty(0), "rank": np.empty(0, dtype=np.int64)}
+
+        # Best net rating first inside each conference, NULLs last.
+        net = -group_sorted(-snapshot.numeric[STRENGTH_COLUMN][rows][:, None], groups)[:, 0]
+        present = ~np.isnan(net)
+        place = np.arange(len(net)) - np.repeat(starts, self.teams)
+        top = present & (place < self.depth)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average = np.add.reduceat(np.where(present, net, 0.0), starts) / np.add.reduceat(present.astype(np.int64), starts)
+            depth = np.add.reduceat(np.where(top, net, 0.0), starts) / np.add.reduceat(top.astype(np.int64), starts)
+
+        keys = np.where(np.isnan(average), np.inf, -average)
+        rank = np.empty(len(self.names), dtype=np.int64)
+        rank[np.argsort(keys, kind="stable")] = np.arange(1, len(self.names) + 1)
+        return {"average_net": average, "depth_net": depth, "rank": rank}
+
+    def conference(self, k):
+        """Return the summary document for the ``k``-th conference."""
+        return {
+            "conference": self.names[k],
+            "teams": int(self.teams[k]),
+            "strength": {
+                "rank": int(self.strength["rank"][k]),
+                "average_net": nan_to_none(self.strength["average_net"][k]),
+                "depth_net": nan_to_none(self.strength["depth_net"][k])
+            },
+            "stats": {
+                column: {
+                    name: int(self.stats[name][k, j]) if name == "count" else nan_to_none(self.stats[name][k, j])
+                    for name in AGGREGATES
+                }
+                for j, column in enumerate(self.columns)
+            }
+        }
+
+    def summary(self, conference=None):
+        """Return every conference (or just one) ordered by strength rank."""
+        order = np.argsort(self.strength["rank"], kind="stable")
+        return [self.conference(k) for k in order if conference is None or self.names[k] == conference]
+
+
+def get_conference_summary(snapshot):
+    """Return the conference summary for a snapshot, building it on first use."""
+    return snapshot.derived("conference_summary", ConferenceSummary)
+
+
+@register_warmer
+def warm_conference_summary(snapshot):
+    """Aggregate conferences while a new snapshot loads so no request pays for it."""
+    get_conference_summary(snapshot)
@@ -6,4 +6,112 @@ db_config = {
     'password': os.environ.get('DB_PASSWORD'),
     'database': os.environ.get('DB_NAME'),
     'use_pure': True
-}
\ No newline at end of file
+}
+
+pool_config = {
+    'size': int(os.environ.get('DB_POOL_SIZE', 5)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    'ping_interval': float(os.environ.get('DB_POOL_PING_INTERVAL', 30)),
+    'recycle': float(os.environ.get('DB_POOL_RECYCLE', 3600))
+}
+
+snapshot_config = {
+    'ttl': float(os.environ.get('SNAPSHOT_TTL', 900)),
+    'version_check_interval': float(os.environ.get('SNAPSHOT_VERSION_CHECK_INTERVAL', 60))
+}
+
+model_config = {
+    'fast_path': os.environ.get('MODEL_FAST_PATH', '1') != '0'
+}
+
+matrix_config = {
+    'path': os.environ.get('PROB_MATRIX_PATH') or None,
+    'chunk_rows': int(os.environ.get('PROB_MATRIX_CHUNK_ROWS', 32768))
+}
+
+bracket_config = {
+    'default_simulations': int(os.environ.get('BRACKET_DEFAULT_SIMULATIONS', 10000)),
+    'max_simulations': int(os.environ.get('BRACKET_MAX_SIMULATIONS', 1000000)),
+    'chunk_size': int(os.environ.get('BRACKET_CHUNK_SIZE', 20000)),
+    'workers': int(os.environ.get('BRACKET_WORKERS', 1))
+}
+
+logo_config = {
+    'max_age': int(os.environ.get('LOGO_MAX_AGE', 300)),
+    'sizes': [int(size) for size in os.environ.get('LOGO_SIZES', '32,64,128').split(',') if size.strip()],
+    'cache_dir': os.environ.get('LOGO_CACHE_DIR') or None,
+    'prebuild': os.environ.get('LOGO_PREBUILD', '0') == '1'
+}
+
+response_cache_config = {
+    'enabled': os.environ.get('RESPONSE_CACHE', '1') != '0',
+    'max_bytes': int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+    'max_age': int(os.environ.get('RESPONSE_CACHE_MAX_AGE', 0))
+}
+
+json_config = {
+    'encoder': os.environ.get('JSON_ENCODER', 'orjson')
+}
+
+compression_config = {
+    'enabled': os.environ.get('COMPRESSION', '1') != '0',
+    'min_size': int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),
+    'gzip_level': int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+    'brotli_quality': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+}
+
+tier_config = {
+    'power_conferences': [name.strip() for name in os.environ.get('POWER_CONFERENCES', 'Big Ten,ACC,Big 12,Big East,SEC').split(',') if name.strip()],
+    'contenders': [int(limit) for limit in os.environ.get('TIER_CONTENDERS', '20,20,50').split(',')],
+    'next_up': [int(limit) for limit in os.environ.get('TIER_NEXT_UP', '35,35,100').split(',')],
+    'mid_majors': [int(limit) for limit in os.environ.get('TIER_MID_MAJORS', '25,25,50').split(',')]
+}
+
+metrics_config = {
+    'enabled': os.environ.get('METRICS', '1') != '0'
+}
+
+logging_config = {
+    'path': os.environ.get('LOG_PATH') or None,
+    'level': os.environ.get('LOG_LEVEL', 'DEBUG').upper(),
+    'max_bytes': int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+    'backup_count': int(os.environ.get('LOG_BACKUP_COUNT', 5)),
+    'debug_sample_rate': float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 0.01)),
+    'access_log': os.environ.get('ACCESS_LOG', '1') != '0'
+}
+
+profiling_config = {
+    'enabled': os.environ.get('PROFILING', '0') == '1',
+    'dir': os.environ.get('PROFILE_DIR') or os.path.join(os.path.dirname(__file__), 'backend', 'profiles'),
+    'sample_rate': float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+    'header': os.environ.get('PROFILE_HEADER', 'X-Profile'),
+    'token': os.environ.get('PROFILE_TOKEN') or None,
+    'max_files': int(os.environ.get('PROFILE_MAX_FILES', 200))
+}
+
+plotly_config = {
+    'precompute': os.environ.get('PLOTLY_PRECOMPUTE', '1') != '0',
+    'view_cache_size': int(os.environ.get('PLOTLY_VIEW_CACHE_SIZE', 1024))
+}
+
+conference_config = {
+    'depth': int(os.environ.get('CONFERENCE_DEPTH', 5))
+}
+
+ingest_config = {
+    'batch_size': int(os.environ.get('INGEST_BATCH_SIZE', 1000))
+}
+
+search_config = {
+    'aliases_path': os.environ.get('TEAM_ALIASES_PATH') or None,
+    'limit': int(os.environ.get('SEARCH_LIMIT', 8)),
+    'max_limit': int(os.environ.get('SEARCH_MAX_LIMIT', 50)),
+    'fuzzy_min_length': int(os.environ.get('SEARCH_FUZZY_MIN_LENGTH', 3)),
+    'cache_size': int(os.environ.get('SEARCH_CACHE_SIZE', 2048))
+}
+
+similarity_config = {
+    'depth': int(os.environ.get('SIMILAR_TEAMS_DEPTH', 25)),
+    'max_k': int(os.environ.get('SIMILAR_TEAMS_MAX_K', 25)),
+    'rescale_tolerance': float(os.environ.get('SIMILAR_TEAMS_RESCALE_TOLERANCE', 0.01))
+}
@@ -0,0 +1,254 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+from contextlib import contextmanager
+
+import mysql.connector
+
+from config import db_config, pool_config
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection is returned within the checkout timeout."""
+
+
+class TimedCursor:
+    """Cursor proxy that reports how long each statement takes to its pool."""
+
+    def __init__(self, cursor, pool):
+        self._cursor = cursor
+        self._pool = pool
+
+    def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        finally:
+            self._pool._record_query(time.perf_counter() - start)
+
+    def executemany(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(*args, **kwargs)
+        finally:
+            self._pool._record_query(time.perf_counter() - start)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ConnectionPool:
+    """A small per-process pool of MySQL connections.
+
+    Connections are created lazily up to ``size``. Checkouts block for at most
+    ``timeout`` seconds when every connection is in use. Idle connections are
+    pinged before reuse once they have been idle longer than ``ping_interval``
+    and are replaced after ``recycle`` seconds so the server never hands us a
+    socket it already closed.
+    """
+
+    def __init__(self, config, size=5, timeout=10.0, ping_interval=30.0, recycle=3600.0, connect=None):
+        self._config = dict(config)
+        self._size = max(1, int(size))
+        self._timeout = float(timeout)
+        self._ping_interval = float(ping_interval)
+        self._recycle = float(recycle)
+        self._connect = connect or mysql.connector.connect
+        self._lock = threading.Lock()
+        self._query_listeners = []
+        self._reset()
+
+    def _reset(self):
+        """Drop all bookkeeping; used at startup and after a fork."""
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._born = {}
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "connects": 0,
+            "connect_errors": 0,
+            "discarded": 0,
+            "queries": 0,
+            "query_time_total": 0.0,
+        }
+
+    def set_connect(self, connect):
+        """Swap the connection factory (e.g. for a local stand-in database) and empty the pool."""
+        self.close_all()
+        self._connect = connect
+
+    def add_query_listener(self, listener):
+        """Call ``listener(seconds)`` after every statement run through ``cursor()``."""
+        self._query_listeners.append(listener)
+
+    def _record_query(self, seconds):
+        """Count one statement and pass its duration to the listeners."""
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["query_time_total"] += seconds
+        for listener in self._query_listeners:
+            listener(seconds)
+
+    def _check_fork(self):
+        """Never share sockets inherited from a parent process (gunicorn --preload)."""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _open(self):
+        """Open a new autocommit connection for a slot already reserved in ``_created``."""
+        try:
+            conn = self._connect(**self._config)
+            conn.autocommit = True
+        except Exception:
+            with self._lock:
+                self._created -= 1
+                self._stats["connect_errors"] += 1
+            raise
+        with self._lock:
+            self._stats["connects"] += 1
+            self._born[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        """Close a connection and free its slot."""
+        with self._lock:
+            self._created -= 1
+            self._stats["discarded"] += 1
+            self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn, idle_since):
+        """Return False for connections past their lifetime or failing a ping."""
+        now = time.monotonic()
+        if now - self._born.get(id(conn), now) > self._recycle:
+            return False
+        if now - idle_since < self._ping_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception as e:
+            logging.debug(f"Dropping stale pooled connection: {e}")
+            return False
+
+    def acquire(self):
+        """Check out a connection, waiting up to the pool timeout if none are free."""
+        self._check_fork()
+        start = time.monotonic()
+        waited = False
+        while True:
+            try:
+                conn, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self._size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    conn = self._open()
+                    break
+                waited = True
+                remaining = self._timeout - (time.monotonic() - start)
+                try:
+                    if remaining <= 0:
+                        raise queue.Empty
+                    conn, idle_since = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self._timeout:.1f}s "
+                        f"(pool size {self._size})"
+                    )
+            if self._is_healthy(conn, idle_since):
+                break
+            self._discard(conn)
+
+        wait = time.monotonic() - start
+        with self._lock:
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time_total"] += wait
+                self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait)
+        return conn
+
+    def release(self, conn, broken=False):
+        """Return a connection to the pool, or close it if it is no longer usable."""
+        if self._pid != os.getpid():
+            return
+        if broken:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """Context manager that always hands the connection back to the pool."""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    @contextmanager
+    def cursor(self, dictionary=False):
+        """Context manager yielding a buffered, timed cursor on a pooled connection."""
+        with self.connection() as conn:
+            cursor = conn.cursor(buffered=True, dictionary=dictionary)
+            try:
+                yield TimedCursor(cursor, self)
+            finally:
+                cursor.close()
+
+    def close_all(self):
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        """Return a snapshot of pool usage counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            idle = self._idle.qsize()
+            stats.update({
+                "size": self._size,
+                "created": self._created,
+                "idle": idle,
+                "in_use": self._created - idle,
+                "timeout_seconds": self._timeout,
+            })
+        stats["wait_time_avg"] = stats["wait_time_total"] / stats["waits"] if stats["waits"] else 0.0
+        return stats
+
+
+POOL = ConnectionPool(db_config, **pool_config)
+
+
+def db_cursor(dictionary=False):
+    """Shortcut for ``POOL.cursor()`` used by the API routes."""
+    return POOL.cursor(dictionary=dictionary)
@@ -0,0 +1,244 @@
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import model_config
+from snapshot import register_warmer
+
+_PREDICT_LISTENERS = []
+
+model_path = os.path.join(os.path.dirname(__file__), 'model_1_0.pkl')
+
+# (feature, side, team column): "home" and "away" read one team's column,
+# "diff" is home minus away, and "per_game_diff" divides by games first.
+FEATURE_SPEC = [
+    ('sos_diff', 'diff', 'strength_of_schedule'),
+    ('net_diff', 'diff', 'net_rating_adjusted'),
+    ('srs_diff', 'diff', 'simple_rating_system'),
+    ('mov_diff', 'diff', 'margin_of_victory'),
+    ('pts_per_game', 'home', 'pts_per_game'),
+    ('opp_points_per_game_Team1', 'away', 'opp_points_per_game'),
+    ('pts_per_game_Team1', 'away', 'pts_per_game'),
+    ('opp_points_per_game', 'home', 'opp_points_per_game'),
+    ('assist_percentage', 'home', 'assist_percentage'),
+    ('team_rebound_percentage', 'home', 'team_rebound_percentage'),
+    ('rebs_diff', 'per_game_diff', 'team_rebounds'),
+    ('turnover_percentage', 'home', 'turnover_percentage'),
+    ('steal_percentage_Team1', 'away', 'steal_percentage'),
+    ('block_percentage_Team1', 'away', 'block_percentage'),
+    ('field_goal_percentage', 'home', 'field_goal_percentage'),
+    ('3_point_percentage', 'home', '3_point_percentage'),
+    ('free_throw_percentage', 'home', 'free_throw_percentage'),
+    ('pace_diff', 'diff', 'pace'),
+    ('offensive_rating', 'home', 'offensive_rating'),
+    ('offensive_srs', 'home', 'offensive_srs'),
+    ('defensive_srs_Team1', 'away', 'defensive_srs'),
+    ('offensive_rating_adjusted', 'home', 'offensive_rating_adjusted'),
+    ('defensive_rating_adjusted_Team1', 'away', 'defensive_rating_adjusted'),
+    ('true_shooting_percentage', 'home', 'true_shooting_percentage'),
+    ('offensive_rebound_percentage', 'home', 'offensive_rebound_percentage'),
+    ('madness_diff', 'diff', 'madness_rating'),
+    ('off_srs_diff', 'diff', 'offensive_srs'),
+    ('def_srs_diff', 'diff', 'defensive_srs'),
+    ('ts_diff', 'diff', 'true_shooting_percentage'),
+    ('off_rating_diff', 'diff', 'offensive_rating_adjusted'),
+    ('def_rating_diff', 'diff', 'defensive_rating_adjusted'),
+    ('ft_rate_diff', 'diff', 'free_throw_attempt_rate'),
+    ('3pa_rate_diff', 'diff', '3_point_attempt_rate')
+]
+
+
+def build_matchup_features(team_home, team_away):
+    """Build the model input feature dict for a home vs away matchup."""
+    return {
+        'sos_diff': team_home['strength_of_schedule'] - team_away['strength_of_schedule'],
+        'net_diff': team_home['net_rating_adjusted'] - team_away['net_rating_adjusted'],
+        'srs_diff': team_home['simple_rating_system'] - team_away['simple_rating_system'],
+        'mov_diff': team_home['margin_of_victory'] - team_away['margin_of_victory'],
+        'pts_per_game': team_home['pts_per_game'],
+        'opp_points_per_game_Team1': team_away['opp_points_per_game'],
+        'pts_per_game_Team1': team_away['pts_per_game'],
+        'opp_points_per_game': team_home['opp_points_per_game'],
+        'assist_percentage': team_home['assist_percentage'],
+        'team_rebound_percentage': team_home['team_rebound_percentage'],
+        'rebs_diff': (team_home['team_rebounds'] / team_home['games']) - (team_away['team_rebounds'] / team_away['games']),
+        'turnover_percentage': team_home['turnover_percentage'],
+        'steal_percentage_Team1': team_away['steal_percentage'],
+        'block_percentage_Team1': team_away['block_percentage'],
+        'field_goal_percentage': team_home['field_goal_percentage'],
+        '3_point_percentage': team_home['3_point_percentage'],
+        'free_throw_percentage': team_home['free_throw_percentage'],
+        'pace_diff': team_home['pace'] - team_away['pace'],
+        'offensive_rating': team_home['offensive_rating'],
+        'offensive_srs': team_home['offensive_srs'],
+        'defensive_srs_Team1': team_away['defensive_srs'],
+        'offensive_rating_adjusted': team_home['offensive_rating_adjusted'],
+        'defensive_rating_adjusted_Team1': team_away['defensive_rating_adjusted'],
+        'true_shooting_percentage': team_home['true_shooting_percentage'],
+        'offensive_rebound_percentage': team_home['offensive_rebound_percentage'],
+        'madness_diff': team_home['madness_rating'] - team_away['madness_rating'],
+        'off_srs_diff': team_home['offensive_srs'] - team_away['offensive_srs'],
+        'def_srs_diff': team_home['defensive_srs'] - team_away['defensive_srs'],
+        'ts_diff': team_home['true_shooting_percentage'] - team_away['true_shooting_percentage'],
+        'off_rating_diff': team_home['offensive_rating_adjusted'] - team_away['offensive_rating_adjusted'],
+        'def_rating_diff': team_home['defensive_rating_adjusted'] - team_away['defensive_rating_adjusted'],
+        'ft_rate_diff': team_home['free_throw_attempt_rate'] - team_away['free_throw_attempt_rate'],
+        '3pa_rate_diff': team_home['3_point_attempt_rate'] - team_away['3_point_attempt_rate']
+    }
+
+
+def complete_teams(snapshot):
+    """Return (home_ok, away_ok): which teams have every stat the model reads on that side."""
+    home_ok = np.ones(snapshot.size, dtype=bool)
+    away_ok = np.ones(snapshot.size, dtype=bool)
+    for _, side, column in FEATURE_SPEC:
+        values = snapshot.numeric[column]
+        if side == "per_game_diff":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = values / snapshot.numeric["games"]
+        present = np.isfinite(values)
+        if side != "away":
+            home_ok &= present
+        if side != "home":
+            away_ok &= present
+    return home_ok, away_ok
+
+
+def register_predict_listener(listener):
+    """Call ``listener(seconds, pairs)`` after every ``MatchupModel.predict``."""
+    _PREDICT_LISTENERS.append(listener)
+    return listener
+
+
+class MatchupModel:
+    """Matchup probabilities from the StandardScaler + LogisticRegression pipeline.
+
+    The scaler and coefficients are pulled out of the pipeline at load time so
+    a prediction is one subtraction, one division and one dot product over a
+    feature matrix gathered straight from the snapshot columns. The sklearn
+    pipeline stays loaded as the fallback and as the parity reference.
+    """
+
+    def __init__(self, pipeline, fast_path=True, parity_tolerance=1e-9):
+        self.pipeline = pipeline
+        self.parity_tolerance = parity_tolerance
+        self.fast_path = False
+        try:
+            self._extract(pipeline)
+            self.fast_path = fast_path
+        except (AttributeError, ValueError, IndexError) as e:
+            logging.error("Matchup model fast path unavailable, using sklearn: %s", e)
+        if self.fast_path:
+            max_error = self.check_parity()
+            if max_error > parity_tolerance:
+                logging.error("Matchup model fast path disagrees with sklearn by %.3g, using sklearn", max_error)
+                self.fast_path = False
+
+    def _extract(self, pipeline):
+        """Read scaler and logistic-regression parameters out of the pipeline."""
+        scaler = pipeline.steps[0][1]
+        classifier = pipeline.steps[-1][1]
+        if len(pipeline.steps) != 2 or not hasattr(scaler, "scale_") or classifier.coef_.shape[0] != 1:
+            raise ValueError("expected a StandardScaler + binary LogisticRegression pipeline")
+
+        spec = {name: (side, column) for name, side, column in FEATURE_SPEC}
+        names = list(getattr(pipeline, "feature_names_in_", [name for name, _, _ in FEATURE_SPEC]))
+        missing = [name for name in names if name not in spec]
+        if missing or len(names) != len(FEATURE_SPEC):
+            raise ValueError(f"model features do not match FEATURE_SPEC: {missing}")
+
+        self.feature_names = names
+        self.feature_spec = [(name, *spec[name]) for name in names]
+        self.mean = scaler.mean_ if scaler.with_mean else np.zeros(len(names))
+        self.scale = scaler.scale_ if scaler.with_std else np.ones(len(names))
+        self.coef = classifier.coef_[0].astype(np.float64)
+        self.intercept = float(classifier.intercept_[0])
+
+    def team_features(self, snapshot):
+        """Return per-team (home, away) feature blocks whose row sum is a matchup's features."""
+        return snapshot.derived("model_features", self._build_team_features)
+
+    def _build_team_features(self, snapshot):
+        """Lay out each team's columns so ``home[i] + away[j]`` equals the features for i vs j."""
+        home = np.zeros((snapshot.size, len(self.feature_spec)))
+        away = np.zeros((snapshot.size, len(self.feature_spec)))
+        for k, (_, side, column) in enumerate(self.feature_spec):
+            values = snapshot.numeric[column]
+            if side == "per_game_diff":
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    values = values / snapshot.numeric["games"]
+            if side in ("home", "diff", "per_game_diff"):
+                home[:, k] = values
+            if side == "away":
+                away[:, k] = values
+            elif side in ("diff", "per_game_diff"):
+                away[:, k] = -values
+        return home, away
+
+    def feature_matrix(self, snapshot, home_indices, away_indices):
+        """Return the model input matrix for home vs away snapshot rows."""
+        home, away = self.team_features(snapshot)
+        return home[home_indices] + away[away_indices]
+
+    def _predict_fast(self, features):
+        """Evaluate the logistic model on an unscaled feature matrix."""
+        logits = ((features - self.mean) / self.scale) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def _predict_sklearn(self, snapshot, home_indices, away_indices):
+        """Reference path: feature dicts, a DataFrame and ``predict_proba``.
+
+        Pairs the fast path would score as NaN are left out and returned as NaN.
+        """
+        home_ok, away_ok = snapshot.derived("model_complete_teams", complete_teams)
+        complete = home_ok[home_indices] & away_ok[away_indices]
+        probs = np.full(len(home_indices), np.nan)
+        inputs = [
+            build_matchup_features(snapshot.row(home), snapshot.row(away))
+            for home, away in zip(home_indices[complete], away_indices[complete])
+        ]
+        if inputs:
+            probs[complete] = self.pipeline.predict_proba(pd.DataFrame(inputs))[:, 1]
+        return probs
+
+    def predict(self, snapshot, home_indices, away_indices):
+        """Return ``predict_proba[:, 1]`` for each home/away pair of snapshot rows.
+
+        Pairs with missing stats come back as NaN on either path.
+        """
+        start = time.perf_counter()
+        home_indices = np.asarray(home_indices, dtype=np.int64)
+        away_indices = np.asarray(away_indices, dtype=np.int64)
+        if self.fast_path:
+            probs = self._predict_fast(self.feature_matrix(snapshot, home_indices, away_indices))
+        else:
+            probs = self._predict_sklearn(snapshot, home_indices, away_indices)
+        elapsed = time.perf_counter() - start
+        for listener in _PREDICT_LISTENERS:
+            listener(elapsed, len(home_indices))
+        return probs
+
+    def check_parity(self, samples=256, seed=0):
+        """Return the largest absolute difference between the fast path and sklearn."""
+        rng = np.random.default_rng(seed)
+        features = self.mean + self.scale * rng.normal(0.0, 2.0, size=(samples, len(self.feature_names)))
+        expected = self.pipeline.predict_proba(pd.DataFrame(features, columns=self.feature_names))[:, 1]
+        return float(np.max(np.abs(self._predict_fast(features) - expected)))
+
+
+MODEL = joblib.load(model_path)
+MATCHUP_MODEL = MatchupModel(MODEL, fast_path=model_config["fast_path"])
+
+
+@register_warmer
+def warm_model_features(snapshot):
+    """Gather model feature blocks while a new snapshot loads."""
+    if MATCHUP_MODEL.fast_path:
+        MATCHUP_MODEL.team_features(snapshot)
+    else:
+        snapshot.derived("model_complete_teams", complete_teams)
+
@@ -0,0 +1,243 @@
+"""Bulk-load team, conference, player or logo rows from CSV/JSON and swap them in atomically.
+
+    python ingest.py team stats/team.csv
+    python ingest.py player stats/players.json --dry-run
+"""
+import argparse
+import base64
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+
+from decimal import Decimal
+
+from config import ingest_config
+from db import db_cursor
+
+# Tables that can be loaded, with the columns that identify a row for change detection.
+INGEST_TABLES = {
+    "team": ("team_id",),
+    "conference": ("conference_id",),
+    "player": ("team_id", "player_name"),
+    "logos": ("team_id",)
+}
+BINARY_COLUMNS = {"logo_binary"}
+STAGING_SUFFIX = "_staging"
+PREVIOUS_SUFFIX = "_previous"
+DATA_VERSION_TABLE = "data_version"
+
+
+class IngestError(Exception):
+    """Raised when input rows cannot be loaded into a table."""
+
+
+def read_rows(path, fmt=None):
+    """Read rows as dicts from CSV, a JSON array (or ``{"rows": [...]}``) or NDJSON.
+
+    Empty CSV fields become NULL. ``fmt`` defaults to the file extension.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            return [{key: (value if value != "" else None) for key, value in row.items()} for row in csv.DictReader(f)]
+        if fmt == "json":
+            data = json.load(f)
+            return data["rows"] if isinstance(data, dict) else data
+        if fmt in ("ndjson", "jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+    raise IngestError(f"Unsupported input format: {fmt}")
+
+
+def table_columns(cursor, table):
+    """Return the column names of ``table`` in table order."""
+    cursor.execute(f"SELECT * FROM `{table}` LIMIT 0")
+    columns = [column[0] for column in cursor.description]
+    cursor.fetchall()
+    return columns
+
+
+def hash_value(value):
+    """Canonical text for one value so equal data hashes equally across reads."""
+    if value is None:
+        return "\x00"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(bytes(value)).hexdigest()
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def row_hashes(cursor, table, columns, key):
+    """Return ``{key: sha256}`` for every row of ``table``, hashed over ``columns``."""
+    positions = [columns.index(column) for column in key]
+    cursor.execute(f"SELECT {', '.join(f'`{column}`' for column in columns)} FROM `{table}`")
+    hashes = {}
+    for row in cursor.fetchall():
+        text = "\x1f".join(hash_value(value) for value in row)
+        hashes[tuple(hash_value(row[i]) for i in positions)] = hashlib.sha256(text.encode()).hexdigest()
+    return hashes
+
+
+def diff_hashes(live, staged):
+    """Compare two ``row_hashes`` results by key."""
+    return {
+        "inserted": sorted(key for key in staged if key not in live),
+        "updated": sorted(key for key in staged if key in live and staged[key] != live[key]),
+        "deleted": sorted(key for key in live if key not in staged),
+        "unchanged": sum(1 for key in staged if live.get(key) == staged[key])
+    }
+
+
+def content_hash(hashes):
+    """Order-independent hash of a whole table from its row hashes."""
+    digest = hashlib.sha256()
+    for key in sorted(hashes):
+        digest.update(hashes[key].encode())
+    return digest.hexdigest()
+
+
+def prepare_rows(rows, columns, key):
+    """Turn input dicts into value tuples for ``columns``; rejects unknown columns and duplicate keys."""
+    if not rows:
+        raise IngestError("No rows to load.")
+    unknown = sorted({name for row in rows for name in row} - set(columns))
+    if unknown:
+        raise IngestError(f"Unknown columns: {', '.join(unknown)}")
+    loaded = [column for column in columns if any(column in row for row in rows)]
+    missing = [column for column in key if column not in loaded]
+    if missing:
+        raise IngestError(f"Missing key columns: {', '.join(missing)}")
+
+    values = []
+    seen = set()
+    for row in rows:
+        identity = tuple(str(row.get(column)) for column in key)
+        if identity in seen:
+            raise IngestError(f"Duplicate key {dict(zip(key, identity))}")
+        seen.add(identity)
+        values.append(tuple(
+            base64.b64decode(row[column]) if column in BINARY_COLUMNS and isinstance(row.get(column), str)
+            else row.get(column)
+            for column in loaded
+        ))
+    return loaded, values
+
+
+def ensure_data_version_table(cursor):
+    """Create the data-version table the snapshot reads its version from."""
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {DATA_VERSION_TABLE} ("
+        "table_name VARCHAR(64) PRIMARY KEY, version BIGINT NOT NULL, content_hash CHAR(64), "
+        "changed_rows INT, updated_at DATETIME)"
+    )
+
+
+def bump_data_version(cursor, table, digest, changed_rows):
+    """Increment ``table``'s version so caches keyed on the data version invalidate."""
+    ensure_data_version_table(cursor)
+    updated_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    cursor.execute(f"SELECT version FROM {DATA_VERSION_TABLE} WHERE table_name = %s", (table,))
+    row = cursor.fetchone()
+    version = (row[0] if row else 0) + 1
+    if row:
+        cursor.execute(
+            f"UPDATE {DATA_VERSION_TABLE} SET version = %s, content_hash = %s, changed_rows = %s, updated_at = %s "
+            "WHERE table_name = %s",
+            (version, digest, changed_rows, updated_at, table)
+        )
+    else:
+        cursor.execute(
+            f"INSERT INTO {DATA_VERSION_TABLE} (table_name, version, content_hash, changed_rows, updated_at) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            (table, version, digest, changed_rows, updated_at)
+        )
+    return version
+
+
+def ingest(table, rows, batch_size=None, dry_run=False, force=False, keep_previous=False):
+    """Load ``rows`` into a staging copy of ``table``, diff it, and swap it in if anything changed.
+
+    The live table is replaced with one ``RENAME TABLE``, so readers see
+    either the old rows or the new ones, never a partial load. The data
+    version is only bumped when at least one row was inserted, updated or
+    deleted (or ``force`` is set). Returns a report dict.
+    """
+    if table not in INGEST_TABLES:
+        raise IngestError(f"Unknown table: {table}")
+    key = INGEST_TABLES[table]
+    batch_size = batch_size or ingest_config["batch_size"]
+    staging = table + STAGING_SUFFIX
+    previous = table + PREVIOUS_SUFFIX
+    start = time.perf_counter()
+
+    with db_cursor() as cursor:
+        columns = table_columns(cursor, table)
+        loaded, values = prepare_rows(rows, columns, key)
+
+        cursor.execute(f"DROP TABLE IF EXISTS `{staging}`")
+        cursor.execute(f"CREATE TABLE `{staging}` LIKE `{table}`")
+        try:
+            insert = (
+                f"INSERT INTO `{staging}` ({', '.join(f'`{column}`' for column in loaded)}) "
+                f"VALUES ({', '.join(['%s'] * len(loaded))})"
+            )
+            for offset in range(0, len(values), batch_size):
+                cursor.executemany(insert, values[offset:offset + batch_size])
+
+            live_hashes = row_hashes(cursor, table, columns, key)
+            staged_hashes = row_hashes(cursor, staging, columns, key)
+            diff = diff_hashes(live_hashes, staged_hashes)
+            changed_rows = len(diff["inserted"]) + len(diff["updated"]) + len(diff["deleted"])
+            swap = (changed_rows or force) and not dry_run
+
+            version = None
+            if swap:
+                cursor.execute(f"DROP TABLE IF EXISTS `{previous}`")
+                cursor.execute(f"RENAME TABLE `{table}` TO `{previous}`, `{staging}` TO `{table}`")
+                if not keep_previous:
+                    cursor.execute(f"DROP TABLE `{previous}`")
+                version = bump_data_version(cursor, table, content_hash(staged_hashes), changed_rows)
+        finally:
+            cursor.execute(f"DROP TABLE IF EXISTS `{staging}`")
+
+    report = {
+        "table": table,
+        "rows": len(values),
+        "inserted": len(diff["inserted"]),
+        "updated": len(diff["updated"]),
+        "deleted": len(diff["deleted"]),
+        "unchanged": diff["unchanged"],
+        "swapped": bool(swap),
+        "version": version,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    logging.info("Ingested %s: %s", table, report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("table", choices=sorted(INGEST_TABLES))
+    parser.add_argument("path", help="CSV, JSON or NDJSON file with one object per row")
+    parser.add_argument("--format", choices=["csv", "json", "ndjson"], help="input format (default: file extension)")
+    parser.add_argument("--batch-size", type=int, help=f"rows per executemany (default {ingest_config['batch_size']})")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without swapping the table in")
+    parser.add_argument("--force", action="store_true", help="swap and bump the version even if nothing changed")
+    parser.add_argument("--keep-previous", action="store_true", help=f"keep the replaced rows as <table>{PREVIOUS_SUFFIX}")
+    args = parser.parse_args()
+
+    try:
+        report = ingest(args.table, read_rows(args.path, args.format), batch_size=args.batch_size,
+                        dry_run=args.dry_run, force=args.force, keep_previous=args.keep_previous)
+    except IngestError as e:
+        parser.exit(1, f"ingest: {e}\n")
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+import uuid
+
+from flask import g, has_request_context, request
+
+from config import logging_config
+
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+_STATE = {"listener": None}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the request context and any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ListenerQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for the listener thread, doing only the minimum on the calling thread.
+
+    The message is merged with its args and any traceback rendered to text so
+    the record no longer references request objects, but JSON formatting is
+    left to the listener.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request id and route while still on the request thread."""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get("request_id")
+            record.route = request.endpoint
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keep DEBUG records for a sampled fraction of requests (or of records outside requests).
+
+    Sampling by request keeps every DEBUG line of a chosen request together,
+    and dropped records are discarded before they are queued or formatted.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def sample(self):
+        return self.rate >= 1.0 or random.random() < self.rate
+
+    def filter(self, record):
+        if record.levelno >= logging.INFO:
+            return True
+        if has_request_context():
+            if "log_debug" not in g:
+                g.log_debug = self.sample()
+            return g.log_debug
+        return self.sample()
+
+
+def start_request_log():
+    """``before_request`` hook: assign a request id (honouring X-Request-ID) and start the clock."""
+    g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    g.log_start = time.perf_counter()
+
+
+def finish_request_log(response):
+    """``after_request`` hook: echo the request id and write one access record."""
+    request_id = g.get("request_id")
+    if request_id:
+        response.headers["X-Request-ID"] = request_id
+    start = g.get("log_start")
+    if start is not None and logging_config["access_log"]:
+        logging.getLogger("access").info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3)
+            }
+        )
+    return response
+
+
+def setup_logging(app, path):
+    """Route all logging through a queue to a rotating JSON file written on a listener thread.
+
+    Replaces any handlers already on the root logger. Safe to call more than once.
+    """
+    if _STATE["listener"] is not None:
+        return _STATE["listener"]
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=logging_config["max_bytes"],
+        backupCount=logging_config["backup_count"],
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = ListenerQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(DebugSampler(logging_config["debug_sample_rate"]))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging_config["level"])
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    _STATE["listener"] = listener
+
+    app.before_request(start_request_log)
+    app.after_request(finish_request_log)
+    return listener
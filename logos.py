@@ -0,0 +1,227 @@
+import base64
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+
+from collections import namedtuple
+
+import numpy as np
+
+from PIL import Image
+from scipy import ndimage
+
+from config import logo_config
+from db import db_cursor
+from snapshot import register_warmer
+
+Logo = namedtuple("Logo", ["data", "etag", "mimetype"])
+LogoAtlas = namedtuple("LogoAtlas", ["data", "etag", "size", "width", "height", "sprites"])
+
+# Same cut-off the browser flood fill used before logos were processed here.
+LOGO_WHITE_THRESHOLD = 245
+
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif")
+]
+
+
+def sniff_mimetype(data):
+    """Return the image type from a blob's magic bytes, defaulting to PNG."""
+    for signature, mimetype in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return mimetype
+    return "image/png"
+
+
+def strip_white_background(rgba, threshold=LOGO_WHITE_THRESHOLD):
+    """Make near-white pixels connected to the image edge transparent.
+
+    Matches the 4-neighbour flood fill the page controllers ran on a canvas:
+    a pixel is "white" when it is not already transparent and every colour
+    channel is at least ``threshold``. White inside the logo is kept.
+    """
+    white = (rgba[..., 3] > 0) & np.all(rgba[..., :3] >= threshold, axis=-1)
+    labels, _ = ndimage.label(white)
+    edge = np.unique(np.concatenate([labels[0], labels[-1], labels[:, 0], labels[:, -1]]))
+    result = rgba.copy()
+    result[np.isin(labels, edge[edge > 0]), 3] = 0
+    return result
+
+
+def transparent_png(data, size=None, threshold=LOGO_WHITE_THRESHOLD):
+    """Return PNG bytes for a logo with its background removed, fit within ``size`` pixels if given."""
+    with Image.open(io.BytesIO(data)) as source:
+        rgba = np.asarray(source.convert("RGBA"))
+    image = Image.fromarray(strip_white_background(rgba, threshold), "RGBA")
+    if size:
+        # Resample with premultiplied alpha so cleared pixels do not bleed white into the edges.
+        image = image.convert("RGBa")
+        image.thumbnail((size, size), Image.LANCZOS)
+        image = image.convert("RGBA")
+    output = io.BytesIO()
+    image.save(output, "PNG", optimize=True)
+    return output.getvalue()
+
+
+def pack_atlas(images, size):
+    """Pack ``{team_id: RGBA image}`` into one sheet of ``size`` pixel cells, row by row.
+
+    Returns the sheet and ``{team_id: [x, y, width, height]}`` for each image.
+    """
+    columns = max(1, int(np.ceil(np.sqrt(len(images)))))
+    rows = max(1, -(-len(images) // columns))
+    sheet = Image.new("RGBA", (columns * size, rows * size), (0, 0, 0, 0))
+    sprites = {}
+    for cell, (team_id, image) in enumerate(sorted(images.items())):
+        x, y = (cell % columns) * size, (cell // columns) * size
+        sheet.paste(image, (x, y))
+        sprites[team_id] = [x, y, image.width, image.height]
+    return sheet, sprites
+
+
+class LogoStore:
+    """Every team logo held in memory with a content hash for strong ETags.
+
+    Loaded once per snapshot, so the logo endpoint and the JSON routes never
+    query the logos table on the request path.
+    """
+
+    def __init__(self, rows):
+        self.logos = {}
+        for team_id, logo_binary in rows:
+            if not logo_binary:
+                continue
+            data = bytes(logo_binary)
+            etag = hashlib.sha256(data).hexdigest()[:20]
+            self.logos[int(team_id)] = Logo(data, etag, sniff_mimetype(data))
+        self._base64 = {}
+        self._transparent = {}
+        self._atlases = {}
+        self._lock = threading.Lock()
+
+    def get(self, team_id):
+        """Return the Logo for a team, or None when it has none."""
+        return self.logos.get(int(team_id))
+
+    def transparent(self, team_id, size=None):
+        """Return the background-free Logo for a team, optionally downscaled, or None.
+
+        Processed images are memoized and, when ``LOGO_CACHE_DIR`` is set, kept
+        on disk under their ETag so restarts and other workers skip the work.
+        """
+        logo = self.get(team_id)
+        if logo is None:
+            return None
+        key = (int(team_id), size)
+        cached = self._transparent.get(key)
+        if cached is not None:
+            return cached
+
+        etag = f"{logo.etag}-t{LOGO_WHITE_THRESHOLD}-{size or 0}"
+        cache_dir = logo_config["cache_dir"]
+        cache_path = os.path.join(cache_dir, f"{etag}.png") if cache_dir else None
+        data = None
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+        if data is None:
+            data = transparent_png(logo.data, size)
+            if cache_path:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, cache_path)
+                except OSError as e:
+                    logging.error("Could not write logo cache %s: %s", cache_path, e)
+
+        processed = Logo(data, etag, "image/png")
+        with self._lock:
+            self._transparent[key] = processed
+        return processed
+
+    def atlas(self, size):
+        """Return a LogoAtlas of every transparent logo at ``size`` pixels, built on first use."""
+        atlas = self._atlases.get(size)
+        if atlas is not None:
+            return atlas
+
+        images = {}
+        for team_id in self.logos:
+            with Image.open(io.BytesIO(self.transparent(team_id, size).data)) as image:
+                images[team_id] = image.convert("RGBA")
+        sheet, sprites = pack_atlas(images, size)
+        output = io.BytesIO()
+        sheet.save(output, "PNG", optimize=True)
+        data = output.getvalue()
+        atlas = LogoAtlas(data, hashlib.sha256(data).hexdigest()[:20], size, sheet.width, sheet.height, sprites)
+        with self._lock:
+            self._atlases[size] = atlas
+        return atlas
+
+    def prebuild(self, sizes=None):
+        """Process every transparent logo at full size and each of ``sizes``, plus their atlases."""
+        sizes = logo_config["sizes"] if sizes is None else sizes
+        for team_id in self.logos:
+            for size in [None, *sizes]:
+                self.transparent(team_id, size)
+        for size in sizes:
+            self.atlas(size)
+
+    def url(self, team_id, transparent=False, size=None):
+        """Return a versioned logo URL that can be cached forever, or None."""
+        logo = self.get(team_id)
+        if logo is None:
+            return None
+        url = f"/api/logo/{int(team_id)}?v={logo.etag}"
+        if transparent:
+            url += "&style=transparent"
+            if size:
+                url += f"&size={int(size)}"
+        return url
+
+    def base64(self, team_id):
+        """Return the logo as base64 text for clients that still want it inline."""
+        team_id = int(team_id)
+        encoded = self._base64.get(team_id)
+        if encoded is None and team_id in self.logos:
+            encoded = base64.b64encode(self.logos[team_id].data).decode("utf-8")
+            with self._lock:
+                self._base64[team_id] = encoded
+        return encoded
+
+
+def load_logo_store(snapshot):
+    """Read the logos table into a LogoStore."""
+    with db_cursor() as cursor:
+        cursor.execute("SELECT team_id, logo_binary FROM logos")
+        return LogoStore(cursor.fetchall())
+
+
+def get_logo_store(snapshot):
+    """Return the logo store for a snapshot, loading it on first use."""
+    return snapshot.derived("logos", load_logo_store)
+
+
+@register_warmer
+def warm_logo_store(snapshot):
+    """Load logos alongside a new snapshot, processing them too when LOGO_PREBUILD is set."""
+    store = get_logo_store(snapshot)
+    if logo_config["prebuild"]:
+        store.prebuild()
+
+
+if __name__ == '__main__':
+    from snapshot import load_snapshot
+
+    start = time.perf_counter()
+    store = get_logo_store(load_snapshot())
+    store.prebuild()
+    print(f"processed {len(store.logos)} logos at sizes {[None, *logo_config['sizes']]} "
+          f"into {logo_config['cache_dir'] or 'memory'} ({time.perf_counter() - start:.2f}s)")
@@ -0,0 +1,231 @@
+import bisect
+import threading
+import time
+
+from flask import g, has_request_context, request
+
+from config import metrics_config
+from inference import register_predict_listener
+from response_cache import register_cache_listener
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_labels(names, values):
+    """Render a Prometheus label set such as ``{endpoint="x",status="200"}``."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value):
+    """Render a sample value the way Prometheus expects."""
+    if isinstance(value, float) and value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, one series per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            yield self.name, format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, description, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_values=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for label_values, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = format_labels(self.labels + ("le",), label_values + (format_value(float(bound)),))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = format_labels(self.labels, label_values)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Gauge:
+    """Value read from a callback at scrape time, e.g. pool connections in use."""
+
+    kind = "gauge"
+
+    def __init__(self, name, description, read):
+        self.name = name
+        self.description = description
+        self.read = read
+
+    def samples(self):
+        yield self.name, "", self.read()
+
+
+class CallbackCounter(Gauge):
+    """Monotonic total kept elsewhere (pool and cache stats) and read at scrape time."""
+
+    kind = "counter"
+
+
+class Registry:
+    """Ordered set of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+REQUEST_LATENCY = REGISTRY.add(Histogram(
+    "http_request_duration_seconds", "Time spent handling a request.", ["endpoint"]
+))
+REQUESTS = REGISTRY.add(Counter(
+    "http_requests_total", "Requests served, by endpoint and status code.", ["endpoint", "status"]
+))
+RESPONSE_BYTES = REGISTRY.add(Counter(
+    "http_response_bytes_total", "Response body bytes sent, after compression.", ["endpoint"]
+))
+DB_QUERIES = REGISTRY.add(Counter(
+    "db_queries_total", "Database statements executed.", ["endpoint"]
+))
+DB_QUERY_SECONDS = REGISTRY.add(Counter(
+    "db_query_seconds_total", "Time spent executing database statements.", ["endpoint"]
+))
+MODEL_LATENCY = REGISTRY.add(Histogram(
+    "model_inference_seconds", "Time spent in MatchupModel.predict.", ["endpoint"]
+))
+MODEL_PAIRS = REGISTRY.add(Counter(
+    "model_pairs_scored_total", "Matchups scored by the model.", ["endpoint"]
+))
+CACHE_LOOKUPS = REGISTRY.add(Counter(
+    "response_cache_lookups_total", "Response cache lookups, by endpoint and result (hit or miss).", ["endpoint", "result"]
+))
+
+
+def current_endpoint():
+    """Return the Flask endpoint handling this thread's request, or "background"."""
+    if has_request_context():
+        return request.endpoint or "unmatched"
+    return "background"
+
+
+def record_db_query(seconds):
+    """Pool query listener: count one statement against the current endpoint."""
+    endpoint = (current_endpoint(),)
+    DB_QUERIES.inc(endpoint)
+    DB_QUERY_SECONDS.inc(endpoint, seconds)
+
+
+def record_prediction(seconds, pairs):
+    """Model predict listener: time one batch against the current endpoint."""
+    endpoint = (current_endpoint(),)
+    MODEL_LATENCY.observe(seconds, endpoint)
+    MODEL_PAIRS.inc(endpoint, pairs)
+
+
+def record_cache_lookup(endpoint, hit):
+    """Response cache listener: count one lookup against its endpoint."""
+    CACHE_LOOKUPS.inc((endpoint, "hit" if hit else "miss"))
+
+
+def start_request_timer():
+    """``before_request`` hook: note when the request started."""
+    g.metrics_start = time.perf_counter()
+
+
+def record_request(response):
+    """``after_request`` hook: record latency, status and bytes for the endpoint."""
+    start = g.pop("metrics_start", None)
+    if start is None or request.endpoint == "get_metrics":
+        return response
+    endpoint = request.endpoint or "unmatched"
+    REQUEST_LATENCY.observe(time.perf_counter() - start, (endpoint,))
+    REQUESTS.inc((endpoint, str(response.status_code)))
+    if not response.direct_passthrough:
+        RESPONSE_BYTES.inc((endpoint,), response.calculate_content_length() or 0)
+    return response
+
+
+def add_stats_metrics(prefix, description, read_stats, counters, gauges):
+    """Expose keys of a ``stats()`` dict read at scrape time: running totals as counters, levels as gauges."""
+    for key in counters:
+        name = f"{prefix}_{key}" if key.endswith("_total") else f"{prefix}_{key}_total"
+        REGISTRY.add(CallbackCounter(name, f"{description} ({key}).", lambda key=key: read_stats()[key]))
+    for key in gauges:
+        REGISTRY.add(Gauge(f"{prefix}_{key}", f"{description} ({key}).", lambda key=key: read_stats()[key]))
+
+
+def install_metrics(app, pool, cache):
+    """Wire request hooks, DB, model and cache listeners, and pool/cache stats into ``app``."""
+    if not metrics_config["enabled"]:
+        return
+
+    app.before_request(start_request_timer)
+    app.after_request(record_request)
+    pool.add_query_listener(record_db_query)
+    register_predict_listener(record_prediction)
+    register_cache_listener(record_cache_lookup)
+    add_stats_metrics(
+        "response_cache", "Response cache", cache.stats,
+        counters=["hits", "misses", "stores", "evictions", "invalidations"],
+        gauges=["entries", "bytes"]
+    )
+    add_stats_metrics(
+        "db_pool", "Connection pool", pool.stats,
+        counters=["checkouts", "waits", "wait_time_total", "timeouts", "discarded"],
+        gauges=["size", "in_use", "idle"]
+    )
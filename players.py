@@ -0,0 +1,272 @@
+import base64
+import bisect
+import json
+import threading
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from db import db_cursor
+from snapshot import register_warmer
+
+# Output columns, in the order /api/get_player_stats has always returned them.
+PLAYER_COLUMNS = [
+    "player_name",
+    "team_name",
+    "conference_abbreviation",
+    "position",
+    "class",
+    "games_played",
+    "games_started",
+    "minutes_per_game",
+    "fg_percentage_per_game",
+    "3p_percentage_per_game",
+    "ft_percentage_per_game",
+    "orb_per_game",
+    "drb_per_game",
+    "trb_per_game",
+    "ast_per_game",
+    "stl_per_game",
+    "blk_per_game",
+    "tov_per_game",
+    "pf_per_game",
+    "pts_per_game"
+]
+TEXT_COLUMNS = ["player_name", "team_name", "conference_abbreviation", "position", "class"]
+# Filters that match any of several values, each backed by a value -> rows index.
+INDEXED_FILTERS = {
+    "team": "team_name",
+    "conference": "conference_abbreviation",
+    "position": "position",
+    "player_class": "class"
+}
+# Rows with equal sort keys are ordered like the old ORDER BY t.team_name, p.player_name.
+TIE_BREAKERS = [("team_name", False), ("player_name", False)]
+
+PlayerFilters = namedtuple(
+    "PlayerFilters",
+    ["team", "conference", "position", "player_class", "min_games", "min_minutes"],
+    defaults=((), (), (), (), None, None)
+)
+
+SORT_CACHE_SIZE = 32
+
+
+def collation_key(value):
+    """Case-insensitive ordering like MySQL's default collation, exact value as tie-breaker."""
+    return value.casefold(), value
+
+
+def parse_sort(spec):
+    """Turn ``"-pts_per_game,player_name"`` into ``[(column, descending), ...]``.
+
+    Raises ValueError for unknown columns.
+    """
+    keys = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        column = part.lstrip("+-")
+        if column not in PLAYER_COLUMNS:
+            raise ValueError(f"Unknown sort column: {column}")
+        if column not in [name for name, _ in keys]:
+            keys.append((column, descending))
+    return keys
+
+
+def encode_cursor(values):
+    """Pack a row's sort-key values into an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Unpack a cursor from ``encode_cursor``; raises ValueError if it is malformed."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor.") from e
+
+
+class PlayerSnapshot:
+    """Every player row in memory, joined to its team and conference, with filter indexes.
+
+    Text columns are also stored as collation ranks so any sort is one
+    ``np.lexsort`` over numbers. Sorted orders are memoized per sort spec, so a
+    filtered, paginated request is a boolean mask over a precomputed order.
+    """
+
+    def __init__(self, snapshot, rows):
+        kept = []
+        for player_name, team_id, *rest in rows:
+            index = snapshot.index_by_id.get(int(team_id)) if team_id is not None else None
+            conference = snapshot.values["conference_abbreviation"][index] if index is not None else None
+            if conference is None:
+                # Same rows the INNER JOINs on team and conference used to drop.
+                continue
+            kept.append((player_name, snapshot.team_names[index], conference, *rest))
+
+        self.size = len(kept)
+        self.values = {}
+        for i, name in enumerate(PLAYER_COLUMNS):
+            column = np.empty(self.size, dtype=object)
+            column[:] = [row[i] for row in kept]
+            self.values[name] = column
+
+        self.numeric = {}
+        self.uniques = {}
+        for name in PLAYER_COLUMNS:
+            column = self.values[name]
+            if name in TEXT_COLUMNS:
+                text = ["" if value is None else str(value) for value in column]
+                uniques = sorted(set(text), key=collation_key)
+                rank = {value: k for k, value in enumerate(uniques)}
+                self.uniques[name] = uniques
+                self.numeric[name] = np.array([rank[value] for value in text], dtype=np.float64)
+            else:
+                self.numeric[name] = np.array(
+                    [np.nan if value is None else float(value) for value in column], dtype=np.float64
+                )
+
+        self.index = {}
+        for column in INDEXED_FILTERS.values():
+            groups = {}
+            for i, value in enumerate(self.values[column]):
+                groups.setdefault(value, []).append(i)
+            self.index[column] = {value: np.array(rows, dtype=np.int64) for value, rows in groups.items()}
+
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+        self.order([])
+
+    def sort_keys(self, sort):
+        """Return the full key list for a sort: the requested columns, then the tie-breakers."""
+        columns = [column for column, _ in sort]
+        return list(sort) + [key for key in TIE_BREAKERS if key[0] not in columns]
+
+    def key_array(self, column, descending, indices=None):
+        """Return ascending sort keys for a column with NULLs last in either direction."""
+        values = self.numeric[column] if indices is None else self.numeric[column][indices]
+        keys = -values if descending else values
+        return np.where(np.isnan(keys), np.inf, keys)
+
+    def order(self, sort):
+        """Return every row index in ``sort`` order, memoized per sort spec."""
+        key = tuple(sort)
+        with self._lock:
+            order = self._orders.get(key)
+            if order is not None:
+                self._orders.move_to_end(key)
+                return order
+
+        keys = [self.key_array(column, descending) for column, descending in reversed(self.sort_keys(sort))]
+        order = np.lexsort(keys) if keys else np.arange(self.size)
+        with self._lock:
+            self._orders[key] = order
+            while len(self._orders) > SORT_CACHE_SIZE:
+                self._orders.popitem(last=False)
+        return order
+
+    def mask(self, filters):
+        """Return a boolean row mask for ``filters``; an empty value list means no filter."""
+        mask = np.ones(self.size, dtype=bool)
+        for field, column in INDEXED_FILTERS.items():
+            wanted = getattr(filters, field)
+            if wanted:
+                selected = np.zeros(self.size, dtype=bool)
+                for value in wanted:
+                    selected[self.index[column].get(value, np.empty(0, dtype=np.int64))] = True
+                mask &= selected
+        if filters.min_games is not None:
+            mask &= self.numeric["games_played"] >= filters.min_games
+        if filters.min_minutes is not None:
+            mask &= self.numeric["minutes_per_game"] >= filters.min_minutes
+        return mask
+
+    def cursor_key(self, column, descending, value):
+        """Map a cursor value back into ``key_array`` space, even if the row no longer exists."""
+        if column in TEXT_COLUMNS:
+            uniques = self.uniques[column]
+            position = bisect.bisect_left(uniques, collation_key(str(value)), key=collation_key)
+            exact = position < len(uniques) and uniques[position] == str(value)
+            rank = position if exact else position - 0.5
+        elif value is None:
+            return np.inf
+        else:
+            rank = float(value)
+        return -rank if descending else rank
+
+    def after(self, indices, keys, cursor):
+        """Return a mask of ``indices`` that sort strictly after the cursor row."""
+        after = np.zeros(len(indices), dtype=bool)
+        equal = np.ones(len(indices), dtype=bool)
+        for (column, descending), value in zip(keys, cursor):
+            row_keys = self.key_array(column, descending, indices)
+            cursor_key = self.cursor_key(column, descending, value)
+            after |= equal & (row_keys > cursor_key)
+            equal &= row_keys == cursor_key
+        return after
+
+    def select(self, filters=None, sort=()):
+        """Return the row indices matching ``filters``, in sort order."""
+        order = self.order(list(sort))
+        if filters is not None:
+            order = order[self.mask(filters)[order]]
+        return order
+
+    def seek(self, order, sort, cursor):
+        """Return the part of ``order`` after ``cursor``; raises ValueError for a bad cursor."""
+        keys = self.sort_keys(sort)
+        values = decode_cursor(cursor)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("Cursor does not match the sort order.")
+        return order[self.after(order, keys, values)]
+
+    def rows(self, indices):
+        """Return raw row lists for ``indices`` in PLAYER_COLUMNS order."""
+        columns = [self.values[name] for name in PLAYER_COLUMNS]
+        return [[column[i] for column in columns] for i in indices]
+
+    def next_cursor(self, index, sort):
+        """Return the cursor that continues after row ``index``."""
+        values = []
+        for column, _ in self.sort_keys(sort):
+            value = self.values[column][index]
+            if column in TEXT_COLUMNS:
+                values.append("" if value is None else str(value))
+            else:
+                values.append(None if value is None else float(value))
+        return encode_cursor(values)
+
+    def page(self, filters=None, sort=(), cursor=None, limit=100):
+        """Return ``(indices, total, next_cursor)`` for one keyset page.
+
+        ``total`` counts every row matching the filters, across all pages.
+        """
+        sort = list(sort)
+        matching = self.select(filters, sort)
+        remaining = matching if cursor is None else self.seek(matching, sort, cursor)
+        indices = remaining[:limit]
+        next_cursor = self.next_cursor(indices[-1], sort) if len(remaining) > limit else None
+        return indices, len(matching), next_cursor
+
+
+def load_player_snapshot(snapshot):
+    """Read the player table and join it to the team snapshot."""
+    stat_columns = ", ".join(f"p.{column}" for column in PLAYER_COLUMNS[3:])
+    with db_cursor() as cursor:
+        cursor.execute(f"SELECT p.player_name, p.team_id, {stat_columns} FROM player p")
+        return PlayerSnapshot(snapshot, cursor.fetchall())
+
+
+def get_player_snapshot(snapshot):
+    """Return the player snapshot for a team snapshot, loading it on first use."""
+    return snapshot.derived("players", load_player_snapshot)
+
+
+@register_warmer
+def warm_player_snapshot(snapshot):
+    """Load players alongside a new team snapshot so no request waits on the player table."""
+    get_player_snapshot(snapshot)
@@ -0,0 +1,264 @@
+import threading
+
+from collections import OrderedDict
+
+import numpy as np
+
+from config import plotly_config
+from snapshot import register_warmer
+
+PLOTLY_STATS = [
+    "3_point_attempt_rate",
+    "3_point_field_goals",
+    "3_point_field_goals_attempted",
+    "3_point_percentage",
+    "ap_rank",
+    "assist_percentage",
+    "assists",
+    "block_percentage",
+    "blocks",
+    "defensive_rating_adjusted",
+    "defensive_srs",
+    "effective_field_goal_percentage",
+    "field_goal_percentage",
+    "field_goals",
+    "field_goals_attempted",
+    "free_throw_attempt_rate",
+    "free_throw_percentage",
+    "free_throws",
+    "free_throws_attempted",
+    "free_throws_per_field_goal",
+    "games",
+    "home_losses",
+    "home_wins",
+    "losses",
+    "losses_conf",
+    "losses_visitor",
+    "madness_rating",
+    "margin_of_victory",
+    "minutes_played",
+    "net_rating_adjusted",
+    "offensive_rating",
+    "offensive_rating_adjusted",
+    "offensive_rebound_percentage",
+    "offensive_rebounds",
+    "offensive_srs",
+    "opp_points_per_game",
+    "opponent_points",
+    "pace",
+    "personal_fouls",
+    "pts_per_game",
+    "simple_rating_system",
+    "steal_percentage",
+    "steals",
+    "strength_of_schedule",
+    "team_points",
+    "team_rebound_percentage",
+    "team_rebounds",
+    "turnover_percentage",
+    "turnovers",
+    "true_shooting_percentage",
+    "win_percentage",
+    "wins",
+    "wins_conf",
+    "wins_visitor"
+]
+PLOTLY_STAT_KEY_MAP = {}
+TOP_68_MODES = {
+    "Top 68 Teams By Madness Rating": "madness_rating",
+    "Top 68 Teams By Net Rating": "net_rating_adjusted"
+}
+ALL_TEAMS = "All Teams"
+DEFAULT_HOW = "Top 68 Teams By Madness Rating"
+
+
+def resolve_plotly_stat_key(stat_key, sample_row):
+    """Resolve a plotly stat key to a valid database column."""
+    if stat_key in sample_row:
+        return stat_key
+    mapped = PLOTLY_STAT_KEY_MAP.get(stat_key)
+    if mapped and mapped in sample_row:
+        return mapped
+    return None
+
+
+def nan_mean(values):
+    """Return the mean of non-NULL values like SQL AVG, or None when there are none."""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if values.size else None
+
+
+def select_plotly_teams(snapshot, how):
+    """Return row indices for a Plotly filter: a top-68 mode, all teams, or a conference."""
+    if how in TOP_68_MODES:
+        return snapshot.order(TOP_68_MODES[how])[:68]
+    if how == ALL_TEAMS:
+        return np.arange(snapshot.size)
+    indices = snapshot.where_conference(how) if how else None
+    return snapshot.order("net_rating_adjusted", indices=indices)[:68]
+
+
+def plotly_filters(snapshot):
+    """Return every ``how`` value the Plotly page can ask for with this snapshot."""
+    conferences = sorted({name for name in snapshot.conferences.values() if name})
+    return list(TOP_68_MODES) + [ALL_TEAMS] + conferences
+
+
+def finite_or_none(value):
+    """Return a float, or None for NaN/inf so the JSON stays valid."""
+    return float(value) if np.isfinite(value) else None
+
+
+class FilterMoments:
+    """Pairwise moments of every Plotly stat over one team set.
+
+    A pair only counts teams where both stats are present, the same points
+    the chart plots, so every count, mean, variance and covariance is a
+    (stat x stat) matrix built with three matrix products. Columns are
+    centred on their own mean first to keep the sums of squares well
+    conditioned for large counting stats like minutes or points.
+    """
+
+    def __init__(self, snapshot, indices, columns):
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.position = {column: k for k, column in enumerate(columns)}
+        if columns:
+            matrix = np.column_stack([snapshot.numeric[column][self.indices] for column in columns])
+        else:
+            matrix = np.empty((len(self.indices), 0))
+
+        self.present = ~np.isnan(matrix)
+        present = self.present.astype(np.float64)
+        filled = np.where(self.present, matrix, 0.0)
+        self.shift = filled.sum(axis=0) / np.maximum(present.sum(axis=0), 1.0)
+        centred = np.where(self.present, matrix - self.shift, 0.0)
+
+        # [i, j] sums over the teams where stats i and j are both present.
+        self.count = present.T @ present
+        self.sum = centred.T @ present
+        self.sum_squares = (centred * centred).T @ present
+        self.sum_products = centred.T @ centred
+
+    def pair(self, x_key, y_key):
+        """Return ``(count, x_mean, y_mean, x_var, y_var, cov)`` for a stat pair (population moments)."""
+        i, j = self.position[x_key], self.position[y_key]
+        count = self.count[i, j]
+        if not count:
+            return 0, None, None, 0.0, 0.0, 0.0
+        x_mean = self.sum[i, j] / count
+        y_mean = self.sum[j, i] / count
+        x_var = max(self.sum_squares[i, j] / count - x_mean * x_mean, 0.0)
+        y_var = max(self.sum_squares[j, i] / count - y_mean * y_mean, 0.0)
+        cov = self.sum_products[i, j] / count - x_mean * y_mean
+        return int(count), x_mean + self.shift[i], y_mean + self.shift[j], x_var, y_var, cov
+
+
+class PlotlyViews:
+    """Chart-ready Plotly views built from the snapshot's in-memory team columns.
+
+    Moments are memoized per team set and whole views per ``(how, x, y)``,
+    so a view is a gather of two columns plus a few scalar formulas.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.columns = [column for column in PLOTLY_STATS if column in snapshot.numeric]
+        self.filters = plotly_filters(snapshot)
+        self.national = {column: nan_mean(snapshot.numeric[column]) for column in self.columns}
+        self._moments = {}
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def moments(self, how):
+        """Return the FilterMoments for a team set, memoized for every valid filter."""
+        moments = self._moments.get(how)
+        if moments is None:
+            moments = FilterMoments(self.snapshot, select_plotly_teams(self.snapshot, how), self.columns)
+            if how in self.filters:
+                with self._lock:
+                    moments = self._moments.setdefault(how, moments)
+        return moments
+
+    def precompute(self):
+        """Build the moments for every valid filter up front."""
+        for how in self.filters:
+            self.moments(how)
+
+    def view(self, how, x_key, y_key):
+        """Return the chart payload for one team set and stat pair, memoized per ``(how, x, y)``."""
+        key = (how, x_key, y_key)
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                return view
+
+        view = self.build_view(how, x_key, y_key)
+        if how in self.filters:
+            with self._lock:
+                self._views[key] = view
+                while len(self._views) > plotly_config["view_cache_size"]:
+                    self._views.popitem(last=False)
+        return view
+
+    def build_view(self, how, x_key, y_key):
+        """Gather the plotted points and derive averages, correlation and the regression line."""
+        snapshot = self.snapshot
+        moments = self.moments(how)
+        i, j = moments.position[x_key], moments.position[y_key]
+        indices = moments.indices[moments.present[:, i] & moments.present[:, j]]
+        x = snapshot.numeric[x_key][indices]
+        y = snapshot.numeric[y_key][indices]
+        count, x_mean, y_mean, x_var, y_var, cov = moments.pair(x_key, y_key)
+
+        correlation = None
+        if x_var > 0 and y_var > 0:
+            correlation = finite_or_none(np.clip(cov / np.sqrt(x_var * y_var), -1.0, 1.0))
+
+        regression = None
+        if count >= 2 and x_var > 0:
+            slope = cov / x_var
+            intercept = y_mean - slope * x_mean
+            x0, x1 = float(x.min()), float(x.max())
+            y0, y1 = slope * x0 + intercept, slope * x1 + intercept
+            if np.isfinite(y0) and np.isfinite(y1):
+                regression = {
+                    "slope": float(slope),
+                    "intercept": float(intercept),
+                    "x0": x0,
+                    "x1": x1,
+                    "y0": float(y0),
+                    "y1": float(y1)
+                }
+
+        return {
+            "how": how,
+            "x_stat": x_key,
+            "y_stat": y_key,
+            "count": count,
+            "team_id": snapshot.team_ids[indices].tolist(),
+            "team_name": snapshot.team_names[indices].tolist(),
+            "x": x.tolist(),
+            "y": y.tolist(),
+            "net_rating_adjusted": [finite_or_none(value) for value in snapshot.numeric["net_rating_adjusted"][indices]],
+            "madness_rating": [finite_or_none(value) for value in snapshot.numeric["madness_rating"][indices]],
+            "averages": {
+                "x": None if x_mean is None else float(x_mean),
+                "y": None if y_mean is None else float(y_mean)
+            },
+            "national_averages": {"x": self.national[x_key], "y": self.national[y_key]},
+            "correlation": correlation,
+            "regression": regression
+        }
+
+
+def get_plotly_views(snapshot):
+    """Return the Plotly views for a snapshot, building them on first use."""
+    return snapshot.derived("plotly_views", PlotlyViews)
+
+
+@register_warmer
+def warm_plotly_views(snapshot):
+    """Precompute every filter's moments while a new snapshot loads when PLOTLY_PRECOMPUTE is on."""
+    if plotly_config["precompute"]:
+        get_plotly_views(snapshot).precompute()
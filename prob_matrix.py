@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import time
+
+import numpy as np
+
+from config import matrix_config
+from inference import MATCHUP_MODEL, model_path
+from snapshot import register_warmer
+
+with open(model_path, 'rb') as model_file:
+    MODEL_FINGERPRINT = hashlib.sha1(model_file.read()).hexdigest()[:16]
+# Bumped when the saved layout or contents change so older files are rebuilt.
+MATRIX_FORMAT = 2
+
+
+class ProbabilityMatrix:
+    """Home-team win probabilities for every ordered pair of teams in a snapshot.
+
+    ``win_probs[i, j]`` is the probability that snapshot row ``i`` beats row
+    ``j`` at home, i.e. ``1 - predict_proba[:, 1]`` for that pairing. The
+    diagonal is scored like any other pair, as the per-request model always
+    did; pairs with missing stats are NaN.
+    """
+
+    def __init__(self, team_ids, win_probs):
+        self.team_ids = team_ids
+        self.win_probs = win_probs
+
+    @classmethod
+    def build(cls, snapshot, model=MATCHUP_MODEL, chunk_rows=matrix_config["chunk_rows"]):
+        """Score every home/away pairing, a block of home teams at a time."""
+        n = snapshot.size
+        win_probs = np.full((n, n), np.nan)
+        block = max(1, chunk_rows // max(n, 1))
+        away = np.arange(n)
+        for start in range(0, n, block):
+            home = np.arange(start, min(start + block, n))
+            probs = model.predict(snapshot, np.repeat(home, n), np.tile(away, len(home)))
+            win_probs[start:start + len(home)] = 1.0 - probs.reshape(len(home), n)
+        return cls(snapshot.team_ids.copy(), win_probs)
+
+    def lookup(self, home_indices, away_indices):
+        """Return home win probabilities for paired snapshot rows."""
+        return self.win_probs[home_indices, away_indices]
+
+    def submatrix(self, indices):
+        """Return the square block of probabilities for a subset of snapshot rows."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return self.win_probs[np.ix_(indices, indices)]
+
+    def save(self, path, data_version):
+        """Write the matrix as compact float32 with the keys needed to trust it later."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                win_probs=self.win_probs.astype(np.float32),
+                team_ids=self.team_ids,
+                data_version=np.array(str(data_version)),
+                model=np.array(MODEL_FINGERPRINT),
+                format=np.array(MATRIX_FORMAT)
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, snapshot):
+        """Return a saved matrix if it matches this snapshot and model, otherwise None."""
+        if not path or not os.path.exists(path):
+            return None
+        with np.load(path) as saved:
+            if ("format" not in saved.files or int(saved["format"]) != MATRIX_FORMAT
+                    or str(saved["data_version"]) != str(snapshot.data_version)
+                    or str(saved["model"]) != MODEL_FINGERPRINT
+                    or not np.array_equal(saved["team_ids"], snapshot.team_ids)):
+                return None
+            return cls(saved["team_ids"], saved["win_probs"].astype(np.float64))
+
+
+def _build_for_snapshot(snapshot):
+    """Load the matrix from disk when it is still valid, else compute (and save) it."""
+    path = matrix_config["path"]
+    try:
+        matrix = ProbabilityMatrix.load(path, snapshot)
+        if matrix is not None:
+            return matrix
+    except Exception as e:
+        logging.error("Could not read probability matrix %s: %s", path, e)
+
+    start = time.perf_counter()
+    matrix = ProbabilityMatrix.build(snapshot)
+    logging.info("Built %dx%d probability matrix in %.3fs", snapshot.size, snapshot.size, time.perf_counter() - start)
+    if path:
+        try:
+            matrix.save(path, snapshot.data_version)
+        except Exception as e:
+            logging.error("Could not write probability matrix %s: %s", path, e)
+    return matrix
+
+
+def get_probability_matrix(snapshot):
+    """Return the probability matrix for a snapshot, building it on first use."""
+    return snapshot.derived("probability_matrix", _build_for_snapshot)
+
+
+@register_warmer
+def warm_probability_matrix(snapshot):
+    """Rebuild the matrix whenever team data is reloaded, off the request path."""
+    get_probability_matrix(snapshot)
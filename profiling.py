@@ -0,0 +1,139 @@
+import cProfile
+import logging
+import os
+import pstats
+import random
+import re
+import time
+
+from flask import g, request
+
+from config import profiling_config
+
+PROFILE_SUFFIX = ".prof"
+# <epoch ms>_<endpoint>_<duration>ms_<status>.prof
+PROFILE_NAME = re.compile(r"^(\d+)_(.+)_(\d+(?:\.\d+)?)ms_(\d{3})\.prof$")
+
+
+def profile_requested():
+    """Return True if this request should be profiled: asked for by header, or sampled."""
+    header = request.headers.get(profiling_config["header"])
+    if header and (not profiling_config["token"] or header == profiling_config["token"]):
+        return True
+    rate = profiling_config["sample_rate"]
+    return rate > 0 and random.random() < rate
+
+
+def start_profile():
+    """``before_request`` hook: start cProfile on this thread for opted-in or sampled requests."""
+    if not profile_requested():
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler already owns this thread (e.g. a debugger).
+        logging.debug("Request profiling skipped: %s", e)
+        return
+    g.profiler = profiler
+    g.profile_start = time.perf_counter()
+
+
+def finish_profile(response):
+    """``after_request`` hook: stop the profiler and write the profile to the profile directory."""
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    duration_ms = (time.perf_counter() - g.pop("profile_start")) * 1000
+    try:
+        path = write_profile(profiler, request.endpoint or "unmatched", duration_ms, response.status_code)
+        response.headers["X-Profile-Id"] = os.path.basename(path)
+    except OSError as e:
+        logging.error("Could not write request profile: %s", e)
+    return response
+
+
+def write_profile(profiler, endpoint, duration_ms, status):
+    """Dump a profile named after its route and timing, then drop the oldest past ``max_files``."""
+    directory = profiling_config["dir"]
+    os.makedirs(directory, exist_ok=True)
+    name = f"{int(time.time() * 1000)}_{endpoint}_{duration_ms:.1f}ms_{status}{PROFILE_SUFFIX}"
+    path = os.path.join(directory, name)
+    profiler.dump_stats(path)
+
+    profiles = list_profiles()
+    for stale in profiles[profiling_config["max_files"]:]:
+        try:
+            os.remove(os.path.join(directory, stale["name"]))
+        except OSError:
+            pass
+    return path
+
+
+def list_profiles(endpoint=None):
+    """Return saved profiles, newest first, optionally only those for one endpoint."""
+    directory = profiling_config["dir"]
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+
+    profiles = []
+    for name in names:
+        match = PROFILE_NAME.match(name)
+        if match is None:
+            continue
+        created_ms, route, duration_ms, status = match.groups()
+        if endpoint and route != endpoint:
+            continue
+        profiles.append({
+            "name": name,
+            "endpoint": route,
+            "duration_ms": float(duration_ms),
+            "status": int(status),
+            "created": int(created_ms) / 1000
+        })
+    profiles.sort(key=lambda profile: profile["created"], reverse=True)
+    return profiles
+
+
+def profile_path(name):
+    """Return the path of a saved profile, or None if ``name`` is not one."""
+    if PROFILE_NAME.match(name) is None:
+        return None
+    path = os.path.join(profiling_config["dir"], name)
+    return path if os.path.exists(path) else None
+
+
+def aggregate_profiles(names, top=25, sort="tottime"):
+    """Merge saved profiles and return their hottest functions.
+
+    ``sort`` is ``tottime`` (time in the function itself) or ``cumtime``
+    (including callees). Times are totals across every merged profile.
+    """
+    paths = [path for path in (profile_path(name) for name in names) if path]
+    if not paths:
+        return []
+
+    stats = pstats.Stats(*paths)
+    functions = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        functions.append({
+            "function": f"{function} ({os.path.basename(filename)}:{line})" if line else function,
+            "file": filename,
+            "calls": ncalls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3)
+        })
+    key = "cumtime_ms" if sort == "cumtime" else "tottime_ms"
+    functions.sort(key=lambda entry: entry[key], reverse=True)
+    return functions[:top]
+
+
+def install_profiling(app):
+    """Wire the profiling hooks into ``app`` when PROFILING is on."""
+    if not profiling_config["enabled"]:
+        return
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
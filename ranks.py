@@ -0,0 +1,78 @@
+import numpy as np
+
+from snapshot import register_warmer
+
+STAT_RANK_COLUMNS = [
+    'games', 'wins', 'win_percentage', 'madness_rating',
+    'strength_of_schedule', 'offensive_srs', 'defensive_srs',
+    'simple_rating_system','offensive_rating_adjusted', 'defensive_rating_adjusted',
+    'net_rating_adjusted', 'pace', 'free_throw_attempt_rate',
+    'free_throws_per_field_goal', '3_point_attempt_rate',
+    'team_rebound_percentage', 'offensive_rebound_percentage',
+    'assist_percentage', 'steal_percentage', 'block_percentage',
+    'turnover_percentage', 'effective_field_goal_percentage',
+    'true_shooting_percentage'
+]
+LOWER_IS_BETTER = {
+    'defensive_rating_adjusted',
+    'turnover_percentage'
+}
+
+
+def competition_ranks(matrix, lower_is_better):
+    """Rank every column of ``matrix`` at once using competition ("1224") ranking.
+
+    ``lower_is_better`` is a boolean mask over columns. NaN (NULL) values tie
+    with each other and always rank last.
+    """
+    keys = np.where(lower_is_better, matrix, -matrix)
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    n = keys.shape[0]
+    if n == 0:
+        return np.zeros(keys.shape, dtype=np.int32)
+
+    order = np.argsort(keys, axis=0, kind="stable")
+    ordered = np.take_along_axis(keys, order, axis=0)
+
+    starts_group = np.ones(keys.shape, dtype=bool)
+    starts_group[1:] = ordered[1:] != ordered[:-1]
+    positions = np.arange(n)[:, None]
+    group_start = np.maximum.accumulate(np.where(starts_group, positions, 0), axis=0)
+
+    ranks = np.empty(keys.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, (group_start + 1).astype(np.int32), axis=0)
+    return ranks
+
+
+class StatRanks:
+    """Competition ranks and percentiles for every team and ranked stat in a snapshot."""
+
+    def __init__(self, snapshot, columns=STAT_RANK_COLUMNS, lower_is_better=LOWER_IS_BETTER):
+        self.columns = [column for column in columns if column in snapshot.numeric]
+        self.size = snapshot.size
+        if self.columns:
+            matrix = np.column_stack([snapshot.numeric[column] for column in self.columns])
+        else:
+            matrix = np.empty((snapshot.size, 0))
+        mask = np.array([column in lower_is_better for column in self.columns], dtype=bool)
+        self.ranks = competition_ranks(matrix, mask)
+        self.percentiles = np.round(100.0 * (self.size - self.ranks) / max(self.size - 1, 1), 1)
+
+    def ranks_for(self, index):
+        """Return ``{stat: rank}`` for one snapshot row."""
+        return dict(zip(self.columns, self.ranks[index].tolist()))
+
+    def percentiles_for(self, index):
+        """Return ``{stat: percentile}`` for one snapshot row (100 is best)."""
+        return dict(zip(self.columns, self.percentiles[index].tolist()))
+
+
+def get_stat_ranks(snapshot):
+    """Return the rank table for a snapshot, building it on first use."""
+    return snapshot.derived("stat_ranks", StatRanks)
+
+
+@register_warmer
+def warm_stat_ranks(snapshot):
+    """Build ranks while a new snapshot loads so no request pays for them."""
+    get_stat_ranks(snapshot)
@@ -0,0 +1,171 @@
+import functools
+import hashlib
+import threading
+
+from collections import OrderedDict, namedtuple
+
+from flask import Response, make_response, request
+
+from columnar import requested_format
+from compression import SUPPORTED_ENCODINGS, compress, negotiate_encoding
+from config import compression_config, response_cache_config
+from snapshot import get_snapshot
+
+# ``encoded`` maps a content coding to the body already compressed with it; ``vary``
+# keeps the request headers the view said its body depends on.
+CachedResponse = namedtuple("CachedResponse", ["body", "mimetype", "etag", "last_modified", "encoded", "vary"])
+
+_LOOKUP_LISTENERS = []
+
+
+def entry_size(entry):
+    """Return the bytes an entry holds, counting its precompressed copies."""
+    return len(entry.body) + sum(len(body) for body in entry.encoded.values())
+
+
+class ResponseCache:
+    """LRU of serialized responses bounded by total body size (compressed copies included).
+
+    Entries are keyed by endpoint, normalized query args and the data version
+    they were built from. Seeing a new data version drops every entry, so a
+    refresh never serves stale bodies and old versions do not hold memory.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    def _check_version(self, version):
+        """Drop everything when the data version moves. Call with the lock held."""
+        if version != self._version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, key, version):
+        """Return the cached entry for ``key`` at ``version``, or None."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key, version, entry):
+        """Store an entry, evicting least recently used ones to stay under ``max_bytes``."""
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= entry_size(previous)
+            self._entries[key] = entry
+            self._bytes += size
+            self._stats["stores"] += 1
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= entry_size(evicted)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return entry counts, bytes held and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats
+            }
+
+
+RESPONSE_CACHE = ResponseCache(response_cache_config["max_bytes"])
+
+
+def register_cache_listener(listener):
+    """Call ``listener(endpoint, hit)`` after every lookup made by ``cached_response``."""
+    _LOOKUP_LISTENERS.append(listener)
+    return listener
+
+
+def request_cache_key():
+    """Return the endpoint, its query args and the negotiated response format.
+
+    Args are sorted by name but keep repeated values in order. The format
+    covers routes that pick a binary format from the Accept header.
+    """
+    args = tuple((name, tuple(request.args.getlist(name))) for name in sorted(request.args))
+    return request.endpoint, args, requested_format()
+
+
+def build_entry(body, mimetype, last_modified, vary=()):
+    """Hash a response body and compress it once for every supported coding."""
+    encoded = {}
+    if compression_config["enabled"] and len(body) >= compression_config["min_size"]:
+        encoded = {encoding: compress(body, encoding) for encoding in SUPPORTED_ENCODINGS}
+    return CachedResponse(body, mimetype, hashlib.sha256(body).hexdigest()[:20], last_modified, encoded, tuple(vary))
+
+
+def conditional_response(entry):
+    """Build a response for a cached entry, answering conditional requests with 304.
+
+    The body is the precompressed copy the client accepts, if any; each coding
+    gets its own strong ETag.
+    """
+    encoding = negotiate_encoding(len(entry.body))
+    if encoding in entry.encoded:
+        response = Response(entry.encoded[encoding], mimetype=entry.mimetype)
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{entry.etag}-{encoding}")
+    else:
+        response = Response(entry.body, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+    if entry.encoded:
+        response.vary.add('Accept-Encoding')
+    for header in entry.vary:
+        response.vary.add(header)
+    response.last_modified = entry.last_modified
+    response.headers['Cache-Control'] = f"public, max-age={response_cache_config['max_age']}, must-revalidate"
+    return response.make_conditional(request)
+
+
+def cached_response(view):
+    """Serve a read-only JSON route from RESPONSE_CACHE, keyed to the current data version.
+
+    Only successful responses are stored. Hits skip the view entirely, and a
+    matching If-None-Match or If-Modified-Since gets an empty 304.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not response_cache_config["enabled"]:
+            return view(*args, **kwargs)
+
+        snapshot = get_snapshot()
+        key = request_cache_key()
+        entry = RESPONSE_CACHE.get(key, snapshot.data_version)
+        for listener in _LOOKUP_LISTENERS:
+            listener(request.endpoint, entry is not None)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            entry = build_entry(response.get_data(), response.mimetype, int(snapshot.loaded_at), response.vary)
+            RESPONSE_CACHE.put(key, snapshot.data_version, entry)
+        return conditional_response(entry)
+    return wrapper
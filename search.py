@@ -0,0 +1,247 @@
+import json
+import logging
+import re
+import threading
+import unicodedata
+
+from collections import OrderedDict
+
+from config import search_config
+from snapshot import register_warmer
+
+# Common names and abbreviations, keyed by the team's name in the team table.
+# Entries for teams that are not in the table are ignored.
+TEAM_ALIASES = {
+    "Alabama-Birmingham": ["UAB"],
+    "Brigham Young": ["BYU"],
+    "California": ["Cal"],
+    "Central Florida": ["UCF"],
+    "Connecticut": ["UConn"],
+    "Florida International": ["FIU"],
+    "Louisiana State": ["LSU"],
+    "Massachusetts": ["UMass"],
+    "Miami (FL)": ["Miami", "The U"],
+    "Mississippi": ["Ole Miss"],
+    "Nevada-Las Vegas": ["UNLV"],
+    "North Carolina": ["UNC"],
+    "North Carolina State": ["NC State"],
+    "Pittsburgh": ["Pitt"],
+    "Southern California": ["USC"],
+    "Southern Methodist": ["SMU"],
+    "Texas Christian": ["TCU"],
+    "Texas-El Paso": ["UTEP"],
+    "Texas-San Antonio": ["UTSA"],
+    "UCLA": ["California-Los Angeles"],
+    "Virginia Commonwealth": ["VCU"],
+    "Virginia Military Institute": ["VMI"]
+}
+# Interchangeable words: each is indexed under the others too, so "St." finds "State" and "Saint".
+WORD_VARIANTS = {
+    "st": ["state", "saint"],
+    "state": ["st"],
+    "saint": ["st"],
+    "univ": ["university"],
+    "university": ["univ"],
+    "mt": ["mount"],
+    "mount": ["mt"],
+    "ft": ["fort"],
+    "fort": ["ft"]
+}
+SEPARATORS = re.compile(r"[\s\-_/,()]+")
+# Dropped rather than split on, so "St." is "st", "John's" is "johns" and "A&M" is "am".
+DROPPED = re.compile(r"[.'\u2019&]")
+
+# Match kinds, best first.
+PREFIX = 0
+ALIAS = 1
+WORD = 2
+MATCH_NAMES = {PREFIX: "prefix", ALIAS: "alias", WORD: "word"}
+
+
+def normalize(text):
+    """Casefold, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(SEPARATORS.sub(" ", DROPPED.sub("", text.casefold())).split())
+
+
+def word_variants(words):
+    """Return ``words`` and every spelling with interchangeable words swapped."""
+    spellings = [[]]
+    for word in words:
+        spellings = [spelling + [option] for spelling in spellings for option in [word] + WORD_VARIANTS.get(word, [])]
+    return [" ".join(spelling) for spelling in spellings]
+
+
+def load_aliases(path):
+    """Read extra ``{team_name: [alias, ...]}`` entries from a JSON file."""
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.error("Could not read team aliases from %s: %s", path, e)
+        return {}
+
+
+class TrieNode:
+    __slots__ = ("children", "teams")
+
+    def __init__(self):
+        self.children = {}
+        # team index -> best match kind of any key passing through this node.
+        self.teams = {}
+
+
+class TeamSearch:
+    """Prefix trie over team names, word starts, aliases and abbreviations.
+
+    Every node keeps the teams reachable below it, so a prefix lookup is one
+    walk down the trie. When a prefix finds too few teams, a bounded
+    edit-distance walk over the same trie (adjacent swaps count as one edit)
+    adds typo-tolerant matches. Results are memoized per normalized query.
+    """
+
+    def __init__(self, snapshot, aliases=None):
+        self.team_ids = [int(team_id) for team_id in snapshot.team_ids]
+        self.team_names = list(snapshot.team_names)
+        self.conferences = list(snapshot.values["conference_abbreviation"])
+        self.alphabetical = sorted(
+            (i for i, name in enumerate(self.team_names) if name is not None),
+            key=lambda i: self.team_names[i].casefold()
+        )
+        self.root = TrieNode()
+        self.nodes = 1
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+        if aliases is None:
+            aliases = {**TEAM_ALIASES, **load_aliases(search_config["aliases_path"])}
+        for index, name in enumerate(self.team_names):
+            if name is None:
+                continue
+            words = normalize(name).split()
+            for start in range(len(words)):
+                for spelling in word_variants(words[start:]):
+                    self.add(spelling, index, PREFIX if start == 0 else WORD)
+            if len(words) > 1:
+                self.add("".join(word[0] for word in words), index, ALIAS)
+            for alias in aliases.get(name, []):
+                for spelling in word_variants(normalize(alias).split()):
+                    self.add(spelling, index, ALIAS)
+                    self.add(spelling.replace(" ", ""), index, ALIAS)
+
+    def add(self, key, index, kind):
+        """Index ``key`` for one team under every prefix."""
+        node = self.root
+        for char in key:
+            node.teams[index] = min(kind, node.teams.get(index, kind))
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+                self.nodes += 1
+            node = child
+        node.teams[index] = min(kind, node.teams.get(index, kind))
+
+    def find_prefix(self, key):
+        """Return ``{team index: kind}`` for keys starting with ``key``."""
+        node = self.root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return {}
+        return node.teams
+
+    def find_fuzzy(self, key, max_distance):
+        """Return ``{team index: distance}`` for keys with a prefix within ``max_distance`` edits of ``key``.
+
+        The first letter must match.
+        """
+        found = {}
+        first_row = list(range(len(key) + 1))
+
+        def visit(node, char, previous, before, previous_char):
+            row = [previous[0] + 1]
+            for i in range(1, len(key) + 1):
+                cost = 0 if key[i - 1] == char else 1
+                distance = min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + cost)
+                if i > 1 and before is not None and key[i - 1] == previous_char and key[i - 2] == char:
+                    # Swapped neighbours ("tema" for "team") count as one edit.
+                    distance = min(distance, before[i - 2] + 1)
+                row.append(distance)
+            if row[-1] <= max_distance:
+                for index in node.teams:
+                    if row[-1] < found.get(index, max_distance + 1):
+                        found[index] = row[-1]
+            if min(row) <= max_distance:
+                for next_char, child in node.children.items():
+                    visit(child, next_char, row, previous, char)
+
+        # Typos in the first letter are rare, and anchoring it keeps the walk small.
+        child = self.root.children.get(key[0]) if key else None
+        if child is not None:
+            visit(child, key[0], first_row, None, None)
+        return found
+
+    def max_distance(self, key):
+        """Allowed typos for a query: none for very short queries, more for longer ones."""
+        if len(key) < search_config["fuzzy_min_length"]:
+            return 0
+        return 1 if len(key) < 8 else 2
+
+    def search(self, query, limit=None):
+        """Return up to ``limit`` ``(team index, match name)`` pairs, best first."""
+        limit = limit or search_config["limit"]
+        key = normalize(query)
+        cache_key = (key, limit)
+        with self._lock:
+            results = self._results.get(cache_key)
+            if results is not None:
+                self._results.move_to_end(cache_key)
+                return results
+
+        results = self.rank(key, limit)
+        with self._lock:
+            self._results[cache_key] = results
+            while len(self._results) > search_config["cache_size"]:
+                self._results.popitem(last=False)
+        return results
+
+    def rank(self, key, limit):
+        """Score every candidate as (typos, match kind, name length, name) and keep the best."""
+        if not key:
+            return [(i, MATCH_NAMES[PREFIX]) for i in self.alphabetical[:limit]]
+
+        scores = {index: (0, kind) for index, kind in self.find_prefix(key).items()}
+        words = key.split()
+        if len(words) > 1:
+            # "carolina north" or "state michigan": every word must start some word of the name.
+            matches = [self.find_prefix(word) for word in words]
+            for index in set(matches[0]).intersection(*matches[1:]):
+                scores.setdefault(index, (0, WORD))
+
+        max_distance = self.max_distance(key)
+        if len(scores) < limit and max_distance:
+            for index, distance in self.find_fuzzy(key, max_distance).items():
+                if index not in scores:
+                    scores[index] = (distance, WORD)
+
+        ranked = sorted(
+            scores,
+            key=lambda i: (*scores[i], len(self.team_names[i]), self.team_names[i].casefold())
+        )
+        return [
+            (i, MATCH_NAMES[scores[i][1]] if scores[i][0] == 0 else "fuzzy")
+            for i in ranked[:limit]
+        ]
+
+
+def get_team_search(snapshot):
+    """Return the team search index for a snapshot, building it on first use."""
+    return snapshot.derived("team_search", TeamSearch)
+
+
+@register_warmer
+def warm_team_search(snapshot):
+    """Build the search index while a new snapshot loads so the first keystroke does not wait."""
+    get_team_search(snapshot)
@@ -0,0 +1,79 @@
+import logging
+
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+from config import json_config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+def json_default(value):
+    """Encode the MySQL types orjson leaves to us the way Flask's encoder always has."""
+    if isinstance(value, Decimal):
+        return str(value)
+    return DefaultJSONProvider.default(value)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson when it is installed.
+
+    Output matches the default provider: sorted keys, compact separators,
+    Decimal as a string and dates as HTTP dates. Pretty-printed (debug)
+    responses and any call with custom ``json.dumps`` arguments still go
+    through the standard library, as does any value orjson rejects (such as
+    an integer wider than 64 bits) so it encodes exactly as it used to.
+    """
+
+    def __init__(self, app, use_orjson=True):
+        super().__init__(app)
+        self.use_orjson = use_orjson and orjson is not None
+
+    def _pretty(self):
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def dumps(self, obj, **kwargs):
+        if not self.use_orjson or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS).decode("utf-8")
+        except TypeError as e:
+            logging.debug("orjson could not encode a value, using the standard library: %s", e)
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if not self.use_orjson or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if not self.use_orjson or self._pretty():
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS) + b"\n"
+        except TypeError as e:
+            logging.debug("orjson could not encode a response, using the standard library: %s", e)
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install_json_provider(app):
+    """Use the serializer picked by ``JSON_ENCODER`` (``orjson`` or ``stdlib``) for ``app``."""
+    app.json = FastJSONProvider(app, use_orjson=json_config["encoder"] == "orjson")
+    if json_config["encoder"] == "orjson" and orjson is None:
+        logging.warning("JSON_ENCODER=orjson but orjson is not installed; using the standard library")
+    logging.info("JSON encoder: %s", "orjson" if app.json.use_orjson else "stdlib")
+    return app.json
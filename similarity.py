@@ -0,0 +1,189 @@
+import logging
+import threading
+
+import numpy as np
+
+from config import similarity_config
+from snapshot import register_warmer
+
+# Style and strength columns /api/get_ratings exposes. Net rating is left out
+# because it is offensive minus defensive rating and would count twice.
+SIMILARITY_COLUMNS = [
+    "pace",
+    "offensive_rating_adjusted",
+    "defensive_rating_adjusted",
+    "strength_of_schedule",
+    "offensive_srs",
+    "defensive_srs",
+    "simple_rating_system",
+    "free_throw_attempt_rate",
+    "free_throws_per_field_goal",
+    "3_point_attempt_rate",
+    "team_rebound_percentage",
+    "offensive_rebound_percentage",
+    "assist_percentage",
+    "steal_percentage",
+    "block_percentage",
+    "turnover_percentage",
+    "effective_field_goal_percentage",
+    "true_shooting_percentage"
+]
+
+_STATE = {"latest": None}
+_LOCK = threading.Lock()
+
+
+def standardize(matrix):
+    """Return per-column (mean, scale) over non-NULL values; constant columns get scale 1."""
+    present = ~np.isnan(matrix)
+    count = np.maximum(present.sum(axis=0), 1)
+    mean = np.where(present, matrix, 0.0).sum(axis=0) / count
+    variance = np.where(present, (matrix - mean) ** 2, 0.0).sum(axis=0) / count
+    scale = np.sqrt(variance)
+    return mean, np.where(scale > 0, scale, 1.0)
+
+
+def z_scores(matrix, mean, scale):
+    """Standardize ``matrix``; NULLs become 0, i.e. the average team."""
+    return np.nan_to_num((matrix - mean) / scale, nan=0.0)
+
+
+def squared_distances(z, rows=None):
+    """Squared Euclidean distances from ``rows`` (default all) to every team, from one matrix product.
+
+    Stored as float32 to halve the n x n matrix; the ranking does not need more.
+    """
+    if rows is None:
+        rows = np.arange(len(z))
+    norms = (z * z).sum(axis=1)
+    distances = norms[rows][:, None] + norms[None, :] - 2.0 * (z[rows] @ z.T)
+    return np.maximum(distances, 0.0).astype(np.float32)
+
+
+class SimilarTeams:
+    """Nearest neighbours of every team in standardized rating space.
+
+    The full pairwise distance matrix comes from one matrix product and each
+    team's ``depth`` nearest neighbours are kept in distance order, so a query
+    is a row lookup plus a per-stat breakdown for the ``k`` teams returned.
+    Standardization is kept from the previous build until a column's mean or
+    spread drifts by more than ``rescale_tolerance`` of its spread; until then
+    a refresh only recomputes the rows and columns of teams whose stats
+    changed and re-ranks the teams those changes can affect.
+    """
+
+    def __init__(self, snapshot, columns=SIMILARITY_COLUMNS, depth=None, previous=None):
+        self.columns = [column for column in columns if column in snapshot.numeric]
+        self.team_ids = snapshot.team_ids.copy()
+        self.size = snapshot.size
+        self.depth = max(0, min(similarity_config["depth"] if depth is None else depth, self.size - 1))
+        if self.columns:
+            self.values = np.column_stack([snapshot.numeric[column] for column in self.columns])
+        else:
+            self.values = np.empty((self.size, 0))
+        self.rebuild = "full"
+
+        mean, scale = standardize(self.values)
+        if previous is not None and self.reusable(previous, mean, scale):
+            self.mean, self.scale = previous.mean, previous.scale
+            self.z = z_scores(self.values, self.mean, self.scale)
+            self.update_from(previous)
+        else:
+            self.mean, self.scale = mean, scale
+            self.z = z_scores(self.values, self.mean, self.scale)
+            self.distances = squared_distances(self.z)
+            np.fill_diagonal(self.distances, np.inf)
+            self.neighbours = self.nearest(np.arange(self.size))
+
+    def reusable(self, previous, mean, scale):
+        """Return True if ``previous`` covers the same teams and columns with close enough scaling."""
+        if previous.columns != self.columns or previous.depth != self.depth:
+            return False
+        if not np.array_equal(previous.team_ids, self.team_ids):
+            return False
+        tolerance = similarity_config["rescale_tolerance"] * previous.scale
+        return bool(np.all(np.abs(mean - previous.mean) <= tolerance) and np.all(np.abs(scale - previous.scale) <= tolerance))
+
+    def update_from(self, previous):
+        """Reuse ``previous`` distances, recomputing only what the changed teams touch."""
+        changed = np.flatnonzero(~np.all(
+            (previous.values == self.values) | (np.isnan(previous.values) & np.isnan(self.values)), axis=1
+        ))
+        self.distances = previous.distances.copy() if len(changed) else previous.distances
+        self.neighbours = previous.neighbours.copy() if len(changed) else previous.neighbours
+        if not len(changed):
+            self.rebuild = "unchanged"
+            return
+
+        rows = squared_distances(self.z, changed)
+        self.distances[changed, :] = rows
+        self.distances[:, changed] = rows.T
+        self.distances[changed, changed] = np.inf
+
+        # A team's list can only move if it is a changed team, already lists
+        # a changed team, or a changed team is now closer than its last neighbour.
+        affected = np.zeros(self.size, dtype=bool)
+        affected[changed] = True
+        if self.depth:
+            affected |= np.isin(previous.neighbours, changed).any(axis=1)
+            furthest = previous.distances[np.arange(self.size), previous.neighbours[:, -1]]
+            affected |= (self.distances[:, changed] <= furthest[:, None]).any(axis=1)
+        affected = np.flatnonzero(affected)
+        self.neighbours[affected] = self.nearest(affected)
+        self.rebuild = f"partial:{len(changed)}/{len(affected)}"
+
+    def nearest(self, rows):
+        """Return the ``depth`` nearest teams of each row, closest first (ties by load order)."""
+        if not self.depth:
+            return np.empty((len(rows), 0), dtype=np.int64)
+        distances = self.distances[rows]
+        candidates = np.argpartition(distances, self.depth - 1, axis=1)[:, :self.depth]
+        # argpartition leaves the kept candidates unordered: sort them by (distance, index).
+        candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+        order = np.lexsort((candidates, candidate_distances), axis=1)
+        return np.take_along_axis(candidates, order, axis=1)
+
+    def neighbours_of(self, index, k):
+        """Return up to ``k`` ``(neighbour index, distance)`` pairs for one team."""
+        neighbours = self.neighbours[index][:k]
+        return [(int(j), float(np.sqrt(self.distances[index, j]))) for j in neighbours]
+
+    def contributions(self, index, other):
+        """Break the squared distance between two teams down by stat, largest share first."""
+        differences = self.z[other] - self.z[index]
+        squared = differences * differences
+        total = squared.sum()
+        breakdown = []
+        for k in np.argsort(-squared, kind="stable"):
+            value = self.values[index, k]
+            other_value = self.values[other, k]
+            breakdown.append({
+                "stat": self.columns[k],
+                "team_value": None if np.isnan(value) else float(value),
+                "other_value": None if np.isnan(other_value) else float(other_value),
+                "z_difference": round(float(differences[k]), 4),
+                "share": round(float(squared[k] / total), 4) if total > 0 else 0.0
+            })
+        return breakdown
+
+
+def build_similar_teams(snapshot):
+    """Build the neighbour index, reusing the last one where the data allows."""
+    with _LOCK:
+        previous = _STATE["latest"]
+    similar = SimilarTeams(snapshot, previous=previous)
+    logging.debug("Similar-teams index rebuilt (%s)", similar.rebuild)
+    with _LOCK:
+        _STATE["latest"] = similar
+    return similar
+
+
+def get_similar_teams(snapshot):
+    """Return the similar-teams index for a snapshot, building it on first use."""
+    return snapshot.derived("similar_teams", build_similar_teams)
+
+
+@register_warmer
+def warm_similar_teams(snapshot):
+    """Build the neighbour index while a new snapshot loads so no query waits for it."""
+    get_similar_teams(snapshot)
@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+
+from decimal import Decimal
+
+import numpy as np
+
+from config import snapshot_config
+from db import db_cursor
+
+
+class TeamSnapshot:
+    """Immutable, column-oriented copy of the team table joined with conference names.
+
+    ``values`` holds the raw database values per column (so JSON output matches
+    what the old per-request queries returned) and ``numeric`` holds float64
+    copies of every numeric column, with NULL stored as NaN, for vectorized work.
+    Rows keep the order the table was loaded in (team_id ascending).
+    """
+
+    def __init__(self, team_columns, rows, conferences, data_version):
+        self.team_columns = list(team_columns)
+        self.size = len(rows)
+        self.conferences = dict(conferences)
+        self.data_version = data_version
+        self.loaded_at = time.time()
+
+        self.values = {}
+        for i, name in enumerate(self.team_columns):
+            column = np.empty(self.size, dtype=object)
+            column[:] = [row[i] for row in rows]
+            self.values[name] = column
+        abbreviations = np.empty(self.size, dtype=object)
+        abbreviations[:] = [self.conferences.get(cid) for cid in self.values["conference_id"]]
+        self.values["conference_abbreviation"] = abbreviations
+
+        self.numeric = {}
+        for name in self.team_columns:
+            column = self.values[name]
+            if all(value is None or isinstance(value, (int, float, Decimal)) for value in column):
+                self.numeric[name] = np.array(
+                    [np.nan if value is None else float(value) for value in column],
+                    dtype=np.float64
+                )
+
+        self.team_ids = self.numeric["team_id"].astype(np.int64)
+        self.team_names = self.values["team_name"]
+        self.index_by_id = {int(team_id): i for i, team_id in enumerate(self.team_ids)}
+        self.index_by_name = {name: i for i, name in enumerate(self.team_names)}
+
+        self._derived = {}
+        self._derived_lock = threading.RLock()
+
+    def has_column(self, name):
+        """Return True if ``name`` is a column of the team table."""
+        return name in self.values
+
+    def row(self, index):
+        """Return one team as a dict shaped like ``SELECT * FROM team``."""
+        return {name: self.values[name][index] for name in self.team_columns}
+
+    def rows(self, indices, columns):
+        """Return raw value tuples for ``indices`` in the order given."""
+        selected = [self.values[name] for name in columns]
+        return [tuple(column[i] for column in selected) for i in indices]
+
+    def order(self, column, descending=True, indices=None):
+        """Return row indices sorted by a numeric column, NULLs last, ties in load order."""
+        if indices is None:
+            indices = np.arange(self.size)
+        indices = np.asarray(indices, dtype=np.int64)
+        values = self.numeric[column][indices]
+        keys = -values if descending else values
+        keys = np.where(np.isnan(keys), np.inf, keys)
+        return indices[np.argsort(keys, kind="stable")]
+
+    def where_conference(self, abbreviation):
+        """Return row indices for teams in a conference."""
+        return np.flatnonzero(self.values["conference_abbreviation"] == abbreviation)
+
+    def derived(self, key, builder):
+        """Memoize ``builder(self)`` for the lifetime of this snapshot."""
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self)
+            return self._derived[key]
+
+
+_STATE = {"snapshot": None, "checked_at": 0.0, "refreshing": False}
+_LOCK = threading.Lock()
+_LOAD_LOCK = threading.Lock()
+_WARMERS = []
+# Tables whose contents the API serves; any change to them must move the data version.
+DATA_TABLES = ("team", "conference", "logos", "player")
+
+
+def register_warmer(warmer):
+    """Run ``warmer(snapshot)`` on every new snapshot before it is published."""
+    _WARMERS.append(warmer)
+    return warmer
+
+
+def checksum_tables(cursor, tables):
+    """Return ``{table: checksum}``, trying ``QUICK`` first.
+
+    ``QUICK`` only reads a live checksum (MyISAM, or tables created with
+    ``CHECKSUM=1``); tables it answers NULL for are checksummed in full.
+    """
+    cursor.execute(f"CHECKSUM TABLE {', '.join(tables)} QUICK")
+    checksums = dict(zip(tables, (row[1] for row in cursor.fetchall())))
+    missing = [table for table in tables if checksums.get(table) is None]
+    if missing:
+        cursor.execute(f"CHECKSUM TABLE {', '.join(missing)}")
+        checksums.update(zip(missing, (row[1] for row in cursor.fetchall())))
+    return checksums
+
+
+def fetch_data_version(cursor):
+    """Return a token that changes whenever any table the API reads from changes.
+
+    A table with a row in ``data_version`` (written by ``ingest.py``) is
+    represented by its counter alone, so it is never scanned. Only tables
+    without a counter are checksummed.
+    """
+    try:
+        cursor.execute("SELECT table_name, version FROM data_version")
+        versions = {table: version for table, version in cursor.fetchall()}
+    except Exception as e:
+        logging.debug("No data_version table, checksumming every table: %s", e)
+        versions = {}
+    untracked = [table for table in DATA_TABLES if table not in versions]
+    checksums = checksum_tables(cursor, untracked) if untracked else {}
+    return ",".join(
+        f"{table}=v{versions[table]}" if table in versions else f"{table}=c{checksums[table]}"
+        for table in DATA_TABLES
+    )
+
+
+def load_snapshot():
+    """Read team and conference once and build a new snapshot."""
+    with db_cursor() as cursor:
+        data_version = fetch_data_version(cursor)
+        cursor.execute("SELECT * FROM team ORDER BY team_id")
+        team_columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+        cursor.execute("SELECT conference_id, conference_abbreviation FROM conference")
+        conferences = {row[0]: row[1] for row in cursor.fetchall()}
+
+    snapshot = TeamSnapshot(team_columns, rows, conferences, data_version)
+    for warmer in _WARMERS:
+        try:
+            warmer(snapshot)
+        except Exception as e:
+            logging.error("Snapshot warmer %s failed: %s", getattr(warmer, "__name__", warmer), e)
+    return snapshot
+
+
+def _publish(snapshot):
+    """Swap in a freshly loaded snapshot."""
+    with _LOCK:
+        _STATE["snapshot"] = snapshot
+        _STATE["checked_at"] = time.monotonic()
+
+
+def _refresh_in_background(force_reload):
+    """Reload the snapshot if it expired or the data version moved."""
+    try:
+        current = _STATE["snapshot"]
+        if not force_reload:
+            with db_cursor() as cursor:
+                data_version = fetch_data_version(cursor)
+            if current is not None and data_version == current.data_version:
+                with _LOCK:
+                    _STATE["checked_at"] = time.monotonic()
+                return
+        _publish(load_snapshot())
+    except Exception as e:
+        logging.error("Team snapshot refresh failed: %s", e)
+        with _LOCK:
+            _STATE["checked_at"] = time.monotonic()
+    finally:
+        with _LOCK:
+            _STATE["refreshing"] = False
+
+
+def get_snapshot():
+    """Return the current team snapshot, loading it on first use.
+
+    Expired snapshots keep serving while a background thread reloads them, so
+    only the very first request in a process waits on the database.
+    """
+    snapshot = _STATE["snapshot"]
+    if snapshot is None:
+        with _LOAD_LOCK:
+            if _STATE["snapshot"] is None:
+                _publish(load_snapshot())
+        return _STATE["snapshot"]
+
+    now = time.monotonic()
+    expired = time.time() - snapshot.loaded_at >= snapshot_config["ttl"]
+    check_due = now - _STATE["checked_at"] >= snapshot_config["version_check_interval"]
+    if expired or check_due:
+        with _LOCK:
+            start = not _STATE["refreshing"]
+            _STATE["refreshing"] = True
+        if start:
+            threading.Thread(
+                target=_refresh_in_background,
+                args=(expired,),
+                name="team-snapshot-refresh",
+                daemon=True
+            ).start()
+    return snapshot
+
+
+def refresh_snapshot():
+    """Synchronously reload the snapshot, e.g. right after new data is loaded."""
+    with _LOAD_LOCK:
+        _publish(load_snapshot())
+    return _STATE["snapshot"]
@@ -41,57 +41,19 @@ function syncMadnessHeight() {
     }
 }
 
-/** Fetch AP Top 25 data for the home page. */
-async function fetchTop25Data() {
-    await fetch('/api/top_25_data')
+/** Fetch every home-page dataset in one request. */
+async function fetchDashboard() {
+    await fetch('/api/dashboard')
         .then(res => res.json())
         .then(data => {
-            top25Data = data;
+            top25Data = data.top_25;
+            madnessRatings = data.madness_ratings;
+            contenders = data.contenders;
+            nextUp = data.next_up;
+            midMajors = data.mid_majors;
         })
         .catch(error => {
-            console.error("An error occurred while fetching top 25 data: ", error);
-        });
-}
-
-/** Fetch Madness Ratings data for the home page. */
-async function fetchMadnessRatings() {
-    await fetch('/api/generateMadnessRtg')
-        .then(res => res.json())
-        .then(data => {
-            madnessRatings = data;
-        })
-        .catch(error => {
-            console.error("An error occurred while fetching madness data: ", error);
-        });
-}
-
-/** Fetch contender, next-up, and mid-major team lists. */
-async function fetchContendersNextAndMid() {
-    await fetch('/api/get_contenders')
-        .then(res => res.json())
-        .then(data => {
-            contenders = data;
-        })
-        .catch(error => {
-            console.error("An error occurred while fetching contenders: ", error);
-        });
-
-    await fetch('/api/get_next_up')
-        .then(res => res.json())
-        .then(data => {
-            nextUp = data;
-        })
-        .catch(error => {
-            console.error("An error occurred while fetching next up: ", error);
-        });
-
-    await fetch('/api/get_best_mid_majors')
-        .then(res => res.json())
-        .then(data => {
-            midMajors = data;
-        })
-        .catch(error => {
-            console.error("An error occurred while fetching mid majors: ", error);
+            console.error("An error occurred while fetching dashboard data: ", error);
         });
 }
 
@@ -400,13 +362,9 @@ function createTop25Table() {
 
 /** Load all data needed for the home page. */
 async function initializePage() {
-    await fetchTop25Data();
+    await fetchDashboard();
     createTop25Table();
-
-    await fetchMadnessRatings();
     createMadnessTable();
-
-    await fetchContendersNextAndMid();
     createTeamSection();
 }
 
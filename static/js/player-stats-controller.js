@@ -1,26 +1,69 @@
-let tableData = {};
+const PAGE_SIZE = 100;
+
+let tableData = [];
+let columnNames = [];
 let teamNames = {};
-let conferences = {};
 let sortDirection = {};
 let lastColumn = -1;
-let currentTable = 'stats';
+let sortSpec = '';
+let nextCursor = null;
+let loading = false;
+let requestId = 0;
 let conferenceFilter = 'None';
 let teamFilter = 'None';
 
 const confDropdown = document.getElementById('conferences-dropdown');
 const teamDropdown = document.getElementById('team-dropdown');
 
-/** Fetch player stats data and render the table. */
+/** Build the player stats query for the current filters, sort and cursor. */
+function playerStatsUrl(cursor) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (sortSpec) params.set('sort', sortSpec);
+    if (conferenceFilter != 'None') params.set('conference', conferenceFilter);
+    if (teamFilter != 'None') params.set('team', teamFilter);
+    if (cursor) params.set('cursor', cursor);
+    return `/api/get_player_stats?${params.toString()}`;
+}
+
+/** Fetch the first page of player stats for the current filters and render the table. */
 function fetchStatsData() {
-    sortDirection = {};
-    fetch(`/api/get_player_stats`)
+    const id = ++requestId;
+    loading = true;
+    fetch(playerStatsUrl(null))
         .then(res => res.json())
         .then(data => {
+            if (id !== requestId) return;
+            columnNames = data['columns'];
             tableData = data['player_data'];
+            nextCursor = data['next_cursor'];
             buildTable();
         })
         .catch(error => {
             console.log("Error fetching the player data: ", error);
+        })
+        .finally(() => {
+            if (id === requestId) loading = false;
+        });
+}
+
+/** Fetch the next page of rows and append them to the table. */
+function fetchNextPage() {
+    if (loading || !nextCursor) return;
+    const id = requestId;
+    loading = true;
+    fetch(playerStatsUrl(nextCursor))
+        .then(res => res.json())
+        .then(data => {
+            if (id !== requestId) return;
+            tableData = tableData.concat(data['player_data']);
+            nextCursor = data['next_cursor'];
+            appendRows(document.querySelector('#data-list .stats-table tbody'), data['player_data']);
+        })
+        .catch(error => {
+            console.log("Error fetching more player data: ", error);
+        })
+        .finally(() => {
+            if (id === requestId) loading = false;
         });
 }
 
@@ -98,39 +141,33 @@ function buildTable() {
     const scrollWrapper = document.createElement('div');
     scrollWrapper.classList.add('table-scroll-container');
     scrollWrapper.appendChild(table);
+    scrollWrapper.addEventListener('scroll', () => {
+        if (scrollWrapper.scrollTop + scrollWrapper.clientHeight >= scrollWrapper.scrollHeight - 200) {
+            fetchNextPage();
+        }
+    });
     container.appendChild(scrollWrapper);
 
-    buildTableBody(table);
+    const tbody = document.createElement('tbody');
+    table.appendChild(tbody);
+    appendRows(tbody, tableData);
 }
 
-/** Render the table body, applying conference/team filters. */
-function buildTableBody(table) {
-    const oldTbody = table.querySelector('tbody');
-    if (oldTbody) table.removeChild(oldTbody);
-
-    const tbody = document.createElement('tbody');
+/** Append rows to the table body; filtering and sorting already happened on the server. */
+function appendRows(tbody, rows) {
+    if (!tbody) return;
 
-    tableData.forEach(row => {
+    const fragment = document.createDocumentFragment();
+    rows.forEach(row => {
         const tr = document.createElement('tr');
-        let team = "";
-        let conference = "";
-
         row.forEach((cell, i) => {
             const td = document.createElement('td');
             td.textContent = formatCell(cell, i);
-            if (i == 1) {
-                team = td.textContent;
-            } else if (i == 2) {
-                conference = td.textContent;
-            }
             tr.appendChild(td);
         });
-        if ((teamFilter != "None" && team == teamFilter) || (conferenceFilter != "None" && conference == conferenceFilter) || (conferenceFilter == "None" && teamFilter == "None")) {
-            tbody.appendChild(tr);
-        }
+        fragment.appendChild(tr);
     });
-
-    table.appendChild(tbody);
+    tbody.appendChild(fragment);
 }
 
 /** Format numeric cells based on column index. */
@@ -146,11 +183,11 @@ function formatCell(cell, index) {
     } else if (typeof cell === 'number' && (!Number.isInteger(cell) || (index >= 8 && index <= 10))) {
         return cell.toFixed(3);
     }
-  
+
     return cell;
 }
 
-/** Sort table rows by column and rebuild the table. */
+/** Sort by a column on the server: numbers largest first and text A-Z on the first click. */
 function sortByColumn(colIndex) {
     direction = sortDirection[colIndex] === 'asc' ? 'desc' : 'asc';
     sortDirection[colIndex] = direction;
@@ -158,34 +195,26 @@ function sortByColumn(colIndex) {
     if (lastColumn != colIndex) {
         direction = 'asc';
     }
-  
-    tableData.sort((a, b) => {
-        let valA = a[colIndex];
-        let valB = b[colIndex];
-
-        if (typeof valA === 'number' && typeof valB === 'number') {
-            return direction === 'asc' ? valB - valA : valA - valB;
-        } else {
-        return direction === 'asc'
-            ? String(valA).localeCompare(String(valB))
-            : String(valB).localeCompare(String(valA));
-        }
-    });
+
+    const column = columnNames[colIndex];
+    const numeric = colIndex >= 5;
+    const descending = numeric ? direction === 'asc' : direction === 'desc';
+    sortSpec = `${descending ? '-' : ''}${column}`;
 
     lastColumn = colIndex;
-    buildTable(); // full rebuild
+    fetchStatsData();
 }
 
 confDropdown.addEventListener('change', () => {
     conferenceFilter = confDropdown.value;
     teamDropdown.value = teamFilter = 'None';
-    buildTable();
+    fetchStatsData();
 });
 
 teamDropdown.addEventListener('change', () => {
     teamFilter = teamDropdown.value;
     confDropdown.value = conferenceFilter = 'None';
-    buildTable();
+    fetchStatsData();
 })
 
 window.addEventListener('DOMContentLoaded', () => {
@@ -8,11 +8,9 @@ const xStatSelect = document.getElementById("xStatSelect");
 const yStatSelect = document.getElementById("yStatSelect");
 const correlationValue = document.getElementById("plotly-correlation-value");
 const regressionToggle = document.getElementById("regressionToggle");
-const logoCache = new Map();
-const LOGO_WHITE_THRESHOLD = 245;
-const LOGO_CACHE_KEY = "mm_logo_cache_v1";
-const LOGO_CACHE_DONE_KEY = "mm_logo_cache_complete_v1";
-let logoCacheStore = null;
+const LOGO_ATLAS_SIZE = 64;
+const logoAtlases = new Map();
+const spriteCache = new Map();
 const STAT_OPTIONS = [
     "3_point_attempt_rate",
     "3_point_field_goals",
@@ -108,285 +106,48 @@ function formatStatLabel(statKey) {
     return words.map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(" ");
 }
 
-/** Compute Pearson correlation for two numeric arrays. */
-function computeCorrelation(xValues, yValues) {
-    if (xValues.length === 0 || yValues.length === 0 || xValues.length !== yValues.length) {
-        return null;
-    }
-    const count = xValues.length;
-    const meanX = xValues.reduce((sum, val) => sum + val, 0) / count;
-    const meanY = yValues.reduce((sum, val) => sum + val, 0) / count;
-    let numerator = 0;
-    let denomX = 0;
-    let denomY = 0;
-
-    for (let i = 0; i < count; i += 1) {
-        const dx = xValues[i] - meanX;
-        const dy = yValues[i] - meanY;
-        numerator += dx * dy;
-        denomX += dx * dx;
-        denomY += dy * dy;
-    }
-
-    if (denomX === 0 || denomY === 0) {
-        return null;
-    }
-    return numerator / Math.sqrt(denomX * denomY);
-}
-
-/** Compute a regression line (y = mx + b) for the provided values. */
-function computeRegressionLine(xValues, yValues, xMin, xMax) {
-    if (xValues.length < 2 || xValues.length !== yValues.length) {
-        return null;
-    }
-    const count = xValues.length;
-    const meanX = xValues.reduce((sum, val) => sum + val, 0) / count;
-    const meanY = yValues.reduce((sum, val) => sum + val, 0) / count;
-    let numerator = 0;
-    let denom = 0;
-
-    for (let i = 0; i < count; i += 1) {
-        const dx = xValues[i] - meanX;
-        numerator += dx * (yValues[i] - meanY);
-        denom += dx * dx;
-    }
-
-    if (denom === 0) {
-        return null;
-    }
-
-    const slope = numerator / denom;
-    const intercept = meanY - slope * meanX;
-    const y0 = slope * xMin + intercept;
-    const y1 = slope * xMax + intercept;
-
-    if (!Number.isFinite(y0) || !Number.isFinite(y1)) {
-        return null;
-    }
-
-    return {
-        x0: xMin,
-        x1: xMax,
-        y0,
-        y1
-    };
-}
-
-/** Create a stable hash for cache keys. */
-function hashLogoSource(source) {
-    let hash = 5381;
-    for (let i = 0; i < source.length; i += 1) {
-        hash = ((hash << 5) + hash) + source.charCodeAt(i);
-        hash &= 0xffffffff;
-    }
-    return (hash >>> 0).toString(36);
-}
-
-/** Load cached logos from sessionStorage into memory. */
-function loadLogoCacheFromStorage() {
-    if (logoCacheStore !== null) {
-        return;
-    }
-    logoCacheStore = {};
-    try {
-        const raw = sessionStorage.getItem(LOGO_CACHE_KEY);
-        if (!raw) {
-            return;
-        }
-        const parsed = JSON.parse(raw);
-        if (parsed && typeof parsed === "object") {
-            logoCacheStore = parsed;
-            Object.entries(logoCacheStore).forEach(([key, value]) => {
-                if (typeof value === "string") {
-                    logoCache.set(key, value);
-                }
-            });
-        }
-    } catch (error) {
-        logoCacheStore = {};
-    }
-}
-
-/** Check whether the full logo cache has been built in this session. */
-function isLogoCacheComplete() {
-    try {
-        return sessionStorage.getItem(LOGO_CACHE_DONE_KEY) === "true";
-    } catch (error) {
-        return false;
-    }
-}
-
-/** Mark the full logo cache as complete for this session. */
-function markLogoCacheComplete() {
-    try {
-        sessionStorage.setItem(LOGO_CACHE_DONE_KEY, "true");
-    } catch (error) {
-        return;
-    }
-}
-
-/** Persist a transparent logo into sessionStorage cache. */
-function persistLogoCacheEntry(cacheKey, value) {
-    if (!cacheKey || !value) {
-        return;
-    }
-    if (!logoCacheStore) {
-        logoCacheStore = {};
-    }
-    logoCacheStore[cacheKey] = value;
-    try {
-        sessionStorage.setItem(LOGO_CACHE_KEY, JSON.stringify(logoCacheStore));
-    } catch (error) {
-        if (error && error.name === "QuotaExceededError") {
-            return;
-        }
-    }
-}
-
-/** Pre-warm the logo cache using the full team list during idle time. */
-function prewarmAllTeamLogos() {
-    if (isLogoCacheComplete()) {
-        return;
-    }
-
-    fetch('/api/get_team_list')
-        .then(res => res.json())
-        .then(teamList => {
-            if (!Array.isArray(teamList) || teamList.length === 0) {
-                return;
-            }
-
-            let index = 0;
-            const runBatch = (deadline) => {
-                let processed = 0;
-                const hasIdle = deadline && typeof deadline.timeRemaining === "function";
-
-                while (index < teamList.length) {
-                    const team = teamList[index];
-                    index += 1;
-                    if (team.logo_base64) {
-                        const source = `data:image/png;base64,${team.logo_base64}`;
-                        makeTransparentLogo(source);
-                    }
-                    processed += 1;
-                    if (hasIdle && deadline.timeRemaining() < 1) {
-                        break;
-                    }
-                    if (!hasIdle && processed >= 6) {
-                        break;
-                    }
+/** Load a logo sprite atlas and its offsets once per page. */
+function loadLogoAtlas(size) {
+    if (!logoAtlases.has(size)) {
+        const atlasPromise = fetch(`/api/logo_atlas/${size}`)
+            .then(res => (res.ok ? res.json() : null))
+            .then(atlas => new Promise((resolve) => {
+                if (!atlas) {
+                    resolve(null);
+                    return;
                 }
-
-                if (index < teamList.length) {
-                    if (typeof requestIdleCallback === "function") {
-                        requestIdleCallback(runBatch, { timeout: 500 });
-                    } else {
-                        setTimeout(() => runBatch(null), 120);
-                    }
-                } else {
-                    markLogoCacheComplete();
-                }
-            };
-
-            if (typeof requestIdleCallback === "function") {
-                requestIdleCallback(runBatch, { timeout: 800 });
-            } else {
-                setTimeout(() => runBatch(null), 200);
-            }
-        })
-        .catch(() => {});
-}
-
-/** Remove near-white background pixels connected to the image edge. */
-function stripWhiteBackground(imageData, width, height, threshold) {
-    const data = imageData.data;
-    const visited = new Uint8Array(width * height);
-    const queue = [];
-
-    const isWhite = (idx) => {
-        const r = data[idx];
-        const g = data[idx + 1];
-        const b = data[idx + 2];
-        const a = data[idx + 3];
-        return a > 0 && r >= threshold && g >= threshold && b >= threshold;
-    };
-
-    const enqueue = (x, y) => {
-        const pos = y * width + x;
-        if (visited[pos]) {
-            return;
-        }
-        const idx = pos * 4;
-        if (!isWhite(idx)) {
-            return;
-        }
-        visited[pos] = 1;
-        queue.push(pos);
-    };
-
-    for (let x = 0; x < width; x += 1) {
-        enqueue(x, 0);
-        enqueue(x, height - 1);
-    }
-
-    for (let y = 1; y < height - 1; y += 1) {
-        enqueue(0, y);
-        enqueue(width - 1, y);
-    }
-
-    while (queue.length) {
-        const pos = queue.pop();
-        const x = pos % width;
-        const y = Math.floor(pos / width);
-
-        if (x > 0) enqueue(x - 1, y);
-        if (x < width - 1) enqueue(x + 1, y);
-        if (y > 0) enqueue(x, y - 1);
-        if (y < height - 1) enqueue(x, y + 1);
-    }
-
-    for (let i = 0; i < visited.length; i += 1) {
-        if (visited[i]) {
-            data[i * 4 + 3] = 0;
-        }
-    }
+                const img = new Image();
+                img.onload = () => resolve({ ...atlas, image: img });
+                img.onerror = () => resolve(null);
+                img.src = atlas.url;
+            }))
+            .catch(() => null);
+        logoAtlases.set(size, atlasPromise);
+    }
+    return logoAtlases.get(size);
 }
 
-/** Convert a base64 logo to a transparent-background version. */
-function makeTransparentLogo(source) {
-    if (!source) {
+/**
+ * Cut one team's logo out of the atlas into a blob and return an object URL for Plotly.
+ * Each sprite is cut once per page; every later render reuses the same URL.
+ */
+function spriteSource(atlas, teamId) {
+    const sprite = atlas ? atlas.sprites[teamId] : null;
+    if (!sprite) {
         return Promise.resolve(null);
     }
-    loadLogoCacheFromStorage();
-    const cacheKey = hashLogoSource(source);
-    if (logoCache.has(cacheKey)) {
-        return Promise.resolve(logoCache.get(cacheKey));
-    }
-    if (logoCacheStore && logoCacheStore[cacheKey]) {
-        const cached = logoCacheStore[cacheKey];
-        logoCache.set(cacheKey, cached);
-        return Promise.resolve(cached);
-    }
-
-    return new Promise((resolve) => {
-        const img = new Image();
-        img.onload = () => {
-            const canvas = document.createElement("canvas");
-            canvas.width = img.naturalWidth || img.width;
-            canvas.height = img.naturalHeight || img.height;
-            const ctx = canvas.getContext("2d", { willReadFrequently: true });
-            ctx.drawImage(img, 0, 0);
-            const imageData = ctx.getImageData(0, 0, canvas.width, canvas.height);
-            stripWhiteBackground(imageData, canvas.width, canvas.height, LOGO_WHITE_THRESHOLD);
-            ctx.putImageData(imageData, 0, 0);
-            const transparentSource = canvas.toDataURL("image/png");
-            logoCache.set(cacheKey, transparentSource);
-            persistLogoCacheEntry(cacheKey, transparentSource);
-            resolve(transparentSource);
-        };
-        img.onerror = () => resolve(source);
-        img.src = source;
-    });
+    const cacheKey = `${atlas.url}:${teamId}`;
+    if (!spriteCache.has(cacheKey)) {
+        const [sx, sy, width, height] = sprite;
+        const canvas = document.createElement("canvas");
+        canvas.width = width;
+        canvas.height = height;
+        canvas.getContext("2d").drawImage(atlas.image, sx, sy, width, height, 0, 0, width, height);
+        spriteCache.set(cacheKey, new Promise(resolve => {
+            canvas.toBlob(blob => resolve(blob ? URL.createObjectURL(blob) : null), "image/png");
+        }));
+    }
+    return spriteCache.get(cacheKey);
 }
 
 howSelect.addEventListener("change", e => {
@@ -443,25 +204,19 @@ async function renderChart() {
     }
 
     const token = ++renderToken;
-    let rows;
-    let averages;
+    let view;
+    let logoAtlas;
     try {
-        const needsNationalAverages = how !== "All Teams";
-        const [rowsResponse, averagesResponse] = await Promise.all([
-            fetch(`/api/fetch_plotly?how=${encodeURIComponent(how)}&x=${encodeURIComponent(xStat)}&y=${encodeURIComponent(yStat)}`, { cache: "no-store" }),
-            needsNationalAverages
-                ? fetch(`/api/get_plotly_averages?x=${encodeURIComponent(xStat)}&y=${encodeURIComponent(yStat)}`, { cache: "no-store" })
-                : Promise.resolve(null)
+        const params = new URLSearchParams({ how, x: xStat, y: yStat });
+        const [viewResponse, atlas] = await Promise.all([
+            fetch(`/api/plotly_view?${params.toString()}`),
+            loadLogoAtlas(LOGO_ATLAS_SIZE)
         ]);
-        if (!rowsResponse.ok) {
-            throw new Error("Plotly data request failed.");
-        }
-        rows = await rowsResponse.json();
-        if (averagesResponse && !averagesResponse.ok) {
-            throw new Error("Plotly averages request failed.");
+        logoAtlas = atlas;
+        if (!viewResponse.ok) {
+            throw new Error("Plotly view request failed.");
         }
-        averages = averagesResponse ? await averagesResponse.json() : null;
-        // console.log("rows length:", rows?.length, "sample:", rows?.[0]);
+        view = await viewResponse.json();
     } catch (e) {
         console.error("Fetch/JSON failed:", e);
         return;
@@ -470,44 +225,12 @@ async function renderChart() {
         return;
     }
 
-    if (!Array.isArray(rows) || rows.length === 0) {
-        console.error("No rows returned from API:", rows);
-        chartDiv.innerHTML = "<p>No data returned.</p>";
-        return;
-    }
-
-    // Build arrays (and filter out any bad ones, just in case)
-    const x = [];
-    const y = [];
-    const labels = [];
-    const logoSources = [];
-    const customData = [];
-    const net = [];
-    const mad = [];
-
-    for (const r of rows) {
-        const xVal = Number(r.x_value);
-        const yVal = Number(r.y_value);
-        const n = Number(r.net_rating_adjusted);
-        const m = Number(r.madness_rating);
+    // The server only returns teams with both stats present, already averaged and fitted.
+    const { x, y, averages, regression, correlation } = view;
+    const labels = view.team_name;
+    const nationalAverages = view.national_averages;
 
-        if (!Number.isFinite(xVal) || !Number.isFinite(yVal)) continue;
-
-        x.push(xVal);
-        y.push(yVal);
-        labels.push(r.team_name);
-        net.push(Number.isFinite(n) ? n : null);
-        mad.push(Number.isFinite(m) ? m : null);
-        logoSources.push(r.logo_base64 ? `data:image/png;base64,${r.logo_base64}` : null);
-        customData.push([
-            Number.isFinite(n) ? n : null,
-            Number.isFinite(m) ? m : null
-        ]);
-    }
-
-    // console.log("plottable points:", x.length);
-
-    if (x.length === 0) {
+    if (!x || x.length === 0) {
         chartDiv.innerHTML = "<p>No valid points to plot.</p>";
         if (correlationValue) {
             correlationValue.textContent = "--";
@@ -515,9 +238,14 @@ async function renderChart() {
         return;
     }
 
+    const logoSources = await Promise.all(view.team_id.map(teamId => spriteSource(logoAtlas, teamId)));
+    if (token !== renderToken) {
+        return;
+    }
+    const customData = view.net_rating_adjusted.map((net, i) => [net, view.madness_rating[i]]);
+
     if (correlationValue) {
-        const corr = computeCorrelation(x, y);
-        correlationValue.textContent = corr === null ? "--" : corr.toFixed(3);
+        correlationValue.textContent = correlation === null ? "--" : correlation.toFixed(3);
     }
 
     const xLabel = formatStatLabel(xStat);
@@ -539,8 +267,8 @@ async function renderChart() {
         marker: { size: 12, color: "rgba(0, 0, 0, 0)" }
     };
 
-    const xMean = x.reduce((a, b) => a + b, 0) / x.length;
-    const yMean = y.reduce((a, b) => a + b, 0) / y.length;
+    const xMean = averages.x;
+    const yMean = averages.y;
     const xMin = Math.min(...x);
     const xMax = Math.max(...x);
     const yMin = Math.min(...y);
@@ -549,15 +277,8 @@ async function renderChart() {
     const yRange = Math.max(yMax - yMin, 1);
     const logoSizeX = xRange * 0.035;
     const logoSizeY = yRange * 0.035;
-    const transparentLogos = await Promise.all(
-        logoSources.map((source) => makeTransparentLogo(source))
-    );
-    if (token !== renderToken) {
-        return;
-    }
-
     const logoImages = x.map((xVal, index) => {
-        const source = transparentLogos[index];
+        const source = logoSources[index];
         if (!source) {
             return null;
         }
@@ -636,14 +357,14 @@ async function renderChart() {
         }
     ];
 
-    if (how !== "All Teams" && averages && Number.isFinite(averages.x_avg) && Number.isFinite(averages.y_avg)) {
+    if (how !== "All Teams" && Number.isFinite(nationalAverages.x) && Number.isFinite(nationalAverages.y)) {
         shapes.push(
             {
                 type: "line",
                 xref: "x",
                 yref: "paper",
-                x0: averages.x_avg,
-                x1: averages.x_avg,
+                x0: nationalAverages.x,
+                x1: nationalAverages.x,
                 y0: 0,
                 y1: 1,
                 line: {color: "green", width: 2, dash: "dot"},
@@ -655,19 +376,19 @@ async function renderChart() {
                 yref: "y",
                 x0: 0,
                 x1: 1,
-                y0: averages.y_avg,
-                y1: averages.y_avg,
+                y0: nationalAverages.y,
+                y1: nationalAverages.y,
                 line: {color: "green", width: 2, dash: "dot"},
                 layer: "below"
             }
         );
         annotations.push(
             {
-                x: averages.x_avg,
+                x: nationalAverages.x,
                 y: 1.02,
                 xref: "x",
                 yref: "paper",
-                text: `National Avg ${xLabel}: ${averages.x_avg.toFixed(2)}`,
+                text: `National Avg ${xLabel}: ${nationalAverages.x.toFixed(2)}`,
                 showarrow: false,
                 font: { color: "green", size: 10 },
                 xanchor: "left",
@@ -675,10 +396,10 @@ async function renderChart() {
             },
             {
                 x: -0.02,
-                y: averages.y_avg,
+                y: nationalAverages.y,
                 xref: "paper",
                 yref: "y",
-                text: `National Avg ${yLabel}: ${averages.y_avg.toFixed(2)}`,
+                text: `National Avg ${yLabel}: ${nationalAverages.y.toFixed(2)}`,
                 showarrow: false,
                 font: { color: "green", size: 10 },
                 xanchor: "left",
@@ -688,7 +409,6 @@ async function renderChart() {
     }
 
     if (regressionToggle && regressionToggle.checked) {
-        const regression = computeRegressionLine(x, y, xMin, xMax);
         if (regression) {
             shapes.push({
                 type: "line",
@@ -728,11 +448,6 @@ async function initializePage() {
     populateStatSelect(xStatSelect, xStat);
     populateStatSelect(yStatSelect, yStat);
     renderChart();
-    if (typeof requestIdleCallback === "function") {
-        requestIdleCallback(() => prewarmAllTeamLogos(), { timeout: 800 });
-    } else {
-        setTimeout(() => prewarmAllTeamLogos(), 400);
-    }
 }
 
 window.addEventListener('DOMContentLoaded', initializePage);
@@ -1,5 +1,6 @@
-let statsData = [];
-let ratingsData = [];
+// Column-oriented tables: `columns[dataIndex][row]`, displayed in `order`.
+let statsData = { columns: [], order: [] };
+let ratingsData = { columns: [], order: [] };
 let conferences = {};
 let sortDirection = {};
 let lastColumn = -1;
@@ -18,12 +19,18 @@ const LOWER_BETTER = {
     ratings: new Set([2, 5, 8, 14, 25])
 };
 
+/** Turn a columnar API payload into a table with columns in schema order. */
+function toColumnTable(data) {
+    const columns = data.schema.map(field => data.columns[field.name]);
+    return { columns, order: Array.from({ length: data.length }, (_, row) => row) };
+}
+
 /** Fetch base team stats and conference mappings. */
 async function fetchStatsData() {
-    await fetch(`/api/get_team_stats`)
+    await fetch(`/api/get_team_stats?format=columns`)
         .then(res => res.json())
         .then(data => {
-            statsData = [...data.teams];
+            statsData = toColumnTable(data);
             conferences = data.conferences;
         })
         .catch(error => {
@@ -33,10 +40,10 @@ async function fetchStatsData() {
 
 /** Fetch advanced ratings data for teams. */
 async function fetchRatingsData() {
-    await fetch(`/api/get_team_ratings`)
+    await fetch(`/api/get_team_ratings?format=columns`)
         .then(res => res.json())
         .then(data => {
-            ratingsData = data;
+            ratingsData = toColumnTable(data);
         })
         .catch(error => {
             console.error("Error fetching the stats data:", error);
@@ -157,15 +164,12 @@ function buildTableBody(table, type, columnStats) {
     if (oldTbody) table.removeChild(oldTbody);
 
     const tbody = document.createElement('tbody');
-    if (type == 'stats') {
-        tableData = statsData;
-    } else {
-        tableData = ratingsData;
-    }
+    const tableData = type == 'stats' ? statsData : ratingsData;
+    const columns = tableData.columns;
 
     let rowIndex = 0;
-    tableData.forEach(row => {
-        const conference = conferences[row[1]] || 'Unknown';
+    tableData.order.forEach(row => {
+        const conference = conferences[columns[1][row]] || 'Unknown';
         if ((conference == conferenceFilter && conferenceFilter != 'None') || conferenceFilter == 'None') {
             rowIndex += 1;
             const tr = document.createElement('tr');
@@ -174,7 +178,7 @@ function buildTableBody(table, type, columnStats) {
                 if (header.dataIndex === null) {
                     td.textContent = rowIndex;
                 } else {
-                    const cell = row[header.dataIndex];
+                    const cell = columns[header.dataIndex][row];
                     td.textContent = formatCell(cell, header.dataIndex, type);
                     applyHeatmapStyle(td, cell, header.dataIndex, type, columnStats);
                 }
@@ -218,32 +222,35 @@ function formatCell(cell, index, type) {
 
 /** Compute averages and ranges for numeric columns to support heatmap shading. */
 function computeColumnStats(tableData, type) {
-    const sums = {};
-    const counts = {};
+    const averages = {};
     const mins = {};
     const maxs = {};
 
-    tableData.forEach(row => {
-        row.forEach((cell, index) => {
-            if (index === 0 || index === 1) {
-                return;
-            }
+    tableData.columns.forEach((column, index) => {
+        if (index === 0 || index === 1) {
+            return;
+        }
+        let sum = 0;
+        let count = 0;
+        let min = Infinity;
+        let max = -Infinity;
+        for (const cell of column) {
             if (type == 'ratings' && index == 2 && cell == 0) {
-                return;
+                continue;
             }
             if (typeof cell !== 'number' || !Number.isFinite(cell)) {
-                return;
+                continue;
             }
-            sums[index] = (sums[index] || 0) + cell;
-            counts[index] = (counts[index] || 0) + 1;
-            mins[index] = mins[index] === undefined ? cell : Math.min(mins[index], cell);
-            maxs[index] = maxs[index] === undefined ? cell : Math.max(maxs[index], cell);
-        });
-    });
-
-    const averages = {};
-    Object.keys(sums).forEach(index => {
-        averages[index] = sums[index] / counts[index];
+            sum += cell;
+            count += 1;
+            if (cell < min) min = cell;
+            if (cell > max) max = cell;
+        }
+        if (count > 0) {
+            averages[index] = sum / count;
+            mins[index] = min;
+            maxs[index] = max;
+        }
     });
     return { averages, mins, maxs };
 }
@@ -315,15 +322,12 @@ function sortByColumn(colIndex, type) {
         direction = 'asc';
     }
 
-    if (type == 'stats') {
-        tableData = statsData;
-    } else {
-        tableData = ratingsData;
-    }
-  
-    tableData.sort((a, b) => {
-        let valA = colIndex === 1 ? conferences[a[1]] : a[colIndex];
-        let valB = colIndex === 1 ? conferences[b[1]] : b[colIndex];
+    const tableData = type == 'stats' ? statsData : ratingsData;
+    const column = tableData.columns[colIndex];
+
+    tableData.order.sort((a, b) => {
+        let valA = colIndex === 1 ? conferences[column[a]] : column[a];
+        let valB = colIndex === 1 ? conferences[column[b]] : column[b];
   
         if (colIndex === 2 && type == 'ratings') {
             const isAZero = valA === 0;
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
+
+# Keep the app's log out of backend/ while the suite runs.
+os.environ.setdefault("LOG_PATH", os.path.join(tempfile.mkdtemp(prefix="matchup-tests-"), "log.txt"))
+
+import synthetic_db  # noqa: E402
+
+STAND_IN_DEFAULTS = {"teams": 48, "conferences": 4, "players_per_team": 1, "logos": 0}
+
+
+@pytest.fixture(scope="session")
+def make_stand_in(tmp_path_factory):
+    """Return ``make(statements=(), **options)``: a fresh SQLite stand-in the pool now points at.
+
+    ``statements`` run against it before the team snapshot is reloaded, so
+    the app serves exactly what the test set up.
+    """
+    def make(statements=(), **options):
+        from db import db_cursor
+        from snapshot import refresh_snapshot
+
+        path = str(tmp_path_factory.mktemp("db") / "matchup.sqlite")
+        synthetic_db.generate(path, **{**STAND_IN_DEFAULTS, **options})
+        synthetic_db.install(path)
+        with db_cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        refresh_snapshot()
+        return path
+    return make
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Flask test client for the app."""
+    import app as matchup_app
+
+    return matchup_app.app.test_client()
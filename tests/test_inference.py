@@ -0,0 +1,68 @@
+"""Parity between the NumPy fast path and the sklearn pipeline on real snapshot features."""
+import numpy as np
+import pytest
+
+import synthetic_db
+
+from db import db_cursor
+from inference import MODEL, MatchupModel
+from snapshot import load_snapshot
+
+# team_id -> column set to NULL, covering home-only, away-only, diff and per-game features.
+NULL_STATS = {
+    3: "pace",
+    7: "assist_percentage",
+    11: "steal_percentage",
+    19: "team_rebounds",
+    23: "games"
+}
+
+
+@pytest.fixture(scope="module")
+def snapshot(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("db") / "teams.sqlite")
+    synthetic_db.generate(path, teams=48, conferences=4, players_per_team=1, logos=0)
+    synthetic_db.install(path)
+    with db_cursor() as cursor:
+        for team_id, column in NULL_STATS.items():
+            cursor.execute(f"UPDATE team SET `{column}` = NULL WHERE team_id = %s", (team_id,))
+    return load_snapshot()
+
+
+def all_pairs(snapshot):
+    home, away = np.divmod(np.arange(snapshot.size * snapshot.size), snapshot.size)
+    return home, away
+
+
+def test_fast_path_matches_sklearn(snapshot):
+    fast = MatchupModel(MODEL, fast_path=True)
+    reference = MatchupModel(MODEL, fast_path=False)
+    assert fast.fast_path and not reference.fast_path
+
+    home, away = all_pairs(snapshot)
+    expected = reference.predict(snapshot, home, away)
+    actual = fast.predict(snapshot, home, away)
+
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    complete = ~np.isnan(expected)
+    assert complete.any()
+    assert np.max(np.abs(actual[complete] - expected[complete])) <= 1e-9
+
+
+def test_null_stats_only_blank_their_own_pairs(snapshot):
+    reference = MatchupModel(MODEL, fast_path=False)
+    home, away = all_pairs(snapshot)
+    probs = reference.predict(snapshot, home, away).reshape(snapshot.size, snapshot.size)
+
+    nulls = np.array([snapshot.index_by_id[team_id] for team_id in NULL_STATS])
+    others = np.setdiff1d(np.arange(snapshot.size), nulls)
+    assert not np.isnan(probs[np.ix_(others, others)]).any()
+
+    # assist_percentage is only read for the home team, steal_percentage only for the away team.
+    home_only = snapshot.index_by_id[7]
+    away_only = snapshot.index_by_id[11]
+    assert np.isnan(probs[home_only, others]).all() and not np.isnan(probs[others, home_only]).any()
+    assert np.isnan(probs[others, away_only]).all() and not np.isnan(probs[away_only, others]).any()
+    for team_id in (3, 19, 23):
+        index = snapshot.index_by_id[team_id]
+        assert np.isnan(probs[index, others]).all() and np.isnan(probs[others, index]).all()
@@ -0,0 +1,91 @@
+"""Keyset pagination of /api/get_player_stats: every row exactly once, in the one-shot order."""
+import math
+
+import pytest
+
+from db import db_cursor
+from players import PLAYER_COLUMNS
+from response_cache import RESPONSE_CACHE
+
+ROUTE = "/api/get_player_stats"
+PAGE = 7
+# Blank some numeric and text stats so NULLs sit inside, and at the end of, every order.
+NULLS = [
+    "UPDATE player SET pts_per_game = NULL WHERE team_id % 5 = 0",
+    "UPDATE player SET minutes_per_game = NULL WHERE team_id % 7 = 1",
+    "UPDATE player SET position = NULL WHERE team_id % 6 = 2",
+    "UPDATE player SET class = NULL WHERE team_id % 4 = 3"
+]
+SORTS = [
+    "",
+    "-pts_per_game",
+    "pts_per_game",
+    "position,-minutes_per_game",
+    "-class,pts_per_game",
+    "team_name,-player_name",
+    "-games_played,position,-ast_per_game"
+]
+
+
+@pytest.fixture(scope="module")
+def stand_in(make_stand_in, client):
+    path = make_stand_in(NULLS, players_per_team=6)
+    RESPONSE_CACHE.clear()
+    return path
+
+
+def identity(row):
+    return row[PLAYER_COLUMNS.index("team_name")], row[PLAYER_COLUMNS.index("player_name")]
+
+
+def walk(client, params):
+    """Follow next_cursor from the first page to the last; return the rows and the reported totals."""
+    rows, totals, cursor = [], set(), None
+    for _ in range(1000):
+        query = {**params, "limit": PAGE, **({"cursor": cursor} if cursor else {})}
+        response = client.get(ROUTE, query_string=query)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        rows.extend(body["player_data"])
+        totals.add(body["total"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return rows, totals
+        assert len(body["player_data"]) == PAGE
+    pytest.fail("next_cursor never ran out")
+
+
+def one_shot(client, params):
+    body = client.get(ROUTE, query_string={**params, "limit": 1000}).get_json()
+    assert body["next_cursor"] is None
+    return body["player_data"]
+
+
+@pytest.mark.parametrize("sort", SORTS)
+@pytest.mark.parametrize("conference", [None, "SEC"])
+def test_full_traversal_has_no_duplicates_or_gaps(stand_in, client, sort, conference):
+    params = {"sort": sort}
+    if conference:
+        params["conference"] = conference
+    expected = one_shot(client, params)
+    assert len(expected) > PAGE
+    if conference is None:
+        with db_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM player")
+            assert len(expected) == cursor.fetchone()[0]
+    rows, totals = walk(client, params)
+
+    assert totals == {len(expected)}
+    assert len({identity(row) for row in rows}) == len(rows)
+    assert [identity(row) for row in rows] == [identity(row) for row in expected]
+
+
+@pytest.mark.parametrize("column,descending", [("pts_per_game", True), ("pts_per_game", False)])
+def test_numeric_nulls_sort_last(stand_in, client, column, descending):
+    rows, _ = walk(client, {"sort": ("-" if descending else "") + column})
+    values = [row[PLAYER_COLUMNS.index(column)] for row in rows]
+    present = [value for value in values if value is not None]
+    assert present and len(present) < len(values)
+    assert values[len(present):] == [None] * (len(values) - len(present))
+    assert present == sorted(present, reverse=descending)
+    assert not any(isinstance(value, float) and math.isnan(value) for value in values)
@@ -0,0 +1,100 @@
+"""Response cache: byte-bounded eviction, data-version invalidation and 304s for compressed copies."""
+import gzip
+
+import pytest
+
+from response_cache import RESPONSE_CACHE, CachedResponse, ResponseCache, entry_size
+
+ROUTE = "/api/get_team_stats"
+
+
+def entry(body, **encoded):
+    return CachedResponse(body, "application/json", "etag", 0, encoded, ())
+
+
+def test_eviction_is_least_recently_used_by_bytes():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", 1, entry(b"a" * 30))
+    cache.put("b", 1, entry(b"b" * 30))
+    cache.put("c", 1, entry(b"c" * 30))
+    assert cache.get("a", 1) is not None  # "b" is now the least recently used
+
+    cache.put("d", 1, entry(b"d" * 30))
+    assert cache.get("b", 1) is None
+    assert all(cache.get(key, 1) is not None for key in "acd")
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 3 and stats["bytes"] == 90
+
+
+def test_compressed_copies_count_towards_the_budget():
+    cache = ResponseCache(max_bytes=100)
+    big = entry(b"x" * 40, gzip=b"g" * 20, br=b"b" * 15)
+    assert entry_size(big) == 75
+    cache.put("a", 1, entry(b"a" * 30))
+    cache.put("big", 1, big)
+    assert cache.get("a", 1) is None
+    assert cache.stats()["bytes"] == 75
+
+    cache.put("huge", 1, entry(b"h" * 101))
+    assert cache.get("huge", 1) is None
+    assert cache.get("big", 1) is not None
+
+
+def test_new_data_version_drops_every_entry():
+    cache = ResponseCache(max_bytes=1000)
+    cache.put("a", "v1", entry(b"a"))
+    cache.put("b", "v1", entry(b"b"))
+    assert cache.get("a", "v2") is None
+    assert cache.get("b", "v1") is None
+    stats = cache.stats()
+    assert stats["invalidations"] == 1
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+
+
+@pytest.fixture
+def stand_in(make_stand_in, client):
+    path = make_stand_in(teams=120)
+    RESPONSE_CACHE.clear()
+    return path
+
+
+def test_compressed_copy_answers_304(stand_in, client):
+    plain = client.get(ROUTE)
+    assert plain.status_code == 200 and "Content-Encoding" not in plain.headers
+
+    compressed = client.get(ROUTE, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+    revalidated = client.get(ROUTE, headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]})
+    assert revalidated.status_code == 304 and revalidated.data == b""
+    revalidated = client.get(ROUTE, headers={"If-None-Match": plain.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+    # The identity tag does not validate the gzip representation, nor the other way round.
+    mismatched = client.get(ROUTE, headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]})
+    assert mismatched.status_code == 200
+    mismatched = client.get(ROUTE, headers={"If-None-Match": compressed.headers["ETag"]})
+    assert mismatched.status_code == 200
+
+
+def test_data_change_serves_a_new_body(stand_in, client):
+    from db import db_cursor
+    from snapshot import refresh_snapshot
+
+    before = client.get(ROUTE)
+    assert client.get(ROUTE).headers["ETag"] == before.headers["ETag"]
+    hits = RESPONSE_CACHE.stats()["hits"]
+
+    with db_cursor() as cursor:
+        cursor.execute("UPDATE team SET wins = wins + 1 WHERE team_id = 1")
+    refresh_snapshot()
+
+    after = client.get(ROUTE)
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"] and after.data != before.data
+    assert RESPONSE_CACHE.stats()["hits"] == hits
+    stale = client.get(ROUTE, headers={"If-None-Match": before.headers["ETag"]})
+    assert stale.status_code == 200
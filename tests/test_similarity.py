@@ -0,0 +1,80 @@
+"""The similar-teams incremental refresh must match a full rebuild."""
+import numpy as np
+import pytest
+
+import similarity
+
+from db import db_cursor
+from similarity import SimilarTeams
+from snapshot import load_snapshot
+
+# Small moves on a few teams: enough to change their neighbours, not enough to rescale.
+PARTIAL_CHANGE = [
+    "UPDATE team SET pace = pace * 1.01, turnover_percentage = turnover_percentage * 0.98 WHERE team_id = 5",
+    "UPDATE team SET block_percentage = NULL WHERE team_id = 30"
+]
+MOVED = 17
+
+
+def move_towards(team_id, other_id, fraction=0.25):
+    """SQL moving every similarity stat of ``team_id`` part of the way to ``other_id``'s."""
+    return "UPDATE team SET " + ", ".join(
+        f"`{column}` = `{column}` + {fraction} * ((SELECT `{column}` FROM team WHERE team_id = {other_id}) - `{column}`)"
+        for column in similarity.SIMILARITY_COLUMNS
+    ) + f" WHERE team_id = {team_id}"
+
+
+@pytest.fixture(scope="module")
+def snapshots(make_stand_in):
+    make_stand_in(teams=150, conferences=8)
+    before = load_snapshot()
+    # Head for the closest team MOVED does not already list, so MOVED enters
+    # neighbour lists that never held a changed team.
+    index = before.index_by_id[MOVED]
+    previous = SimilarTeams(before)
+    distances = previous.distances[index].copy()
+    distances[previous.neighbours[index]] = np.inf
+    towards = int(before.team_ids[np.argmin(distances)])
+    with db_cursor() as cursor:
+        for statement in PARTIAL_CHANGE + [move_towards(MOVED, towards)]:
+            cursor.execute(statement)
+    return before, load_snapshot()
+
+
+def assert_same_index(incremental, full):
+    np.testing.assert_array_equal(incremental.neighbours, full.neighbours)
+    finite = np.isfinite(full.distances)
+    np.testing.assert_array_equal(finite, np.isfinite(incremental.distances))
+    np.testing.assert_allclose(incremental.distances[finite], full.distances[finite], rtol=1e-5, atol=1e-5)
+
+
+def test_partial_change_matches_full_rebuild(snapshots, monkeypatch):
+    before, after = snapshots
+    previous = SimilarTeams(before)
+    incremental = SimilarTeams(after, previous=previous)
+    assert incremental.rebuild.startswith("partial:3/")
+
+    # The incremental index keeps the previous scaling; rebuild from scratch with the same one.
+    monkeypatch.setattr(similarity, "standardize", lambda matrix: (previous.mean, previous.scale))
+    full = SimilarTeams(after)
+    assert full.rebuild == "full"
+    assert_same_index(incremental, full)
+    moved = after.index_by_id[MOVED]
+    gained = (incremental.neighbours == moved).any(axis=1) & ~(previous.neighbours == moved).any(axis=1)
+    assert gained.sum() > 1
+
+
+def test_unchanged_data_reuses_the_index(snapshots):
+    before, _ = snapshots
+    previous = SimilarTeams(before)
+    again = SimilarTeams(before, previous=previous)
+    assert again.rebuild == "unchanged"
+    assert_same_index(again, previous)
+
+
+def test_large_drift_rebuilds_in_full(snapshots, monkeypatch):
+    before, after = snapshots
+    monkeypatch.setitem(similarity.similarity_config, "rescale_tolerance", 0.0)
+    refreshed = SimilarTeams(after, previous=SimilarTeams(before))
+    assert refreshed.rebuild == "full"
+    assert_same_index(refreshed, SimilarTeams(after))
@@ -0,0 +1,105 @@
+from collections import namedtuple
+
+import numpy as np
+
+from config import tier_config
+from snapshot import register_warmer
+
+TIER_COLUMNS = [
+    "team_name",
+    "conference_abbreviation",
+    "wins",
+    "losses",
+    "ap_rank",
+    "madness_rating",
+    "net_rating_adjusted",
+    "offensive_rating_adjusted",
+    "defensive_rating_adjusted",
+    "strength_of_schedule",
+    "simple_rating_system"
+]
+# (column, descending): the direction that counts as "top" for each cutoff.
+CUTOFF_COLUMNS = [
+    ("offensive_rating_adjusted", True),
+    ("defensive_rating_adjusted", False),
+    ("strength_of_schedule", True)
+]
+
+# A team makes a tier by ranking inside the top ``offense``/``defense``/``sos``
+# of its pool (all teams, or non-power-conference teams), minus earlier tiers.
+TierSpec = namedtuple("TierSpec", ["name", "offense", "defense", "sos", "exclude_power", "exclude_tiers"])
+
+
+def default_tier_specs():
+    """Return the contenders, next-up and mid-major tiers with the configured cutoffs."""
+    return [
+        TierSpec("contenders", *tier_config["contenders"], exclude_power=False, exclude_tiers=()),
+        TierSpec("next_up", *tier_config["next_up"], exclude_power=False, exclude_tiers=("contenders",)),
+        TierSpec("mid_majors", *tier_config["mid_majors"], exclude_power=True, exclude_tiers=())
+    ]
+
+
+def top_k_mask(order, pool, k):
+    """Mark the first ``k`` rows of ``order`` that fall inside the boolean ``pool``."""
+    mask = np.zeros(pool.shape, dtype=bool)
+    mask[order[pool[order]][:k]] = True
+    return mask
+
+
+class Tiers:
+    """Every tier for a snapshot, computed from one sort per cutoff column.
+
+    Each column is sorted once for the whole table; a top-k inside any pool
+    is then that order filtered by the pool, which matches sorting the pool
+    on its own because the sorts are stable.
+    """
+
+    def __init__(self, snapshot, specs=None, power_conferences=None):
+        self.snapshot = snapshot
+        self.specs = default_tier_specs() if specs is None else specs
+        self.power_conferences = tier_config["power_conferences"] if power_conferences is None else power_conferences
+
+        orders = [snapshot.order(column, descending=descending) for column, descending in CUTOFF_COLUMNS]
+        net_order = snapshot.order("net_rating_adjusted")
+        power = np.isin(snapshot.values["conference_abbreviation"], list(self.power_conferences))
+        pools = {False: np.ones(snapshot.size, dtype=bool), True: ~power}
+
+        self.masks = {}
+        self.members = {}
+        for spec in self.specs:
+            pool = pools[spec.exclude_power]
+            mask = pool.copy()
+            for order, limit in zip(orders, (spec.offense, spec.defense, spec.sos)):
+                mask &= top_k_mask(order, pool, limit)
+            for excluded in spec.exclude_tiers:
+                mask &= ~self.masks[excluded]
+            self.masks[spec.name] = mask
+            self.members[spec.name] = net_order[mask[net_order]]
+
+    def rows(self, name):
+        """Return a tier's team rows ordered by net rating."""
+        return self.snapshot.rows(self.members[name], TIER_COLUMNS)
+
+    def criteria(self):
+        """Return the cutoffs behind each tier."""
+        return {
+            spec.name: {
+                "offense": spec.offense,
+                "defense": spec.defense,
+                "sos": spec.sos,
+                "excludes_power_conferences": spec.exclude_power,
+                "excludes_tiers": list(spec.exclude_tiers)
+            }
+            for spec in self.specs
+        }
+
+
+def get_tiers(snapshot):
+    """Return the tiers for a snapshot, computing them on first use."""
+    return snapshot.derived("tiers", Tiers)
+
+
+@register_warmer
+def warm_tiers(snapshot):
+    """Compute tiers while a new snapshot loads."""
+    get_tiers(snapshot)